@@ -2,8 +2,9 @@ from django.views import View
 
 from JellyBot.components.mixin import CsrfExemptMixin
 from JellyBot.views import simple_str_response
-from extline import line_handle_event
+from extline import line_handle_event, line_enqueue_event
 from extline.logger import LINE
+from JellyBot.systemconfig import LineApi
 
 
 class WebhookLineView(CsrfExemptMixin, View):
@@ -17,6 +18,9 @@ class WebhookLineView(CsrfExemptMixin, View):
         LINE.logger.info("LINE Webhook request body: " + "\t" + str(body).replace("\n", "").replace(" ", ""))
 
         # handle external body
-        line_handle_event(request, body, signature)
+        if LineApi.HandleEventInBackground:
+            line_enqueue_event(request, body, signature)
+        else:
+            line_handle_event(request, body, signature)
 
         return simple_str_response(request, "OK")
@@ -1,44 +1,32 @@
 from django.utils.deprecation import MiddlewareMixin
 
 from JellyBot.keys import Session, Cookies
-from JellyBot.api.static import param
-from mongodb.factory import RootUserManager
+from JellyBot.utils import get_user_context
 
 
 class RootUserIDInsertMiddleware(MiddlewareMixin):
     """
     Store the root user id to session if the http method is either POST or GET.
 
+    The user is resolved by :meth:`get_user_context()`, which is shared with the later middlewares and the views.
+
     .. note::
         Must be used after using the :class:`django.contrib.sessions.middleware.SessionMiddleware` because
         it store the root user ID into `Django session`.
     """
     # noinspection PyMethodMayBeStatic
     def process_request(self, request):
-        qd = None
-
-        if request.method == "GET":
-            qd = request.GET
-        elif request.method == "POST":
-            qd = request.POST
-
-        if qd is not None:
-            user_token = qd.get(param.Common.USER_TOKEN)
-            platform = qd.get(param.Common.PLATFORM)
-
-            if user_token is not None and platform is not None:
-                rt_result = RootUserManager.get_root_data_onplat(platform, user_token)
-                if rt_result.success:
-                    request.session[Session.USER_ROOT_ID] = str(rt_result.model.id)
-                    return
-
-            api_token = request.COOKIES.get(Cookies.USER_TOKEN) or qd.get(param.Common.API_TOKEN)
-
-            if api_token is not None:
-                rt_result = RootUserManager.get_root_data_api_token(api_token)
-                if rt_result.success:
-                    request.session[Session.USER_ROOT_ID] = str(rt_result.model.id)
-                    return
-                else:
-                    if Cookies.USER_TOKEN in request.COOKIES:
-                        del request.COOKIES[Cookies.USER_TOKEN]
+        if request.method not in ("GET", "POST"):
+            return
+
+        ctx = get_user_context(request)
+
+        if ctx.identified_by_token:
+            root_oid_str = str(ctx.root_oid)
+
+            # Avoid marking the session as modified if the user is unchanged
+            if request.session.get(Session.USER_ROOT_ID) != root_oid_str:
+                request.session[Session.USER_ROOT_ID] = root_oid_str
+        elif Cookies.USER_TOKEN in request.COOKIES:
+            # The API token in the cookies does not identify any user
+            del request.COOKIES[Cookies.USER_TOKEN]
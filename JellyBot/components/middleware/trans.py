@@ -1,21 +1,15 @@
 from django.utils.translation import activate, deactivate
 from django.utils.deprecation import MiddlewareMixin
 
-from JellyBot.utils import get_root_oid
-
-from mongodb.factory import RootUserManager
+from JellyBot.utils import get_user_context
 
 
 class TranslationActivator(MiddlewareMixin):
     # noinspection PyMethodMayBeStatic
     def process_request(self, request):
-        root_oid = get_root_oid(request)
-
-        if root_oid:
-            l_code = RootUserManager.get_lang_code_root_oid(root_oid)
-
-            if l_code:
-                activate(l_code)
-                return
+        l_code = get_user_context(request).language
 
-        deactivate()
+        if l_code:
+            activate(l_code)
+        else:
+            deactivate()
@@ -26,6 +26,11 @@ class System:
 
     DDNSUpdateIntervalSeconds = 3600
 
+    BackgroundWorkerCount = 8
+    BackgroundQueueSize = 5000
+    BackgroundQueueBlockSeconds = 0.5
+    """Max seconds to wait for the queue of the background tasks to be available before dropping the task."""
+
 
 class PlatformConfig(ABC):
     """Base of the platform-based configuration."""
@@ -42,6 +47,13 @@ class LineApi(PlatformConfig):
     max_content_length = System.MaxSendContentLength
     max_content_lines = System.MaxSendContentLines
 
+    HandleEventInBackground = True
+    """Respond to the webhook immediately and handle the events in the background workers."""
+    EventWorkerCount = 4
+    EventQueueSize = 500
+    """Max count of the events waiting to be handled for each worker."""
+    EventQueueBlockSeconds = 1
+
 
 class Discord(PlatformConfig):
     """Plaform configuration of Discord."""
@@ -50,6 +62,10 @@ class Discord(PlatformConfig):
     max_content_length = System.MaxSendContentLength
     max_content_lines = System.MaxSendContentLines
 
+    HandleMessageInExecutor = True
+    """Handle the received messages in a thread pool instead of on the event loop of the bot."""
+    MessageHandlerMaxWorkers = 4
+
 
 class Website:
     """Website configuration."""
@@ -58,6 +74,10 @@ class Website:
     """Messages about user identity integration will appear within this times of days
     counting from new account creation timestamp."""
 
+    UserContextCacheSize = 3000
+    UserContextExpirySeconds = 60
+    """Seconds before reloading the in-memory user data which identified the user of a request."""
+
     class AutoReply:
         """Auto-reply configuration on website."""
 
@@ -88,6 +108,15 @@ class AutoReply:
     CaseInsensitive = True
     BypassMultilineCDThresholdSeconds = 20
 
+    KeywordIndexCacheSize = 5000
+    KeywordIndexExpirySeconds = 60
+    """Keyword index of a channel will be reloaded after this seconds
+    to reflect the module changes made by the other processes."""
+
+    CalledCountFlushIntervalSeconds = 10
+    CalledCountFlushThreshold = 1000
+    """Accumulated called count of the modules will be written if the count of the modules reaches this."""
+
 
 class Database:
     """Database configuration."""
@@ -97,6 +126,21 @@ class Database:
     ExtraContentExpirySeconds = 2073600  # 30 Days
 
     BackupIntervalSeconds = 86400  # 24 Hrs
+    BackupIncremental = True
+    """Only copy the documents inserted after the last backup instead of dropping and copying all documents."""
+    BackupFullSyncIntervalSeconds = 604800  # 7 Days
+    """Interval to copy all documents to reflect the modifications if ``BackupIncremental`` is ``True``."""
+    BackupBatchSize = 1000
+    BackupLagSeconds = 300
+    """Documents inserted within this amount of seconds will be copied on the next backup."""
+
+    ModelCheckBatchSize = 500
+    """Count of the documents to be scanned and repaired at once when the schema of a collection changed."""
+
+    IdentityCacheSize = 10000
+    IdentityExpirySeconds = 600
+    """Seconds before reloading the in-memory registered channel and user data
+    to reflect the changes made by the other processes."""
 
     class PopularityConfig:
         """Configuration specifically for auto-reply tag popularity score."""
@@ -117,6 +161,36 @@ class Database:
 
         MaxContentCharacter = 3000
 
+        InsertBatchSize = 200
+        InsertFlushIntervalSeconds = 5
+        InsertBufferMaxSize = 20000
+        """Max count of the message records to be buffered. Records exceeding this will be dropped."""
+
+        FrequencyCacheSize = 5000
+        FrequencyExpirySeconds = 3600
+        """Seconds before reloading the in-memory message frequency of a channel from the database."""
+
+        HourlyCatchUpIntervalSeconds = 600
+        HourlyCatchUpLagSeconds = 300
+        """Message records newer than this will be aggregated into the hourly counts on the next catch up."""
+        HourlyCatchUpChunkHours = 24
+        HourlyPartialWindowMaxCount = 400
+        """Max count of the daily partial hours to be read from the message records when counting before a time."""
+
+    class Profile:
+        """Configuration for channel profiles."""
+
+        PermissionCacheSize = 10000
+        PermissionExpirySeconds = 300
+        """Seconds before reloading the in-memory permissions of a user
+        to reflect the profile changes made by the other processes."""
+
+        MembershipCacheSize = 200000
+        MembershipExpirySeconds = 21600  # 6 Hrs
+        """Seconds before forgetting a user is in a channel
+        to reflect the users marked unavailable by the other processes."""
+        MembershipWarmBatchSize = 1000
+
 
 class DataQuery:
     """Data query configuration."""
@@ -190,6 +264,25 @@ class Bot:
         AutoDeletionDays = 7
         MaxNotifyRangeSeconds = 14400
         MessageFrequencyRangeMin = 1440  # 1 Day
+        ScheduleCacheSize = 5000
+        ScheduleExpirySeconds = 600
+        """Seconds before reloading the in-memory timer schedule of a channel from the database."""
+        ScheduleMissReloadSeconds = 30
+        """Seconds before reloading the in-memory timer schedule of a channel having nothing to be notified."""
+
+    class Calculator:
+        """Calculator configuration for both automatic calculator and the calculator command."""
+
+        WorkerCount = 2
+        TimeoutSeconds = 3
+        """Wall-clock limit of evaluating an expression. The worker will be killed if exceeded."""
+        MemoryLimitMB = 256
+        """Memory limit of a worker on top of the memory inherited from the bot process."""
+        MaxTasksPerWorker = 200
+        """Count of the expressions to be evaluated before recycling the worker."""
+        CacheSize = 1000
+        WaitSeconds = 3
+        """Seconds to wait for a worker if all workers are busy before giving up the calculation."""
 
     class RemoteControl:
         """Remote control configuration for controls via the bot ony."""
@@ -204,3 +297,9 @@ class ExtraService:
         """Sticker configuration for extra service only."""
 
         MaxStickerTempFileLifeSeconds = 86400  # 1 Day
+        MaxStickerTempStorageBytes = 536870912  # 512 MB
+        """Total size of the downloaded sticker files. Least recently used files will be removed if exceeded."""
+        HttpPoolSize = 16
+        """Count of the pooled connections to LINE servers, also the count of the stickers downloaded concurrently."""
+        ConversionWorkerCount = 2
+        """Count of the worker processes to quantize the frames when converting the animated stickers to gif."""
@@ -6,35 +6,16 @@ from django.conf import settings
 from bson import ObjectId
 
 from extutils import safe_cast
-from flags import Platform
-from mongodb.factory import RootUserManager, ChannelManager, ProfileManager
-from JellyBot.keys import Session, ParamDictPrefix
-from JellyBot.api.static.param import Common
+from mongodb.factory import ChannelManager, ProfileManager
+from JellyBot.keys import ParamDictPrefix
+
+from .usrctx import get_user_context
 
 __all__ = ("get_root_oid", "get_post_keys", "get_channel_data", "get_profile_data", "get_limit", "load_server",)
 
 
 def get_root_oid(request) -> Optional[ObjectId]:
-    oid_str = request.session.get(Session.USER_ROOT_ID)
-    if oid_str:
-        return ObjectId(oid_str)
-
-    u_token = request.GET.get(Common.USER_TOKEN)
-    if u_token:
-        platform = Platform.cast(request.GET.get(Common.PLATFORM)) or Platform.UNKNOWN
-        result = RootUserManager.get_root_data_onplat(platform, u_token, auto_register=False)
-
-        if result.success:
-            return result.model.id
-
-    api_token = request.GET.get(Common.API_TOKEN)
-    if api_token:
-        result = RootUserManager.get_root_data_api_token(api_token)
-
-        if result.success:
-            return result.model.id
-
-    return None
+    return get_user_context(request).root_oid
 
 
 def get_post_keys(qd):
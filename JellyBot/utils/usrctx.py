@@ -0,0 +1,153 @@
+"""Context of the user who sent the request, shared by the middlewares and the views."""
+from datetime import tzinfo
+from typing import Optional, Hashable
+
+from bson import ObjectId
+
+from extutils import safe_cast
+from extutils.locales import DEFAULT_LOCALE
+from models import RootUserModel, RootUserConfigModel
+from mongodb.factory import RootUserManager
+from mongodb.utils import ModelCache
+from JellyBot.keys import Session, Cookies
+from JellyBot.api.static.param import Common
+from JellyBot.systemconfig import Website
+
+__all__ = ("UserContext", "get_user_context", "invalidate_user_context",)
+
+_REQUEST_ATTR = "_user_context"
+
+_cache: ModelCache[RootUserModel] = ModelCache(Website.UserContextCacheSize, Website.UserContextExpirySeconds)
+
+
+class UserContext:
+    """Root user data of the user who sent the request. ``model`` is `None` if the user is not identified."""
+
+    def __init__(self, model: Optional[RootUserModel], identified_by_token: bool = False):
+        self.model = model
+        self.identified_by_token = identified_by_token
+        """If the user was identified by the on-platform user token or the API token instead of the session."""
+
+    @property
+    def root_oid(self) -> Optional[ObjectId]:
+        """OID of the root user."""
+        return self.model.id if self.model else None
+
+    @property
+    def config(self) -> RootUserConfigModel:
+        """Config of the root user. Default config if the user is not identified."""
+        return self.model.config if self.model else RootUserConfigModel.generate_default()
+
+    @property
+    def tzinfo(self) -> tzinfo:
+        """:class:`tzinfo` of the root user. Default :class:`tzinfo` if the user is not identified."""
+        return self.model.config.tzinfo if self.model else DEFAULT_LOCALE.to_tzinfo()
+
+    @property
+    def language(self) -> Optional[str]:
+        """Language code of the root user. `None` if the user is not identified."""
+        return self.model.config.language if self.model else None
+
+
+def _get_cached(key: Hashable, load_fn) -> Optional[RootUserModel]:
+    model, generation = _cache.get(key)
+    if model:
+        return model
+
+    model = load_fn()
+    if model:
+        _cache.set(key, model, generation)
+
+    return model
+
+
+def _get_model_onplat(platform, user_token: str) -> Optional[RootUserModel]:
+    def load():
+        result = RootUserManager.get_root_data_onplat(platform, user_token)
+        return result.model if result.success else None
+
+    return _get_cached(("onplat", str(platform), user_token), load)
+
+
+def _get_model_api_token(api_token: str) -> Optional[RootUserModel]:
+    def load():
+        result = RootUserManager.get_root_data_api_token(api_token)
+        return result.model if result.success else None
+
+    return _get_cached(("api", api_token), load)
+
+
+def _get_model_oid(root_oid: ObjectId) -> Optional[RootUserModel]:
+    return _get_cached(("oid", root_oid), lambda: RootUserManager.get_root_data_oid(root_oid))
+
+
+def _resolve_user_context(request) -> UserContext:
+    qd = None
+
+    if request.method == "GET":
+        qd = request.GET
+    elif request.method == "POST":
+        qd = request.POST
+
+    if qd is not None:
+        user_token = qd.get(Common.USER_TOKEN)
+        platform = qd.get(Common.PLATFORM)
+
+        if user_token is not None and platform is not None:
+            model = _get_model_onplat(platform, user_token)
+            if model:
+                return UserContext(model, True)
+
+        api_token = request.COOKIES.get(Cookies.USER_TOKEN) or qd.get(Common.API_TOKEN)
+
+        if api_token is not None:
+            model = _get_model_api_token(api_token)
+            if model:
+                return UserContext(model, True)
+
+    root_oid_str = request.session.get(Session.USER_ROOT_ID)
+    if root_oid_str:
+        root_oid = safe_cast(root_oid_str, ObjectId)
+
+        if root_oid:
+            return UserContext(_get_model_oid(root_oid))
+
+    return UserContext(None)
+
+
+def get_user_context(request) -> UserContext:
+    """
+    Get the context of the user who sent the ``request``.
+
+    The user is resolved once per request, in the order of the on-platform user token, the API token
+    in the cookies or the query and the root user OID in the session.
+
+    The resolved root user data are cached in-process for ``Website.UserContextExpirySeconds`` seconds
+    by the token or the OID used to identify the user.
+
+    :param request: request sent by the user
+    :return: context of the user
+    """
+    ctx = getattr(request, _REQUEST_ATTR, None)
+    if ctx is None:
+        ctx = _resolve_user_context(request)
+        setattr(request, _REQUEST_ATTR, ctx)
+
+    return ctx
+
+
+def invalidate_user_context(request, root_oid: ObjectId):
+    """
+    Invalidate the cached root user data of ``root_oid``.
+
+    Should be called after the root user data is updated.
+
+    The context of the current ``request`` will be resolved again on the next :meth:`get_user_context()`.
+
+    :param request: request which updated the root user data
+    :param root_oid: OID of the updated root user
+    """
+    _cache.invalidate_models(lambda model: model.id == root_oid)
+
+    if hasattr(request, _REQUEST_ATTR):
+        delattr(request, _REQUEST_ATTR)
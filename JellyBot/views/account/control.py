@@ -4,7 +4,7 @@ from django.utils.translation import gettext_lazy as _
 
 from JellyBot import keys
 from JellyBot.components.mixin import LoginRequiredMixin
-from JellyBot.utils import get_root_oid, get_post_keys
+from JellyBot.utils import get_root_oid, get_post_keys, get_user_context, invalidate_user_context
 from JellyBot.views import render_template, simple_str_response, simple_json_response
 from extutils.locales import get_locales, get_languages
 from extutils.dt import now_utc_aware, localtime
@@ -103,7 +103,7 @@ class AccountLogoutView(View):
 class AccountSettingsPageView(LoginRequiredMixin, TemplateResponseMixin, View):
     # noinspection PyUnusedLocal
     def get(self, request, *args, **kwargs):
-        config = RootUserManager.get_config_root_oid(get_root_oid(request))
+        config = get_user_context(request).config
 
         return render_template(
             self.request, _("Account Settings"), "account/settings.html",
@@ -113,9 +113,12 @@ class AccountSettingsPageView(LoginRequiredMixin, TemplateResponseMixin, View):
 
     # noinspection PyMethodMayBeStatic,PyUnusedLocal
     def post(self, request, *args, **kwargs):
-        update_result = RootUserManager.update_config(get_root_oid(request), **get_post_keys(request.POST))
+        root_oid = get_root_oid(request)
+        update_result = RootUserManager.update_config(root_oid, **get_post_keys(request.POST))
 
         if update_result.success:
+            invalidate_user_context(request, root_oid)
+
             return simple_str_response(
                 request,
                 f"success/{localtime(now_utc_aware()):%m-%d %H:%M:%S (%Z)} - "
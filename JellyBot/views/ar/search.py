@@ -19,7 +19,7 @@ class AutoReplySearchChannelView(LoginRequiredMixin, ChannelOidRequiredMixin, Te
         channel_name = channel_data.model.get_channel_name(get_root_oid(request))
 
         module_list = list(AutoReplyManager.get_conn_list(
-            channel_data.model.id, keyword, active_only=not include_inactive))
+            channel_data.model.id, keyword, active_only=not include_inactive, with_count=False))
 
         uids = []
         for module in module_list:
@@ -1,6 +1,6 @@
 """Views for LINE sticker downloader."""
 from django.contrib import messages
-from django.http import FileResponse, HttpResponse
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from django.shortcuts import redirect
 from django.utils.translation import gettext_lazy as _
 from django.views import View
@@ -31,13 +31,25 @@ class LineStickerPackageDownloadView(TemplateResponseMixin, View):
 
     # noinspection PyUnusedLocal, PyMethodMayBeStatic
     def get(self, request, pack_id):
-        """Download the LINE sticker package file to the user's end."""
-        binary_io = LineStickerUtils.get_downloaded_sticker_pack(pack_id)
+        """
+        Download the LINE sticker package file to the user's end.
 
-        if not binary_io:
+        The zip is streamed while the stickers are being downloaded if it is not yet downloaded.
+        """
+        binary_io = LineStickerUtils.get_stored_sticker_pack(pack_id)
+
+        if binary_io:
+            return FileResponse(binary_io, as_attachment=True)
+
+        stream = LineStickerUtils.stream_sticker_pack(pack_id)
+
+        if not stream:
             return HttpResponse(status=404)
 
-        return FileResponse(binary_io, as_attachment=True)
+        response = StreamingHttpResponse(stream, content_type="application/zip")
+        response["Content-Disposition"] = f'attachment; filename="{pack_id}.zip"'
+
+        return response
 
 
 class LineStickerAnimatedPngRedirectView(TemplateResponseMixin, View):
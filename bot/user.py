@@ -13,7 +13,7 @@ from extutils.logger import SYSTEM
 
 
 def _perform_existence_check(set_name_to_cache: bool):
-    list_prof_conn = list(ProfileManager.get_available_connections())
+    list_prof_conn = list(ProfileManager.get_available_connections(with_count=False))
 
     def _fn():
         marked_unavailable = 0
@@ -0,0 +1,286 @@
+"""
+Process pool to evaluate the calculator expressions out of the message handling thread.
+
+Each expression is evaluated in a worker process with a hard wall-clock limit and a memory limit.
+Workers which exceeded the limits are killed and replaced, and every worker is recycled
+after evaluating a certain count of expressions.
+"""
+import multiprocessing
+from queue import Queue, Empty
+from threading import Lock
+from typing import Any, Optional, Tuple
+
+from cachetools import LRUCache
+from sympy import sympify
+from sympy.core.compatibility import exec_
+from sympy.core.sympify import SympifyError
+# noinspection PyProtectedMember
+from sympy.abc import _clash1
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    # `resource` is not available on Windows, memory limit will not be applied
+    resource = None
+
+from JellyBot.systemconfig import Bot
+
+__all__ = ("CalculatorPool", "CalculatorOutcome", "normalize_expression", "calculator_pool",)
+
+CalculatorOutcome = Tuple[str, Any]
+"""
+Outcome of a calculation. First element is the kind of the outcome, second element is the payload.
+
+.. list-table::
+   :header-rows: 1
+
+   * - Kind
+     - Payload
+   * - ``OK``
+     - Result of ``sympify()``
+   * - ``SYMPIFY``
+     - ``(expr, base_exc)`` of :class:`SympifyError` in ``str``
+   * - ``NAME``
+     - ``args`` of :class:`NameError`
+   * - ``SYNTAX``
+     - ``(args, text)`` of :class:`SyntaxError`
+   * - ``LIMIT``
+     - ``None``. Time or memory limit exceeded
+   * - ``BUSY``
+     - ``None``. No worker became available in time
+   * - ``RAISE``
+     - Any other exception raised
+"""
+
+KIND_OK = "OK"
+KIND_SYMPIFY = "SYMPIFY"
+KIND_NAME = "NAME"
+KIND_SYNTAX = "SYNTAX"
+KIND_LIMIT = "LIMIT"
+KIND_BUSY = "BUSY"
+KIND_RAISE = "RAISE"
+
+
+def normalize_expression(expr: str) -> str:
+    """
+    Normalize ``expr`` to be used as the key of the result cache.
+
+    Only the trailing whitespaces of each line are removed because the leading whitespaces
+    could be significant to the lines to be executed.
+
+    :param expr: expression to be normalized
+    :return: normalized expression
+    """
+    return "\n".join(line.rstrip() for line in expr.split("\n"))
+
+
+def _evaluate(expr: str) -> CalculatorOutcome:
+    ns_sympy = {"_clash1": _clash1}
+
+    try:
+        if "\n" in expr:
+            msgs = expr.split("\n")
+            expr = msgs[-1]
+
+            exec_("\n".join(msgs[:-1]), ns_sympy)
+
+        return KIND_OK, sympify(expr, ns_sympy)
+    except SympifyError as ex:
+        return KIND_SYMPIFY, (str(ex.expr), str(ex.base_exc))
+    except NameError as ex:
+        return KIND_NAME, ex.args
+    except SyntaxError as ex:
+        return KIND_SYNTAX, (ex.args, ex.text)
+    except MemoryError:
+        return KIND_LIMIT, None
+    except Exception as ex:  # pylint: disable=broad-except
+        return KIND_RAISE, ex
+
+
+def _apply_memory_limit(memory_limit_mb: int):
+    if not resource or not memory_limit_mb:
+        return
+
+    # The worker is forked with the memory of the parent process, so the limit is on top of the current usage
+    try:
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return
+
+    limit = current + memory_limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _worker_main(conn, memory_limit_mb: int):
+    _apply_memory_limit(memory_limit_mb)
+
+    while True:
+        try:
+            expr = conn.recv()
+        except EOFError:
+            return
+
+        if expr is None:
+            return
+
+        outcome = _evaluate(expr)
+        try:
+            conn.send(outcome)
+        except Exception as ex:  # pylint: disable=broad-except
+            # Result or the exception could not be pickled
+            conn.send((KIND_RAISE, RuntimeError(repr(ex))))
+
+
+class _CalculatorWorker:
+    def __init__(self, memory_limit_mb: int):
+        self._memory_limit_mb = memory_limit_mb
+        self._process: Optional[multiprocessing.Process] = None
+        self._conn = None
+        self.task_count = 0
+
+    def _start(self):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_worker_main, args=(child_conn, self._memory_limit_mb), name="Calculator", daemon=True)
+        self._process.start()
+        child_conn.close()
+
+        self._conn = parent_conn
+        self.task_count = 0
+
+    def kill(self):
+        """Kill the worker process. The process will be restarted on the next evaluation."""
+        if not self._process:
+            return
+
+        self._process.kill()
+        self._process.join()
+        self._conn.close()
+
+        self._process = None
+        self._conn = None
+
+    def retire(self):
+        """Let the worker process exit after the current evaluation. The process will be restarted on next use."""
+        if not self._process:
+            return
+
+        try:
+            self._conn.send(None)
+            self._process.join(1)
+        except (OSError, ValueError):
+            pass
+
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+        self._conn.close()
+
+        self._process = None
+        self._conn = None
+
+    def evaluate(self, expr: str, timeout: float) -> CalculatorOutcome:
+        """
+        Evaluate ``expr`` in the worker process.
+
+        The worker process will be killed if the evaluation did not complete within ``timeout`` seconds.
+
+        :param expr: expression to be evaluated
+        :param timeout: wall-clock limit in seconds
+        :return: outcome of the evaluation
+        """
+        if not self._process or not self._process.is_alive():
+            self._start()
+
+        self.task_count += 1
+
+        try:
+            self._conn.send(expr)
+            if self._conn.poll(timeout):
+                return self._conn.recv()
+        except (EOFError, OSError):
+            # Worker process died during the evaluation, most likely killed because of the memory usage
+            pass
+
+        self.kill()
+        return KIND_LIMIT, None
+
+
+class CalculatorPool:
+    """
+    Pool of the calculator worker processes.
+
+    Outcomes of the expressions are cached by the normalized expression, so the same expressions
+    will not be evaluated again even if the evaluation exceeded the limits.
+    """
+
+    def __init__(self, worker_count: int, timeout: float, memory_limit_mb: int, max_tasks_per_worker: int,
+                 cache_size: int, wait_timeout: float):
+        self._timeout = timeout
+        self._wait_timeout = wait_timeout
+        self._max_tasks_per_worker = max_tasks_per_worker
+
+        self._idle: Queue = Queue()
+        for _ in range(worker_count):
+            self._idle.put(_CalculatorWorker(memory_limit_mb))
+
+        self._cache = LRUCache(cache_size)
+        self._cache_lock = Lock()
+
+    def evaluate(self, expr: str) -> CalculatorOutcome:
+        """
+        Evaluate ``expr`` in a worker process or get the outcome from the cache.
+
+        If all workers are busy, waits for a worker for at most ``wait_timeout`` seconds.
+        ``BUSY`` will be returned and not cached if no worker became available in time.
+
+        :param expr: expression to be evaluated
+        :return: outcome of the evaluation
+        """
+        key = normalize_expression(expr)
+
+        with self._cache_lock:
+            outcome = self._cache.get(key)
+        if outcome:
+            return outcome
+
+        try:
+            worker = self._idle.get(timeout=self._wait_timeout)
+        except Empty:
+            return KIND_BUSY, None
+
+        try:
+            outcome = worker.evaluate(key, self._timeout)
+
+            if worker.task_count >= self._max_tasks_per_worker:
+                worker.retire()
+        finally:
+            self._idle.put(worker)
+
+        # Not caching the unexpected exceptions to avoid re-raising the same exception instance
+        if outcome[0] != KIND_RAISE:
+            with self._cache_lock:
+                self._cache[key] = outcome
+
+        return outcome
+
+    def clear_cache(self):
+        """Clear the cached outcomes."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def shutdown(self):
+        """Stop all idle worker processes. Workers will be restarted on the next evaluation."""
+        workers = []
+        while not self._idle.empty():
+            workers.append(self._idle.get())
+
+        for worker in workers:
+            worker.retire()
+            self._idle.put(worker)
+
+
+calculator_pool = CalculatorPool(
+    Bot.Calculator.WorkerCount, Bot.Calculator.TimeoutSeconds, Bot.Calculator.MemoryLimitMB,
+    Bot.Calculator.MaxTasksPerWorker, Bot.Calculator.CacheSize, Bot.Calculator.WaitSeconds)
@@ -1,17 +1,62 @@
-"""Calculator using ``sympy.sympify`` to perform calculation by passing ``str``."""
+"""
+Calculator using ``sympy.sympify`` to perform calculation by passing ``str``.
+
+The expressions are evaluated in the worker processes of :class:`bot.utils.calcpool.CalculatorPool`.
+"""
 from typing import List
 
 from django.utils.translation import gettext_lazy as _
 
-from sympy import sympify
-from sympy.core.compatibility import exec_
-from sympy.core.sympify import SympifyError
-# noinspection PyProtectedMember
-from sympy.abc import _clash1
-
 from msghandle import logger
 from msghandle.models import HandledMessageCalculateResult
 
+from .calcpool import (
+    calculator_pool, KIND_OK, KIND_SYMPIFY, KIND_NAME, KIND_SYNTAX, KIND_LIMIT, KIND_BUSY, KIND_RAISE
+)
+
+
+_LOG_MESSAGES = {
+    KIND_SYMPIFY: "Exception occurred for text message calculator. Expr: %s / Base Exception: %s",
+    KIND_NAME: "Exception occurred for text message calculator. Message: %s",
+    KIND_LIMIT: "Calculation exceeded the time or the memory limit. Expr: %s",
+    KIND_BUSY: "All calculator workers are busy. Expr: %s"
+}
+
+
+def _log_error(kind: str, payload, expr: str):
+    if kind not in _LOG_MESSAGES:
+        return
+
+    if kind == KIND_SYMPIFY:
+        args = payload
+    elif kind in (KIND_LIMIT, KIND_BUSY):
+        args = (expr,)
+    else:
+        args = (payload,)
+
+    logger.logger.debug(_LOG_MESSAGES[kind], *args)
+
+
+def _get_error_message(kind: str, payload) -> str:
+    if kind == KIND_SYMPIFY:
+        str_dict = {
+            "expr": payload[0],
+            "exc": payload[1]
+        }
+
+        return _("I have difficulty understanding you.\n%(expr)s (%(exc)s)") % str_dict
+
+    if kind == KIND_NAME:
+        return _("WTF are you talking about?\n{}") % payload
+
+    if kind == KIND_SYNTAX:
+        return _("I can't understand.\n{} ({})") % payload
+
+    if kind == KIND_BUSY:
+        return _("I'm busy now. Try again later.")
+
+    return _("Too complicated! The calculation took too long or used too much memory.")
+
 
 def calculate_expression(expr: str, output_error: bool = False) -> List[HandledMessageCalculateResult]:
     """
@@ -21,46 +66,20 @@ def calculate_expression(expr: str, output_error: bool = False) -> List[HandledM
     :param output_error: output the error if any during the calculation
     :return: packed calculation result
     """
-    ns_sympy = {"_clash1": _clash1}
-
-    try:
-        if "\n" in expr:
-            msgs = expr.split("\n")
-            expr = msgs[-1]
-
-            exec_("\n".join(msgs[:-1]), ns_sympy)
-
-        ret = [HandledMessageCalculateResult(expr_before=expr, expr_after=sympify(expr, ns_sympy))]
-    except SympifyError as ex:
-        logger.logger.debug(
-            "Exception occurred for text message calculator. Expr: %s / Base Exception: %s", ex.expr, ex.base_exc)
-
-        if output_error:
-            str_dict = {
-                "expr": ex.expr,
-                "exc": ex.base_exc
-            }
-
-            ret = [HandledMessageCalculateResult(
-                expr_before=expr,
-                expr_after=_("I have difficulty understanding you.\n%(expr)s (%(exc)s)") % str_dict)]
-        else:
-            ret = []
-    except NameError as ex:
-        logger.logger.debug("Exception occurred for text message calculator. Message: %s", ex.args)
-
-        if output_error:
-            ret = [HandledMessageCalculateResult(
-                expr_before=expr,
-                expr_after=_("WTF are you talking about?\n{}") % ex.args)]
-        else:
-            ret = []
-    except SyntaxError as ex:
-        if output_error:
-            ret = [HandledMessageCalculateResult(
-                expr_before=expr,
-                expr_after=_("I can't understand.\n{} ({})") % (ex.args, ex.text))]
-        else:
-            ret = []
-
-    return ret
+    kind, payload = calculator_pool.evaluate(expr)
+
+    if "\n" in expr:
+        expr = expr.split("\n")[-1]
+
+    if kind == KIND_OK:
+        return [HandledMessageCalculateResult(expr_before=expr, expr_after=payload)]
+
+    if kind == KIND_RAISE:
+        raise payload
+
+    _log_error(kind, payload, expr)
+
+    if not output_error:
+        return []
+
+    return [HandledMessageCalculateResult(expr_before=expr, expr_after=_get_error_message(kind, payload))]
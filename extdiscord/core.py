@@ -11,14 +11,16 @@ from discord import (
     Activity, ActivityType)
 
 from bot.event import signal_discord_ready
+from extdiscord.dispatch import ChannelOrderedDispatcher
 from extdiscord.utils import channel_full_repr
 from extdiscord.handle import handle_discord_main
 from extdiscord.logger import DISCORD
 from extutils.checker import arg_type_ensure
 from extutils.emailutils import MailSender
 from flags import Platform
+from JellyBot.systemconfig import Discord
 from mongodb.factory import ChannelManager, ChannelCollectionManager, RootUserManager, ProfileManager
-from msghandle.models import MessageEventObjectFactory
+from msghandle.models import MessageEventObjectFactory, HandledEventsHolderPlatform
 
 from .token_ import discord_token
 from .utils.cnflprvt import BotConflictionPreventer
@@ -26,14 +28,27 @@ from .utils.cnflprvt import BotConflictionPreventer
 __all__ = ("run_server", "DiscordClientWrapper",)
 
 
+def _handle_message(message) -> HandledEventsHolderPlatform:
+    """Blocking part of the message handling, which is everything besides sending the responses."""
+    return handle_discord_main(MessageEventObjectFactory.from_discord(message)).to_platform(Platform.DISCORD)
+
+
 class DiscordClient(Client):
     """
     Discord bot client. This is the main class of the discord bot event handler.
 
+    If ``Discord.HandleMessageInExecutor`` is ``True``, the received messages will be handled in a thread pool
+    while the responses are sent on the event loop. Messages in the same channel are handled in order.
+
     .. seealso::
         Discord bot events: https://discordpy.readthedocs.io/en/latest/api.html#event-reference
     """
 
+    def __init__(self, **options):
+        super().__init__(**options)
+
+        self._dispatcher = ChannelOrderedDispatcher(Discord.MessageHandlerMaxWorkers)
+
     async def on_ready(self):
         """Contains the code to be executed when the bot is ready."""
         # Not importing at the top level because the app will not be ready yet (translation unavailable)
@@ -54,9 +69,14 @@ class DiscordClient(Client):
                 or BotConflictionPreventer.prioritized_bot_exists(message.guild):
             return
 
-        await handle_discord_main(MessageEventObjectFactory.from_discord(message)) \
-            .to_platform(Platform.DISCORD) \
-            .send_discord(message.channel)
+        if not Discord.HandleMessageInExecutor:
+            await _handle_message(message).send_discord(message.channel)
+            return
+
+        # Responses are sent in the channel slot to keep the order of the responses
+        async with self._dispatcher.channel_slot(message.channel.id):
+            handled = await self._dispatcher.run(_handle_message, message)
+            await handled.send_discord(message.channel)
 
     # noinspection PyMethodMayBeStatic
     async def on_private_channel_delete(self, channel: Union[DMChannel, GroupChannel]):
@@ -0,0 +1,69 @@
+"""Dispatcher to execute the blocking message handling off the event loop of the Discord bot."""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Hashable, TypeVar
+
+__all__ = ("ChannelOrderedDispatcher",)
+
+T = TypeVar("T")  # pylint: disable=invalid-name
+
+
+class ChannelOrderedDispatcher:
+    """
+    Run blocking functions in a thread pool while keeping the order of the calls in the same channel.
+
+    Calls in different channels run concurrently, capped by ``max_workers``.
+
+    Calls in the same channel run one by one in the order of entering :meth:`channel_slot()`.
+
+    .. note::
+        Thread pool is used instead of the process pool because the handling pipeline works on the objects
+        which cannot be pickled (for example, the Discord message object and the database clients).
+    """
+
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="DiscordHandle")
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._lock_users: Dict[Hashable, int] = {}
+
+    @asynccontextmanager
+    async def channel_slot(self, channel_key: Hashable):
+        """
+        Asynchronous context manager which holds the slot of ``channel_key`` until exited.
+
+        The slot should be entered on the event loop without any ``await`` before it
+        for the order of the calls to be kept.
+
+        :param channel_key: key of the channel
+        """
+        lock = self._locks.get(channel_key)
+        if not lock:
+            lock = self._locks[channel_key] = asyncio.Lock()
+        self._lock_users[channel_key] = self._lock_users.get(channel_key, 0) + 1
+
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[channel_key] -= 1
+            if not self._lock_users[channel_key]:
+                del self._lock_users[channel_key]
+                del self._locks[channel_key]
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run ``fn`` with ``args`` and ``kwargs`` in the thread pool and return its result.
+
+        :param fn: blocking function to be run
+        :param args: args of `fn`
+        :param kwargs: kwargs of `fn`
+        :return: return of `fn`
+        """
+        return await asyncio.get_event_loop().run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs))
+
+    def shutdown(self):
+        """Wait until all submitted calls completed and release the thread pool."""
+        self._executor.shutdown(wait=True)
@@ -1,6 +1,6 @@
 """This module contains various controls related to the LINE webhook."""
 
 # noinspection PyUnresolvedReferences
-from .base import line_handle_event
+from .base import line_handle_event, line_enqueue_event
 # noinspection PyUnresolvedReferences
 from .wrapper import LineApiWrapper, LineApiUtils
@@ -5,11 +5,13 @@ import sys
 from linebot import WebhookParser
 from linebot.models import MessageEvent
 
+from extutils.bgexec import ShardedTaskExecutor
 from extutils.logger import SYSTEM
+from JellyBot.systemconfig import LineApi
 
 from .handler import handle_main, handle_msg_main
 
-__all__ = ("line_handle_event", "line_parser",)
+__all__ = ("line_handle_event", "line_enqueue_event", "line_parser",)
 
 
 line_secret = os.environ.get("LINE_SECRET")
@@ -21,6 +23,24 @@ line_parser = WebhookParser(line_secret)
 """LINE's webhook parser."""
 
 
+_event_executor = ShardedTaskExecutor(
+    "LineEvent", LineApi.EventWorkerCount, LineApi.EventQueueSize, LineApi.EventQueueBlockSeconds)
+"""Executor to handle the events. Events of a channel are always handled by the same single-threaded shard."""
+
+
+def _handle_event(request, event, destination):
+    if isinstance(event, MessageEvent):
+        handle_msg_main(request, event, destination)
+    else:
+        handle_main(request, event, destination)
+
+
+def _get_channel_key(event) -> str:
+    source = event.source
+
+    return getattr(source, "group_id", None) or getattr(source, "room_id", None) or source.user_id
+
+
 def line_handle_event(request, body, signature):
     """
     Main function to be called upon receiving a LINE webhook event.
@@ -30,7 +50,18 @@ def line_handle_event(request, body, signature):
     payload = line_parser.parse(body, signature, as_payload=True)
 
     for event in payload.events:
-        if isinstance(event, MessageEvent):
-            handle_msg_main(request, event, payload.destination)
-        else:
-            handle_main(request, event, payload.destination)
+        _handle_event(request, event, payload.destination)
+
+
+def line_enqueue_event(request, body, signature):
+    """
+    Verify and parse the LINE webhook event, then queue the events to be handled in the background.
+
+    Events of the same channel will be handled in the order of receiving.
+
+    :raises InvalidSignatureError: if `signature` does not match `body`
+    """
+    payload = line_parser.parse(body, signature, as_payload=True)
+
+    for event in payload.events:
+        _event_executor.submit(_get_channel_key(event), _handle_event, request, event, payload.destination)
@@ -0,0 +1,317 @@
+"""Bounded executor to run the fire-and-forget tasks in the background."""
+import atexit
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from queue import Queue, Full, Empty
+from threading import Thread, Lock
+from typing import Callable, Hashable, List, Optional
+
+from env_var import is_testing
+from extutils.logger import LoggerSkeleton
+from JellyBot.systemconfig import System
+
+__all__ = ("BackgroundTaskExecutor", "BackgroundTaskStats", "BackgroundTaskDroppedError", "ShardedTaskExecutor",
+           "BACKGROUND_EXECUTOR",)
+
+logger = LoggerSkeleton("sys.bgexec", logger_name_env="BG_EXEC")
+
+
+class BackgroundTaskDroppedError(Exception):
+    """Raised if the task is dropped because the queue of the executor is full or the executor is shut down."""
+
+
+@dataclass
+class BackgroundTaskStats:
+    """Metrics of a :class:`BackgroundTaskExecutor`."""
+
+    queue_depth: int
+    submitted: int
+    completed: int
+    failed: int
+    dropped: int
+    total_wait_ns: int
+    total_exec_ns: int
+    max_wait_ns: int
+
+    @property
+    def avg_wait_ms(self) -> float:
+        """
+        Get the average time that a task waited in the queue in milliseconds (ms).
+
+        :return: average time a task waited in the queue in ms
+        """
+        return self.total_wait_ns / (self.completed + self.failed or 1) / 1000000
+
+    @property
+    def avg_exec_ms(self) -> float:
+        """
+        Get the average time spent on executing a task in milliseconds (ms).
+
+        :return: average time spent on executing a task in ms
+        """
+        return self.total_exec_ns / (self.completed + self.failed or 1) / 1000000
+
+
+@dataclass
+class _BackgroundTask:
+    fn: Callable
+    args: tuple
+    kwargs: dict
+    future: Future
+    enqueued_ns: int
+
+
+class BackgroundTaskExecutor:
+    """
+    Executor running the tasks using a fixed count of worker threads with a bounded queue.
+
+    If the queue is full, :meth:`submit()` blocks for at most ``block_secs`` seconds to apply back-pressure.
+    The task will be dropped and logged if the queue is still full after that.
+
+    Worker threads are started on the first submission.
+    The queue will be drained on exit.
+
+    If ``sync_when_testing`` is ``True``, the tasks will be executed synchronously when testing.
+    """
+
+    def __init__(self, name: str, worker_count: int, queue_size: int, block_secs: float, *,
+                 sync_when_testing: bool = True):
+        self._name = name
+        self._worker_count = worker_count
+        self._block_secs = block_secs
+        self._sync_when_testing = sync_when_testing
+
+        self._queue: Queue = Queue(maxsize=queue_size)
+        self._workers: List[Thread] = []
+        self._lock = Lock()
+        self._shutdown = False
+
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._dropped = 0
+        self._total_wait_ns = 0
+        self._total_exec_ns = 0
+        self._max_wait_ns = 0
+
+        atexit.register(self.shutdown)
+
+    def _ensure_workers(self):
+        with self._lock:
+            if self._workers:
+                return
+
+            for idx in range(self._worker_count):
+                worker = Thread(target=self._work, name=f"{self._name}-{idx}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def _work(self):
+        while True:
+            task: Optional[_BackgroundTask] = self._queue.get()
+
+            if task is None:
+                self._queue.task_done()
+                return
+
+            self._run(task)
+            self._queue.task_done()
+
+    def _run(self, task: _BackgroundTask):
+        start_ns = time.perf_counter_ns()
+        wait_ns = start_ns - task.enqueued_ns
+
+        if not task.future.set_running_or_notify_cancel():
+            return
+
+        try:
+            result = task.fn(*task.args, **task.kwargs)
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.logger.exception(f"Background task `{getattr(task.fn, '__qualname__', task.fn)}` failed.")
+            task.future.set_exception(ex)
+            success = False
+        else:
+            task.future.set_result(result)
+            success = True
+
+        exec_ns = time.perf_counter_ns() - start_ns
+
+        with self._lock:
+            if success:
+                self._completed += 1
+            else:
+                self._failed += 1
+
+            self._total_wait_ns += wait_ns
+            self._total_exec_ns += exec_ns
+            self._max_wait_ns = max(self._max_wait_ns, wait_ns)
+
+    def _drop(self, task: _BackgroundTask, reason: str):
+        with self._lock:
+            self._dropped += 1
+
+        logger.logger.warning(f"Background task `{getattr(task.fn, '__qualname__', task.fn)}` dropped. ({reason})")
+        task.future.set_exception(BackgroundTaskDroppedError(reason))
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Submit ``fn`` to be executed with ``args`` and ``kwargs`` in the background.
+
+        If the task is dropped, the returned :class:`Future` will have :class:`BackgroundTaskDroppedError` set.
+
+        :param fn: function to be executed
+        :param args: args for `fn`
+        :param kwargs: kwargs for `fn`
+        :return: future of the task
+        """
+        task = _BackgroundTask(fn, args, kwargs, Future(), time.perf_counter_ns())
+
+        with self._lock:
+            self._submitted += 1
+
+        if self._sync_when_testing and is_testing():
+            self._run(task)
+            return task.future
+
+        if self._shutdown:
+            self._drop(task, "executor shut down")
+            return task.future
+
+        self._ensure_workers()
+
+        try:
+            self._queue.put(task, timeout=self._block_secs)
+        except Full:
+            self._drop(task, f"queue full ({self._queue.maxsize})")
+
+        return task.future
+
+    @property
+    def stats(self) -> BackgroundTaskStats:
+        """
+        Get the metrics of this executor.
+
+        :return: metrics of this executor
+        """
+        with self._lock:
+            return BackgroundTaskStats(
+                queue_depth=self._queue.qsize(), submitted=self._submitted, completed=self._completed,
+                failed=self._failed, dropped=self._dropped, total_wait_ns=self._total_wait_ns,
+                total_exec_ns=self._total_exec_ns, max_wait_ns=self._max_wait_ns
+            )
+
+    def shutdown(self, timeout: Optional[float] = None):
+        """
+        Stop accepting new tasks and wait until all queued tasks completed.
+
+        Queued tasks which are not started after ``timeout`` seconds will be dropped.
+
+        :param timeout: max seconds to wait for the queued tasks. Wait until all completed if `None`
+        """
+        with self._lock:
+            if self._shutdown:
+                return
+
+            self._shutdown = True
+            workers = list(self._workers)
+
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        def remaining() -> Optional[float]:
+            return None if deadline is None else max(deadline - time.monotonic(), 0)
+
+        # Sentinels to stop the workers after the queued tasks
+        sentinel_count = self._put_sentinels(len(workers), remaining)
+
+        for worker in workers:
+            worker.join(remaining())
+
+        # Drop the tasks remaining in the queue if timed out
+        sentinel_count -= self._drop_queued()
+
+        # Stop the workers still running once their current tasks completed
+        self._put_sentinels(len(workers) - max(sentinel_count, 0), lambda: 0)
+
+    def _put_sentinels(self, count: int, timeout: Callable[[], Optional[float]]) -> int:
+        """
+        Put ``count`` sentinels into the queue, each waiting for ``timeout()`` seconds if the queue is full.
+
+        :return: count of the sentinels put
+        """
+        for put_count in range(count):
+            try:
+                self._queue.put(None, timeout=timeout())
+            except Full:
+                return put_count
+
+        return max(count, 0)
+
+    def _drop_queued(self) -> int:
+        """
+        Drop all the tasks in the queue.
+
+        :return: count of the sentinels removed from the queue
+        """
+        sentinel_count = 0
+
+        while True:
+            try:
+                task = self._queue.get_nowait()
+            except Empty:
+                return sentinel_count
+
+            if task is None:
+                sentinel_count += 1
+            else:
+                self._drop(task, "executor shut down")
+
+
+class ShardedTaskExecutor:
+    """
+    Executor running the tasks on ``shard_count`` single-threaded :class:`BackgroundTaskExecutor`.
+
+    Tasks of the same key are always run by the same shard, so they are executed one by one in the order of submission.
+    Tasks of the keys on the different shards run concurrently.
+    """
+
+    def __init__(self, name: str, shard_count: int, queue_size: int, block_secs: float, *,
+                 sync_when_testing: bool = True):
+        self._shards = [
+            BackgroundTaskExecutor(f"{name}-{idx}", 1, queue_size, block_secs, sync_when_testing=sync_when_testing)
+            for idx in range(shard_count)
+        ]
+
+    def get_shard(self, key: Hashable) -> BackgroundTaskExecutor:
+        """
+        Get the shard running the tasks of ``key``.
+
+        :param key: key of the tasks
+        :return: shard running the tasks of `key`
+        """
+        return self._shards[hash(key) % len(self._shards)]
+
+    def submit(self, key: Hashable, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Submit ``fn`` to be executed with ``args`` and ``kwargs`` by the shard of ``key``.
+
+        :param key: key of the task
+        :param fn: function to be executed
+        :param args: args for `fn`
+        :param kwargs: kwargs for `fn`
+        :return: future of the task
+        """
+        return self.get_shard(key).submit(fn, *args, **kwargs)
+
+    def shutdown(self, timeout: Optional[float] = None):
+        """
+        Stop accepting new tasks and wait until all queued tasks of all shards completed.
+
+        :param timeout: max seconds to wait for the queued tasks of each shard. Wait until all completed if `None`
+        """
+        for shard in self._shards:
+            shard.shutdown(timeout)
+
+
+BACKGROUND_EXECUTOR = BackgroundTaskExecutor(
+    "BackgroundTask", System.BackgroundWorkerCount, System.BackgroundQueueSize, System.BackgroundQueueBlockSeconds)
@@ -1,6 +1,6 @@
 """Module containing utilities to check and ensure the argument types."""
 from abc import ABC, abstractmethod
-from typing import Any, Type, List, Union, Optional
+from typing import Any, Type, List, Union, Optional, Tuple, Dict, FrozenSet
 from inspect import signature, Parameter
 
 from bson import ObjectId
@@ -232,10 +232,10 @@ def arg_type_ensure(fn=None, *, converter: Optional[Type[BaseDataTypeConverter]]
     """
     A Decorator to ensure the parameter is the desired data type real time.
 
-    This will inspect the signature of the function, and extract the type notation if available.
+    This will inspect the signature of the function once on decoration, and extract the type notation if available.
     Then the extracted notation will be used to cast the data by ``converter``.
 
-    This function is expensive, it is recommended to use only when the argument type needs to be ensured.
+    Arguments which type is exactly the type notation (or one of the types in :class:`Union`) are not casted.
 
     The behavior on invalid type or casting failed will depend on ``converter``.
 
@@ -256,51 +256,112 @@ def arg_type_ensure(fn=None, *, converter: Optional[Type[BaseDataTypeConverter]]
     """
     if fn:
         # Used when as decorator and with parentheses
-        def _wrapper_in(*args_cast, **kwargs_cast):
-            return _type_ensure(fn, converter, *args_cast, **kwargs_cast)
-
-        return _wrapper_in
+        return _type_ensure(fn, converter)
 
     # Used when as decorator and without parentheses
     def _fn_wrap(fn_in):
-        def _wrapper_in_2(*args_cast, **kwargs_cast):
-            return _type_ensure(fn_in, converter, *args_cast, **kwargs_cast)
-
-        return _wrapper_in_2
+        return _type_ensure(fn_in, converter)
 
     return _fn_wrap
 
 
-def _type_ensure(fn, converter: Type[BaseDataTypeConverter], *args_cast, **kwargs_cast):
-    sig = signature(fn)
-    prms = sig.parameters
-    prms_vars = filter(
-        lambda _: prms[_].kind in (prms[_].POSITIONAL_OR_KEYWORD, prms[_].POSITIONAL_ONLY), prms)
-    prms_kw = filter(
-        lambda _: prms[_].kind == prms[_].KEYWORD_ONLY, prms)
+class _ConversionPlan:
+    """
+    Plan to convert the arguments of a function, compiled from the signature of the function.
+
+    Only the positional arguments and the keyword-only arguments will be converted.
+
+    Each parameter to be converted is stored as a :class:`tuple` of
+    (position or name, type annotation, types which could skip the conversion).
+    """
 
-    new_args = []
-    for old_arg, prm in zip(args_cast, prms_vars):
-        prm_ = prms[prm]
+    def __init__(self, fn, converter: Type[BaseDataTypeConverter]):
+        self.converter = converter
 
-        if prm_ is prm_.empty:
-            new_args.append(old_arg)
-        else:
-            new_args.append(converter.convert(old_arg, prm_.annotation))
+        prms = signature(fn).parameters.values()
+        prms_vars = [prm for prm in prms if prm.kind in (Parameter.POSITIONAL_OR_KEYWORD, Parameter.POSITIONAL_ONLY)]
 
-    new_kwargs = {}
-    for prm_name in prms_kw:
-        prm_ = prms[prm_name]
+        self.positional_count = len(prms_vars)
+        self.positional: Tuple[Tuple[int, Any, FrozenSet[type]], ...] = tuple(
+            (idx, prm.annotation, self._exact_types(prm.annotation))
+            for idx, prm in enumerate(prms_vars) if self._needs_convert(prm.annotation)
+        )
+        self.keyword: Tuple[Tuple[str, Any, FrozenSet[type]], ...] = tuple(
+            (prm.name, prm.annotation, self._exact_types(prm.annotation))
+            for prm in prms if prm.kind == Parameter.KEYWORD_ONLY and self._needs_convert(prm.annotation)
+        )
 
-        try:
-            old = kwargs_cast.pop(prm_name)
-            if prm_ is prm_.empty:
-                new_kwargs[prm_name] = old
-            else:
-                new_kwargs[prm_name] = converter.convert(old, prm_.annotation)
-        except KeyError:
-            pass
+    def _needs_convert(self, type_annt) -> bool:
+        # Converter returns the data as-is for these annotations
+        return type_annt is not Parameter.empty and type_annt not in self.converter._ignore
+
+    @staticmethod
+    def _exact_types(type_annt) -> FrozenSet[type]:
+        """Get the types which the converter returns the data as-is if the data is exactly one of them."""
+        origin = BaseDataTypeConverter._typing_alias_origin(type_annt)
+
+        if origin is Union:
+            return frozenset(arg for arg in type_annt.__args__ if isinstance(arg, type))
+
+        if origin is None and isinstance(type_annt, type):
+            return frozenset({type_annt})
+
+        return frozenset()
+
+    def convert_args(self, args: tuple) -> tuple:
+        """
+        Convert the positional arguments ``args``.
+
+        Arguments exceeding the count of the positional parameters are dropped.
+
+        :param args: positional arguments to be converted
+        :return: converted positional arguments
+        """
+        if len(args) > self.positional_count:
+            args = args[:self.positional_count]
+
+        new_args = None
+        for idx, type_annt, exact_types in self.positional:
+            if idx >= len(args):
+                break
+
+            arg = args[idx]
+            if type(arg) in exact_types:
+                continue
+
+            if new_args is None:
+                new_args = list(args)
+            new_args[idx] = self.converter.convert(arg, type_annt)
+
+        return args if new_args is None else tuple(new_args)
+
+    def convert_kwargs(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert the keyword-only arguments in ``kwargs``.
+
+        :param kwargs: keyword arguments to be converted
+        :return: converted keyword arguments
+        """
+        for name, type_annt, exact_types in self.keyword:
+            if name in kwargs and type(kwargs[name]) not in exact_types:
+                kwargs[name] = self.converter.convert(kwargs[name], type_annt)
+
+        return kwargs
+
+
+def _type_ensure(fn, converter: Type[BaseDataTypeConverter]):
+    plan = _ConversionPlan(fn, converter)
+
+    if not plan.positional and not plan.keyword:
+        def _wrapper_no_convert(*args_cast, **kwargs_cast):
+            if len(args_cast) > plan.positional_count:
+                args_cast = args_cast[:plan.positional_count]
+
+            return fn(*args_cast, **kwargs_cast)
+
+        return _wrapper_no_convert
 
-    new_kwargs.update(**kwargs_cast)
+    def _wrapper_in(*args_cast, **kwargs_cast):
+        return fn(*plan.convert_args(args_cast), **plan.convert_kwargs(kwargs_cast))
 
-    return fn(*new_args, **new_kwargs)
+    return _wrapper_in
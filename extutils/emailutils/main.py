@@ -1,5 +1,4 @@
 """Main utilities related to email."""
-from threading import Thread
 from typing import List, Optional, Tuple
 
 import ttldict
@@ -8,6 +7,7 @@ from django.conf import settings
 from django.utils.html import strip_tags
 
 from env_var import is_testing
+from extutils.bgexec import BACKGROUND_EXECUTOR
 from JellyBot.systemconfig import Email
 from mixin import ClearableMixin
 
@@ -124,4 +124,4 @@ class MailSender(ClearableMixin):
         if is_testing():
             MailSender.send_email(content_html, recipients, subject, prefix)
         else:
-            Thread(target=MailSender.send_email, args=(content_html, recipients, subject, prefix)).start()
+            BACKGROUND_EXECUTOR.submit(MailSender.send_email, content_html, recipients, subject, prefix)
@@ -1,6 +1,6 @@
 """Main ``Flag`` implementations."""
 from enum import Enum
-from typing import Union
+from typing import Union, Dict, Tuple
 
 from .mongo import register_encoder
 
@@ -298,7 +298,55 @@ class FlagPrefixedDoubleMixin(FlagDoubleMixin):
 
 
 class FlagEnumMixin:
-    """Mixin for some extend enum functionality."""
+    """
+    Mixin for some extend enum functionality.
+
+    The members are looked up from the tables built on the first :meth:`cast()` or :meth:`contains()` call
+    instead of comparing with each member.
+    """
+
+    @classmethod
+    def _lookup_tables(cls) -> Tuple[Dict[int, "FlagEnumMixin"], Dict[str, "FlagEnumMixin"]]:
+        """
+        Get the lookup tables of the members, which are the table of ``code`` and the table of :class:`str`.
+
+        The table of :class:`str` contains ``code_str`` (for :class:`FlagDoubleMixin` only) and ``name``,
+        which is the same as the matching order of ``__eq__()``.
+
+        :return: table of `code` and table of `str`
+        """
+        # Not using `getattr()` to prevent getting the tables of the parent class
+        tables = cls.__dict__.get("_flag_lookup")
+
+        if tables is None:
+            by_code = {}
+            by_str = {}
+
+            # noinspection PyTypeChecker
+            for member in cls:
+                by_code.setdefault(member.code, member)
+
+                if isinstance(member, FlagDoubleMixin):
+                    by_str.setdefault(member.code_str, member)
+                by_str.setdefault(member.name, member)
+
+            tables = (by_code, by_str)
+            setattr(cls, "_flag_lookup", tables)
+
+        return tables
+
+    @classmethod
+    def _lookup(cls, item: Union[str, int]):
+        by_code, by_str = cls._lookup_tables()
+
+        if isinstance(item, int):
+            return by_code.get(item)
+
+        member = by_str.get(item)
+        if member is None and item.isnumeric():
+            member = by_code.get(int(item))
+
+        return member
 
     @classmethod
     def cast(cls, item: Union[str, int], *, silent_fail=False):
@@ -321,10 +369,9 @@ class FlagEnumMixin:
         if not type(item) in (str, int):
             raise TypeError(f"Source type ({type(item)}) for casting not handled.")
 
-        # noinspection PyTypeChecker
-        for i in list(cls):
-            if i == item:
-                return i
+        member = cls._lookup(item)
+        if member is not None:
+            return member
 
         if silent_fail:
             return None
@@ -339,15 +386,13 @@ class FlagEnumMixin:
         :param item: item to check the membership
         :return: if `item` is the member of this `FlagEnumMixin`
         """
-        if not type(item) in (str, int, cls):
-            return False
+        if type(item) is cls:
+            return True
 
-        # noinspection PyTypeChecker
-        for i in list(cls):
-            if i == item:
-                return True
+        if not type(item) in (str, int):
+            return False
 
-        return False
+        return cls._lookup(item) is not None
 
 
 class FlagCodeEnum(FlagCodeMixin, FlagEnumMixin, Enum):
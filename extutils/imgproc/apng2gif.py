@@ -1,21 +1,33 @@
-"""Module to convert ``apng`` to ``gif``."""
-import io
+"""
+Module to convert ``apng`` to ``gif``.
+
+The frames are kept as RGBA arrays during the conversion and quantized in a shared process pool.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 from fractions import Fraction
 import os
+from threading import Lock
 import time
 from typing import Any, Tuple, List, Optional
 from zipfile import ZipFile
 
+import numpy as np
 from PIL import Image
 
-from .apng2png import extract_frames
+from JellyBot.systemconfig import ExtraService
+
+from .apng2png import extract_frame_arrays, frame_array_to_png
 
 __all__ = ("convert", "ConvertResult", "ConvertOpResult",)
 
 _IDX_CLR_BACKGROUND = 255
 _IDX_CLR_TRANSPARENT = 255
 
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = Lock()
+
 
 class ConvertOpResult:
     """Result of an operation during the conversion."""
@@ -130,9 +142,9 @@ def _get_file_name(file_path: str) -> str:
     return os.path.splitext(os.path.basename(file_path))[0]
 
 
-def _extract_frames(result: ConvertResult, apng_bin: bytes) -> Optional[List[Tuple[bytes, Fraction]]]:
+def _extract_frames(result: ConvertResult, apng_bin: bytes) -> Optional[List[Tuple[np.ndarray, Fraction]]]:
     """
-    Extract the frames of the APNG file and return it as 2-tuples containing the image byte data and its delay.
+    Extract the frames of the APNG file and return it as 2-tuples containing the RGBA array and its delay.
 
     If the extraction failed, returns ``None``
     and record the exception to ``result.frame_extraction_exception`` instead.
@@ -143,7 +155,7 @@ def _extract_frames(result: ConvertResult, apng_bin: bytes) -> Optional[List[Tup
     _start = time.time()
 
     try:
-        ret = extract_frames(apng_bin)
+        ret = extract_frame_arrays(apng_bin)
     except Exception as ex:
         result.frame_extraction.set_failure(ex)
         return None
@@ -153,12 +165,12 @@ def _extract_frames(result: ConvertResult, apng_bin: bytes) -> Optional[List[Tup
     return ret
 
 
-def _zip_frames(result: ConvertResult, frame_data: List[Tuple[bytes, Fraction]], output_path: str):
+def _zip_frames(result: ConvertResult, frame_data: List[Tuple[np.ndarray, Fraction]], output_path: str):
     """
-    Zip the frames to be a single zip file preceded with the apng file name.
+    Encode the frames to PNG and zip them to be a single zip file preceded with the apng file name.
 
     :param result: conversion result object
-    :param frame_data: list of 2-tuple containing the image byte data and its delay
+    :param frame_data: list of 2-tuple containing the RGBA array of a frame and its delay
     :param output_path: output directory of the zip file
     """
     _start = time.time()
@@ -169,7 +181,7 @@ def _zip_frames(result: ConvertResult, frame_data: List[Tuple[bytes, Fraction]],
         with ZipFile(os.path.join(os.path.dirname(output_path), f"{out_name}-frames.zip"), "w") as zip_file:
             for idx, data in enumerate(frame_data, start=1):
                 frame, _ = data
-                zip_file.writestr(f"{out_name}-{idx:02d}.png", frame)
+                zip_file.writestr(f"{out_name}-{idx:02d}.png", frame_array_to_png(frame))
     except Exception as ex:
         result.frame_zipping.set_failure(ex)
         return
@@ -177,26 +189,70 @@ def _zip_frames(result: ConvertResult, frame_data: List[Tuple[bytes, Fraction]],
     result.frame_zipping.set_success(time.time() - _start)
 
 
-def _process_frame_transparent(image_byte: bytes):
+def _process_frame_transparent(frame: np.ndarray) -> Tuple[np.ndarray, List[int]]:
     """
-    Apply color index for transparency to ``image_byte`` and return the modified PIL image object.
+    Quantize ``frame`` and apply color index for transparency to it.
+
+    Returns a 2-tuple containing the palette indexes of the pixels and the palette,
+    so the result could be sent back from the worker process at a low cost.
 
     The color index for transparency is ``_IDX_CLR_TRANSPARENT``.
 
     Copied and modified from ``apng2gif``.
 
-    :param image_byte: byte data of an image/frame
+    :param frame: RGBA array of a frame
+    :return: 2-tuple containing the palette indexes of the pixels and the palette
     """
-    image = Image.open(io.BytesIO(image_byte))
-    alpha = image.getchannel("A")
     # Convert the image into P mode but only use 255 colors in the palette out of 256
-    image = image.convert("RGB").convert("P", palette=Image.ADAPTIVE, colors=255)
-    # Set all alpha < 128 to value 255, 0 otherwise
-    image.paste(_IDX_CLR_TRANSPARENT, Image.eval(alpha, lambda a: 255 if a <= 128 else 0))
-    return image
+    image = Image.fromarray(frame[:, :, :3], "RGB").convert("P", palette=Image.ADAPTIVE, colors=255)
+
+    indexes = np.array(image)
+    # Set the pixels with alpha <= 128 to be transparent
+    indexes[frame[:, :, 3] <= 128] = _IDX_CLR_TRANSPARENT
+
+    return indexes, image.getpalette()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor  # pylint: disable=global-statement
+
+    with _executor_lock:
+        if not _executor:
+            _executor = ProcessPoolExecutor(max_workers=ExtraService.Sticker.ConversionWorkerCount)
+
+        return _executor
+
 
+def _reset_executor():
+    global _executor  # pylint: disable=global-statement
 
-def _get_image_data(result: ConvertResult, frame_data: List[Tuple[bytes, Fraction]]) \
+    with _executor_lock:
+        if _executor:
+            _executor.shutdown(wait=False)
+            _executor = None
+
+
+def _process_frames_transparent(frames: List[np.ndarray]) -> List[Tuple[np.ndarray, List[int]]]:
+    """
+    Call :func:`_process_frame_transparent()` on each of ``frames`` in the shared process pool.
+
+    The frames will be processed in the current process
+    if there is only one frame or the process pool is broken.
+
+    :param frames: RGBA arrays of the frames
+    :return: list of 2-tuple containing the palette indexes of the pixels and the palette
+    """
+    if len(frames) > 1 and ExtraService.Sticker.ConversionWorkerCount > 1:
+        try:
+            return list(_get_executor().map(_process_frame_transparent, frames))
+        except BrokenProcessPool:
+            # Worker process died unexpectedly, recreate the pool on the next conversion
+            _reset_executor()
+
+    return [_process_frame_transparent(frame) for frame in frames]
+
+
+def _get_image_data(result: ConvertResult, frame_data: List[Tuple[np.ndarray, Fraction]]) \
         -> Tuple[List[Any], List[Fraction]]:
     """
     Collate and process the data of ``frame_data``.
@@ -206,7 +262,7 @@ def _get_image_data(result: ConvertResult, frame_data: List[Tuple[bytes, Fractio
     - 2nd element is the duration of each frames
 
     :param result: conversion result object
-    :param frame_data: list of 2-tuple containing frame byte data and its delay
+    :param frame_data: list of 2-tuple containing the RGBA array of a frame and its delay
     :return: frame data to be used to compose a gif
     """
     _start = time.time()
@@ -215,8 +271,13 @@ def _get_image_data(result: ConvertResult, frame_data: List[Tuple[bytes, Fractio
     durations = []
 
     try:
-        for image_byte, delay in frame_data:
-            images.append(_process_frame_transparent(image_byte))
+        processed = _process_frames_transparent([frame for frame, _ in frame_data])
+
+        for (indexes, palette), (_, delay) in zip(processed, frame_data):
+            image = Image.fromarray(indexes, "P")
+            image.putpalette(palette)
+
+            images.append(image)
             durations.append(delay)
     except Exception as ex:
         result.image_data_collation.set_failure(ex)
@@ -227,12 +288,12 @@ def _get_image_data(result: ConvertResult, frame_data: List[Tuple[bytes, Fractio
     return images, durations
 
 
-def _make_gif(result: ConvertResult, frame_data: List[Tuple[bytes, Fraction]], output_path: str):
+def _make_gif(result: ConvertResult, frame_data: List[Tuple[np.ndarray, Fraction]], output_path: str):
     """
     Use the extracted ``frame_data`` to construct a gif and output it to ``output_path``.
 
     :param result: conversion result object
-    :param frame_data: list of 2-tuple containing frame byte data and its delay
+    :param frame_data: list of 2-tuple containing the RGBA array of a frame and its delay
     :param output_path: path for the completed gif
     """
     images, durations = _get_image_data(result, frame_data)
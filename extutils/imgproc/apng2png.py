@@ -17,9 +17,10 @@ import io
 import struct
 from typing import Union, Generator, List, Tuple
 
+import numpy as np
 from PIL import Image
 
-__all__ = ("extract_frames",)
+__all__ = ("extract_frames", "extract_frame_arrays", "frame_array_to_png",)
 
 SIGNATURE_PNG = b"\x89\x50\x4e\x47\x0d\x0a\x1a\x0a"
 
@@ -325,20 +326,49 @@ def _group_chunks(chuck_classes: List[_DataChunkBase]) \
     return ret
 
 
-def extract_frames(apng_bin: bytes) -> List[Tuple[bytes, Fraction]]:
+def _compose_frame(width: int, height: int, frame_img: Image.Image, x_offset: int, y_offset: int) -> np.ndarray:
+    # Same as pasting the frame onto a transparent white canvas, but without creating another image
+    canvas = np.zeros((height, width, 4), dtype=np.uint8)
+    canvas[:, :, :3] = 255
+
+    frame = np.asarray(frame_img.convert("RGBA"))
+    frame = frame[:max(height - y_offset, 0), :max(width - x_offset, 0)]
+
+    canvas[y_offset:y_offset + frame.shape[0], x_offset:x_offset + frame.shape[1]] = frame
+
+    return canvas
+
+
+def frame_array_to_png(frame: np.ndarray) -> bytes:
     """
-    Extract the frames of an apng from its binary ``apng_bin``.
+    Encode the RGBA array of a frame to PNG.
 
-    Returns a 2-tuple containing the byte data of a frame and its delay.
+    :param frame: RGBA array of a frame in the shape of ``(height, width, 4)``
+    :return: PNG byte data of the frame
+    """
+    img_byte_data = io.BytesIO()
+    Image.fromarray(frame, "RGBA").save(img_byte_data, format="PNG")
+
+    return img_byte_data.getvalue()
+
+
+def extract_frame_arrays(apng_bin: bytes) -> List[Tuple[np.ndarray, Fraction]]:
+    """
+    Extract the frames of an apng from its binary ``apng_bin`` as the RGBA arrays.
+
+    Returns a 2-tuple containing the RGBA array of a frame in the shape of ``(height, width, 4)`` and its delay.
+
+    The frames are not encoded, so this should be used instead of :func:`extract_frames()`
+    if the frames are to be processed further.
 
     :param apng_bin: binary of an apng
-    :return: list of 2-tuple containing frame byte data and its delay
+    :return: list of 2-tuple containing the RGBA array of a frame and its delay
     """
     # pylint: disable=too-many-locals
 
     chunk = [c.to_chunk_class() for c in _parse_chunks(apng_bin)]
 
-    ret: List[Tuple[bytes, Fraction]] = []
+    ret: List[Tuple[np.ndarray, Fraction]] = []
 
     IHDR = chunk[0]
     IEND = chunk[-1]
@@ -361,15 +391,23 @@ def extract_frames(apng_bin: bytes) -> List[Tuple[bytes, Fraction]]:
         if fcTL.dispose == _Dispose.APNG_DISPOSE_OP_PREVIOUS:
             image_data_prev = True
 
-        # Save image
-        img = Image.new("RGBA", (IHDR.width, IHDR.height), (255, 255, 255, 0))
-        img.paste(Image.open(io.BytesIO(image_data)), (fcTL.x_offset, fcTL.y_offset))
-        img_byte_data = io.BytesIO()
-        img.save(img_byte_data, format="PNG")
-        img_byte_data = img_byte_data.getvalue()
+        frame = _compose_frame(IHDR.width, IHDR.height, Image.open(io.BytesIO(image_data)),
+                               fcTL.x_offset, fcTL.y_offset)
 
         delay = Fraction(f"{fcTL.delay_num}/{fcTL.delay_den}")
 
-        ret.append((img_byte_data, delay))
+        ret.append((frame, delay))
 
     return ret
+
+
+def extract_frames(apng_bin: bytes) -> List[Tuple[bytes, Fraction]]:
+    """
+    Extract the frames of an apng from its binary ``apng_bin``.
+
+    Returns a 2-tuple containing the byte data of a frame and its delay.
+
+    :param apng_bin: binary of an apng
+    :return: list of 2-tuple containing frame byte data and its delay
+    """
+    return [(frame_array_to_png(frame), delay) for frame, delay in extract_frame_arrays(apng_bin)]
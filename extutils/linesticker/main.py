@@ -3,17 +3,22 @@ import atexit
 import re
 from abc import ABC
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
 import os
 import shutil
 import tempfile
+from threading import Condition, Lock, Thread
 import time
-from typing import Optional, BinaryIO, Union, List, Tuple
+from typing import Optional, BinaryIO, Union, List, Tuple, Generator, Iterator, Dict
 from zipfile import ZipFile
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from extutils.imgproc import apng2gif
+from extutils.logger import LoggerSkeleton
+from JellyBot.systemconfig import ExtraService
 from mixin import ClearableMixin
 
 from .flag import LineStickerLanguage, LineStickerType
@@ -23,9 +28,86 @@ from .tempfile import LineStickerTempStorageManager
 __all__ = ("LineStickerUtils", "LineAnimatedStickerDownloadResult",
            "LineStickerMetadata")
 
+logger = LoggerSkeleton("sys.linesticker", logger_name_env="LINE_STICKER")
+
 _temp_dir = tempfile.mkdtemp(prefix="jellybot-line-")  # Temporary directory for LINE stickers
 atexit.register(shutil.rmtree, _temp_dir)  # Clear temporary directory on exit
 
+_STREAM_CHUNK_SIZE = 64 * 1024  # Size of each chunk when streaming the stored files
+
+# Pooled session to reuse the connections to LINE servers
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_maxsize=ExtraService.Sticker.HttpPoolSize))
+_session.mount("http://", HTTPAdapter(pool_maxsize=ExtraService.Sticker.HttpPoolSize))
+
+
+def _record_file(file_path: str):
+    """Record the file at ``file_path`` to the temporary storage manager if it is in the temporary directory."""
+    if os.path.dirname(os.path.abspath(file_path)) == _temp_dir:
+        LineStickerTempStorageManager.create_file(file_path)
+
+
+def _open_file(file_path: str) -> Optional[BinaryIO]:
+    """Open the file at ``file_path`` and mark it as used. Returns ``None`` if the file does not exist."""
+    try:
+        stream = open(file_path, "rb")
+    except FileNotFoundError:
+        return None
+
+    LineStickerTempStorageManager.touch_file(file_path)
+
+    return stream
+
+
+@contextmanager
+def _atomic_output(file_path: str):
+    """
+    Get a temporary path to write the file at ``file_path``.
+
+    All files written into the directory of the temporary path will be moved to the directory of ``file_path``
+    on exit, and the file at ``file_path`` will be moved last.
+    Therefore, the files will either be completely written or not exist.
+
+    :param file_path: actual file path
+    """
+    out_dir = os.path.dirname(os.path.abspath(file_path))
+    file_name = os.path.basename(file_path)
+
+    temp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=out_dir)
+
+    try:
+        yield os.path.join(temp_dir, file_name)
+
+        for name in sorted(os.listdir(temp_dir), key=lambda n: n == file_name):
+            os.replace(os.path.join(temp_dir, name), os.path.join(out_dir, name))
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class _ZipStream:
+    """
+    Unseekable stream for :class:`ZipFile` to write the archive into.
+
+    :class:`ZipFile` does not seek back to patch the written headers if the stream is unseekable,
+    so the written data of ``file`` is final and could be read while the archive is being written.
+    """
+
+    def __init__(self, file: BinaryIO):
+        self._file = file
+
+    def write(self, data: bytes) -> int:
+        """
+        Write ``data`` to the file.
+
+        :param data: data to be written
+        :return: length of the written data
+        """
+        return self._file.write(data)
+
+    def flush(self):
+        """Flush the file."""
+        self._file.flush()
+
 
 # region For sticker downloading
 
@@ -485,64 +567,142 @@ class LineStickerPackDownloader:
         return pack_meta
 
     @staticmethod
-    def _download_stickers(pack_dl_result: LineStickerPackDownloadResult, pack_id: Union[str, int]) \
-            -> List[Tuple[BinaryIO, int]]:
-        pack_meta = pack_dl_result.pack_meta
+    def _iter_stickers(pack_dl_result: LineStickerPackDownloadResult, pack_id: Union[str, int]) \
+            -> Generator[Tuple[BinaryIO, int], None, None]:
+        """
+        Download the stickers concurrently and yield each of them once it is downloaded (and converted).
 
-        _start = time.time()
+        Stickers not yet downloaded will be cancelled if the generator is closed.
+        """
+        pack_meta = pack_dl_result.pack_meta
 
-        sticker_to_zip: List[Tuple[BinaryIO, int]] = []
+        def get_sticker(stk_id) -> Optional[BinaryIO]:
+            if pack_meta.is_animated_sticker:
+                return LineStickerUtils.get_downloaded_animated(pack_id, stk_id, with_frames=False)
 
-        with ThreadPoolExecutor() as executor:
-            def handle_animated(stk_id) -> Tuple[Optional[BinaryIO], int]:
-                stk_io = LineStickerUtils.get_downloaded_animated(pack_id, stk_id, with_frames=False)
-                if not stk_io:
-                    return None, stk_id
+            return LineStickerUtils.get_downloaded_sticker(stk_id)
 
-                pack_dl_result.set_sticker_downloaded(stk_id)
-                return stk_io, stk_id
+        executor = ThreadPoolExecutor(max_workers=ExtraService.Sticker.HttpPoolSize)
+        futures = {executor.submit(get_sticker, sticker_id): sticker_id for sticker_id in pack_meta.sticker_ids}
+        yielded = set()
 
-            def handle_static(stk_id) -> Tuple[Optional[BinaryIO], int]:
-                stk_io = LineStickerUtils.get_downloaded_sticker(stk_id)
-                if not stk_io:
-                    return None, stk_id
+        try:
+            for future in as_completed(futures):
+                yielded.add(future)
+                sticker_id = futures[future]
 
-                pack_dl_result.set_sticker_downloaded(stk_id)
-                return stk_io, stk_id
+                if future.exception():
+                    logger.logger.warning("Failed to download the sticker. Pack ID: %s / Sticker ID: %s",
+                                          pack_id, sticker_id, exc_info=future.exception())
+                    continue
 
-            futures = []
+                sticker_io = future.result()
+                if sticker_io:
+                    pack_dl_result.set_sticker_downloaded(sticker_id)
+                    yield sticker_io, sticker_id
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown()
+
+            # Close the streams of the stickers downloaded but not yielded
+            for future in futures:
+                if future not in yielded and not future.cancelled() and not future.exception() and future.result():
+                    future.result().close()
 
-            if pack_meta.is_animated_sticker:
-                for sticker_id in pack_meta.sticker_ids:
-                    futures.append(executor.submit(handle_animated, sticker_id))
-            else:
-                for sticker_id in pack_meta.sticker_ids:
-                    futures.append(executor.submit(handle_static, sticker_id))
+    @staticmethod
+    def _download_stickers(pack_dl_result: LineStickerPackDownloadResult, pack_id: Union[str, int]) \
+            -> List[Tuple[BinaryIO, int]]:
+        _start = time.time()
 
-            for future in as_completed(futures):
-                sticker_io, sticker_id = future.result()
-                if sticker_io:
-                    sticker_to_zip.append((sticker_io, sticker_id))
+        sticker_to_zip = list(LineStickerPackDownloader._iter_stickers(pack_dl_result, pack_id))
 
         pack_dl_result.set_download_completed(time.time() - _start)
 
         return sticker_to_zip
 
+    @staticmethod
+    def _zip_sticker(pack_dl_result: LineStickerPackDownloadResult, zip_file: ZipFile,
+                     sticker_io: BinaryIO, sticker_id: int):
+        extension = "gif" if pack_dl_result.pack_meta.is_animated_sticker else "png"
+
+        with sticker_io, zip_file.open(f"{sticker_id}.{extension}", "w") as zip_entry:
+            shutil.copyfileobj(sticker_io, zip_entry)
+
+        pack_dl_result.set_sticker_zipped(sticker_id)
+
     @staticmethod
     def _zip_stickers(pack_dl_result: LineStickerPackDownloadResult,
                       sticker_to_zip: List[Tuple[BinaryIO, int]], zip_path: str):
         _start = time.time()
 
-        extension = "gif" if pack_dl_result.pack_meta.is_animated_sticker else "png"
+        with _atomic_output(zip_path) as temp_path:
+            with ZipFile(temp_path, "w") as zip_file:
+                for sio, sid in sticker_to_zip:
+                    LineStickerPackDownloader._zip_sticker(pack_dl_result, zip_file, sio, sid)
 
-        with ZipFile(zip_path, "w") as zip_file:
-            for sio, sid in sticker_to_zip:
-                with sio:
-                    zip_file.writestr(f"{sid}.{extension}", sio.read())
-                    pack_dl_result.set_sticker_zipped(sid)
+        _record_file(zip_path)
 
         pack_dl_result.set_zip_completed(time.time() - _start)
 
+    @staticmethod
+    def _stream_stickers(pack_dl_result: LineStickerPackDownloadResult, pack_id: Union[str, int]) \
+            -> Generator[bytes, None, None]:
+        """
+        Yield the data of the sticker package zip.
+
+        The stored sticker package zip is streamed if exists. Otherwise, the zip is written by a
+        :class:`_PackZipProducer` and the data is yielded as the zip grows, so the concurrent streams
+        of the same sticker package share the same producer without waiting on each other.
+        """
+        zip_path = os.path.join(_temp_dir, f"{pack_id}.zip")
+
+        stored_zip = _open_file(zip_path)
+        if stored_zip:
+            pack_dl_result.set_exists()
+
+            with stored_zip:
+                yield from iter(lambda: stored_zip.read(_STREAM_CHUNK_SIZE), b"")
+
+            return
+
+        yield from _PackZipProducer.get_or_start(pack_dl_result, pack_id, zip_path).iter_data()
+
+    @staticmethod
+    def stream_pack(pack_id: Union[str, int]) -> Optional[Iterator[bytes]]:
+        """
+        Download the sticker package and get its zip as a stream of bytes.
+
+        Each sticker is zipped into the temporary storage in a background thread once it is downloaded
+        (and converted), and the zip is streamed as it grows, so only the sticker being zipped is held in the memory.
+        The zip will be completed even if the stream is closed early, so it can be acquired using ``get_pack()``.
+
+        If the sticker package is being zipped for the others, the stream follows the zip being written
+        instead of downloading it again.
+        The stored sticker package zip is streamed if it already exists in the temporary storage.
+
+        Returns ``None`` if the sticker package is not available (not found).
+
+        :param pack_id: sticker package ID to be downloaded
+        :return: stream of the sticker package zip
+        """
+        pack_dl_result = LineStickerPackDownloadResult()
+
+        if not LineStickerPackDownloader._get_metadata(pack_dl_result, pack_id):
+            return None
+
+        return LineStickerPackDownloader._stream_stickers(pack_dl_result, pack_id)
+
+    @staticmethod
+    def get_stored_pack(pack_id: Union[str, int]) -> Optional[BinaryIO]:
+        """
+        Get the sticker package zip as a :class:`BinaryIO` if it exists in the temporary storage.
+
+        :param pack_id: sticker package ID
+        :return: binary stream of the sticker package zip file if exists
+        """
+        return _open_file(os.path.join(_temp_dir, f"{pack_id}.zip"))
+
     @staticmethod
     def get_pack(pack_id: Union[str, int]) -> Optional[BinaryIO]:
         """
@@ -557,40 +717,187 @@ class LineStickerPackDownloader:
         """
         sticker_pack_path = os.path.join(_temp_dir, f"{pack_id}.zip")
 
-        if not os.path.exists(sticker_pack_path):
-            result = LineStickerPackDownloader.download_pack(pack_id)
+        stream = _open_file(sticker_pack_path)
+        if stream:
+            return stream
+
+        result = LineStickerPackDownloader.download_pack(pack_id)
 
-            if not result.succeed:
-                return None
+        if not result.succeed:
+            return None
 
-        return open(sticker_pack_path, "rb")
+        return _open_file(sticker_pack_path)
 
     @staticmethod
     def download_pack(pack_id: Union[str, int]) -> LineStickerPackDownloadResult:
         """
         Download the sticker package.
 
+        Concurrent downloads of the same sticker package will wait for the first one
+        and then reuse the downloaded sticker package.
+
         :param pack_id: ID of the sticker package to be downloaded
         :return: sticker package download result
         """
         pack_dl_result = LineStickerPackDownloadResult()
 
-        pack_meta = LineStickerPackDownloader._get_metadata(pack_dl_result, pack_id)
-        if not pack_meta:
-            return pack_dl_result
-
         zip_path = os.path.join(_temp_dir, f"{pack_id}.zip")
-        if os.path.exists(zip_path):
-            pack_dl_result.set_exists()
-            return pack_dl_result
 
-        sticker_to_zip = LineStickerPackDownloader._download_stickers(pack_dl_result, pack_id)
+        with LineStickerTempStorageManager.lock_file(zip_path):
+            pack_meta = LineStickerPackDownloader._get_metadata(pack_dl_result, pack_id)
+            if not pack_meta:
+                return pack_dl_result
+
+            if os.path.exists(zip_path):
+                pack_dl_result.set_exists()
+                LineStickerTempStorageManager.touch_file(zip_path)
+                return pack_dl_result
+
+            sticker_to_zip = LineStickerPackDownloader._download_stickers(pack_dl_result, pack_id)
 
-        LineStickerPackDownloader._zip_stickers(pack_dl_result, sticker_to_zip, zip_path)
+            LineStickerPackDownloader._zip_stickers(pack_dl_result, sticker_to_zip, zip_path)
 
         return pack_dl_result
 
 
+class _PackZipProducer:
+    """
+    Zip the stickers of a sticker package into the temporary storage in a background thread.
+
+    The zip is written independently of the readers, so a slow reader neither blocks the other readers
+    nor holds the lock of the sticker package zip. Readers get the data written so far,
+    then wait for more data until the zip is completed.
+    """
+
+    _producers: Dict[str, "_PackZipProducer"] = {}
+    _producers_lock = Lock()
+
+    def __init__(self, pack_dl_result: LineStickerPackDownloadResult, pack_id: Union[str, int], zip_path: str):
+        self._pack_dl_result = pack_dl_result
+        self._pack_id = pack_id
+        self._zip_path = zip_path
+
+        self._cond = Condition()
+        self._read_path: Optional[str] = None
+        self._size = 0
+        self._moving = False
+        self._completed = False
+        self._failed = False
+
+    @classmethod
+    def get_or_start(cls, pack_dl_result: LineStickerPackDownloadResult, pack_id: Union[str, int], zip_path: str) \
+            -> "_PackZipProducer":
+        """
+        Get the producer writing the zip at ``zip_path``. Start a new one if not exists.
+
+        :param pack_dl_result: download result to be updated if a new producer is started
+        :param pack_id: sticker package ID
+        :param zip_path: path of the sticker package zip
+        :return: producer of the sticker package zip
+        """
+        with cls._producers_lock:
+            producer = cls._producers.get(zip_path)
+            if not producer:
+                producer = cls._producers[zip_path] = cls(pack_dl_result, pack_id, zip_path)
+                Thread(target=producer._run, name=f"StickerZip-{pack_id}", daemon=True).start()
+
+        return producer
+
+    def _run(self):
+        try:
+            with LineStickerTempStorageManager.lock_file(self._zip_path):
+                if os.path.exists(self._zip_path):
+                    # Stored by the others before acquiring the lock
+                    self._pack_dl_result.set_exists()
+                    self._complete(self._zip_path, os.path.getsize(self._zip_path))
+                    return
+
+                self._write()
+        except Exception:  # pylint: disable=broad-except
+            logger.logger.exception("Failed to zip the sticker package. Pack ID: %s", self._pack_id)
+
+            with self._cond:
+                self._failed = True
+                self._completed = True
+                self._cond.notify_all()
+        finally:
+            with self._producers_lock:
+                self._producers.pop(self._zip_path, None)
+
+    def _write(self):
+        _start = time.time()
+
+        with _atomic_output(self._zip_path) as temp_path, open(temp_path, "wb") as cache_file:
+            with self._cond:
+                self._read_path = temp_path
+                self._cond.notify_all()
+
+            with ZipFile(_ZipStream(cache_file), "w") as zip_file:
+                for sio, sid in LineStickerPackDownloader._iter_stickers(self._pack_dl_result, self._pack_id):
+                    LineStickerPackDownloader._zip_sticker(self._pack_dl_result, zip_file, sio, sid)
+
+                    self._set_size(cache_file)
+
+            # Central directory of the archive
+            self._set_size(cache_file)
+
+            # Readers cannot open the file while it is being moved
+            with self._cond:
+                self._moving = True
+
+        _record_file(self._zip_path)
+
+        self._pack_dl_result.set_zip_completed(time.time() - _start)
+        self._complete(self._zip_path, self._size)
+
+    def _set_size(self, cache_file: BinaryIO):
+        cache_file.flush()
+
+        with self._cond:
+            self._size = cache_file.tell()
+            self._cond.notify_all()
+
+    def _complete(self, read_path: str, size: int):
+        with self._cond:
+            self._read_path = read_path
+            self._size = size
+            self._moving = False
+            self._completed = True
+            self._cond.notify_all()
+
+    def _check_failed(self):
+        if self._failed:
+            raise RuntimeError(f"Failed to zip the sticker package. Pack ID: {self._pack_id}")
+
+    def iter_data(self) -> Generator[bytes, None, None]:
+        """
+        Yield the data of the sticker package zip until it is completed.
+
+        :raises RuntimeError: if the producer failed to zip the sticker package
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._completed or (self._read_path and not self._moving))
+            self._check_failed()
+
+            # The opened file is still readable after it is moved
+            stream = open(self._read_path, "rb")
+
+        with stream:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._completed or stream.tell() < self._size)
+                    self._check_failed()
+
+                    size = self._size
+                    completed = self._completed
+
+                while stream.tell() < size:
+                    yield stream.read(min(_STREAM_CHUNK_SIZE, size - stream.tell()))
+
+                if completed:
+                    return
+
+
 # endregion
 
 
@@ -603,6 +910,8 @@ class LineStickerUtils(ClearableMixin):
             if file_path.is_file():
                 file_path.unlink()
 
+        LineStickerTempStorageManager.clear()
+
     @staticmethod
     def is_sticker_exists(sticker_id: Union[int, str]) -> bool:
         """
@@ -611,7 +920,7 @@ class LineStickerUtils(ClearableMixin):
         :param sticker_id: ID of the sticker to be checked
         :return: if the sticker exists
         """
-        return requests.head(LineStickerUtils.get_sticker_url(sticker_id)).ok
+        return _session.head(LineStickerUtils.get_sticker_url(sticker_id)).ok
 
     @staticmethod
     def get_meta_url(pack_id: Union[int, str]) -> str:
@@ -673,7 +982,7 @@ class LineStickerUtils(ClearableMixin):
         :return: packed metadata object
         :raises MetadataNotFoundError: request to get the metadata does not return 200
         """
-        pack_meta = requests.get(LineStickerUtils.get_meta_url(pack_id))
+        pack_meta = _session.get(LineStickerUtils.get_meta_url(pack_id))
 
         if not pack_meta.ok:
             raise MetadataNotFoundError(pack_id)
@@ -713,8 +1022,6 @@ class LineStickerUtils(ClearableMixin):
         if not output_path:
             output_path = os.path.join(_temp_dir, f"{sticker_id}.{sticker_type.to_extension()}")
 
-            LineStickerTempStorageManager.create_file(output_path)
-
         return output_path
 
     @staticmethod
@@ -738,13 +1045,16 @@ class LineStickerUtils(ClearableMixin):
         """
         sticker_path = os.path.join(_temp_dir, f"{sticker_id}.png")
 
-        if not os.path.exists(sticker_path):
-            result = LineStickerUtils.download_sticker(sticker_id, sticker_path)
+        stream = _open_file(sticker_path)
+        if stream:
+            return stream
+
+        result = LineStickerUtils.download_sticker(sticker_id, sticker_path)
 
-            if not result.succeed:
-                return None
+        if not result.succeed:
+            return None
 
-        return open(sticker_path, "rb")
+        return _open_file(sticker_path)
 
     @staticmethod
     def get_downloaded_animated(pack_id: Union[str, int], sticker_id: Union[str, int], *, with_frames: bool = True) \
@@ -770,13 +1080,16 @@ class LineStickerUtils(ClearableMixin):
         """
         sticker_path = os.path.join(_temp_dir, f"{sticker_id}.gif")
 
-        if not os.path.exists(sticker_path):
-            result = LineStickerUtils.download_apng_as_gif(pack_id, sticker_id, with_frames=with_frames)
+        stream = _open_file(sticker_path)
+        if stream:
+            return stream
 
-            if not result.succeed:
-                return None
+        result = LineStickerUtils.download_apng_as_gif(pack_id, sticker_id, with_frames=with_frames)
+
+        if not result.succeed:
+            return None
 
-        return open(sticker_path, "rb")
+        return _open_file(sticker_path)
 
     @staticmethod
     def get_downloaded_apng_frames(pack_id: Union[str, int], sticker_id: Union[str, int]) -> Optional[BinaryIO]:
@@ -800,13 +1113,16 @@ class LineStickerUtils(ClearableMixin):
         """
         zip_path = os.path.join(_temp_dir, f"{sticker_id}-frames.zip")
 
-        if not os.path.exists(zip_path):
-            result = LineStickerUtils.download_apng_as_gif(pack_id, sticker_id)
+        stream = _open_file(zip_path)
+        if stream:
+            return stream
 
-            if not result.available or not result.conversion_result.succeed:
-                return None
+        result = LineStickerUtils.download_apng_as_gif(pack_id, sticker_id)
 
-        return open(zip_path, "rb")
+        if not result.succeed:
+            return None
+
+        return _open_file(zip_path)
 
     @staticmethod
     def get_downloaded_sticker_pack(pack_id: Union[str, int]) -> Optional[BinaryIO]:
@@ -822,6 +1138,30 @@ class LineStickerUtils(ClearableMixin):
         """
         return LineStickerPackDownloader.get_pack(pack_id)
 
+    @staticmethod
+    def get_stored_sticker_pack(pack_id: Union[str, int]) -> Optional[BinaryIO]:
+        """
+        Get the sticker package zip as a :class:`BinaryIO` only if it exists in the temporary storage.
+
+        :param pack_id: sticker package ID
+        :return: binary stream of the sticker package zip file if exists
+        """
+        return LineStickerPackDownloader.get_stored_pack(pack_id)
+
+    @staticmethod
+    def stream_sticker_pack(pack_id: Union[str, int]) -> Optional[Iterator[bytes]]:
+        """
+        Download the sticker package and get its zip as a stream of bytes.
+
+        The stream starts once the first sticker is downloaded instead of once the whole zip is completed.
+
+        Returns ``None`` if the sticker package is not available (not found).
+
+        :param pack_id: sticker package ID to be downloaded
+        :return: stream of the sticker package zip
+        """
+        return LineStickerPackDownloader.stream_pack(pack_id)
+
     @staticmethod
     def download_apng_as_gif(pack_id: Union[str, int], sticker_id: Union[str, int],
                              output_path: Optional[str] = None, *,
@@ -852,6 +1192,14 @@ class LineStickerUtils(ClearableMixin):
 
         Returned :class:`LineAnimatedStickerDownloadResult` will indicate if this situation occurred.
 
+        ----
+
+        Concurrent downloads to the same ``output_path`` will wait for the first one
+        and then reuse the converted files.
+
+        The gif and the frames are written to a temporary path first,
+        so they will not be read before they are completely written.
+
         :param pack_id: sticker package ID
         :param sticker_id: sticker ID
         :param output_path: gif output path
@@ -861,29 +1209,39 @@ class LineStickerUtils(ClearableMixin):
         result = LineAnimatedStickerDownloadResult(int(sticker_id))
 
         output_path = LineStickerUtils._prepare_output(output_path, sticker_id, LineStickerType.ANIMATED)
+        frame_zip_path = f"{os.path.splitext(output_path)[0]}-frames.zip"
 
-        # Check if the sticker exists
-        response = requests.get(LineStickerUtils.get_apng_url(pack_id, sticker_id))
-        if not response.ok:
-            return result
+        with LineStickerTempStorageManager.lock_file(output_path):
+            # Check if the file exists
+            if os.path.exists(output_path) and (not with_frames or os.path.exists(frame_zip_path)):
+                result.set_available()
+                result.set_already_exists()
+                LineStickerTempStorageManager.touch_file(output_path)
+                return result
 
-        result.set_available()
+            # Check if the sticker exists
+            response = _session.get(LineStickerUtils.get_apng_url(pack_id, sticker_id))
+            if not response.ok:
+                return result
 
-        # Check if the file exists
-        frame_zip_path = f"{os.path.splitext(output_path)[0]}-frames.zip"
+            result.set_available()
 
-        if os.path.exists(output_path) and (not with_frames or os.path.exists(frame_zip_path)):
-            result.set_already_exists()
-            return result
+            # Download the sticker
+            _start = time.time()
+            apng_bin = response.content
 
-        # Download the sticker
-        _start = time.time()
-        apng_bin = response.content
+            result.set_downloaded(time.time() - _start)
+
+            # Convert apng to gif
+            with _atomic_output(output_path) as temp_path:
+                result.set_conversion_result(apng2gif.convert(apng_bin, temp_path, zip_frames=with_frames))
 
-        result.set_downloaded(time.time() - _start)
+                if not result.conversion_result.succeed and os.path.exists(temp_path):
+                    os.remove(temp_path)
 
-        # Convert apng to gif
-        result.set_conversion_result(apng2gif.convert(apng_bin, output_path, zip_frames=with_frames))
+            if with_frames:
+                _record_file(frame_zip_path)
+            _record_file(output_path)
 
         return result
 
@@ -914,6 +1272,11 @@ class LineStickerUtils(ClearableMixin):
 
         Returned :class:`LineStickerDownloadResult` will indicate if this situation occurred.
 
+        ----
+
+        Concurrent downloads to the same ``output_path`` will wait for the first one
+        and then reuse the downloaded file.
+
         :param sticker_id: sticker ID
         :param output_path: gif output path
         :return: result of the download
@@ -922,27 +1285,33 @@ class LineStickerUtils(ClearableMixin):
 
         output_path = LineStickerUtils._prepare_output(output_path, sticker_id, LineStickerType.STATIC)
 
-        # Check if the sticker exists
-        response = requests.get(LineStickerUtils.get_sticker_url(sticker_id))
-        if not response.ok:
-            return result
+        with LineStickerTempStorageManager.lock_file(output_path):
+            # Check if the file exists
+            if os.path.exists(output_path):
+                result.set_available()
+                result.set_already_exists()
+                LineStickerTempStorageManager.touch_file(output_path)
+                return result
 
-        result.set_available()
+            # Check if the sticker exists
+            response = _session.get(LineStickerUtils.get_sticker_url(sticker_id))
+            if not response.ok:
+                return result
 
-        # Check if the file exists
-        if os.path.exists(output_path):
-            result.set_already_exists()
-            return result
+            result.set_available()
 
-        # Download the sticker
-        _start = time.time()
-        png_bin = response.content
+            # Download the sticker
+            _start = time.time()
+            png_bin = response.content
+
+            result.set_downloaded(time.time() - _start)
 
-        result.set_downloaded(time.time() - _start)
+            # Save the file
+            with _atomic_output(output_path) as temp_path:
+                with open(temp_path, "wb") as f:
+                    f.write(png_bin)
 
-        # Save the file
-        with open(output_path, "wb") as f:
-            f.write(png_bin)
+            _record_file(output_path)
 
         return result
 
@@ -2,11 +2,13 @@
 
 __all__ = ("LineStickerTempStorageManager",)
 
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
 import os
-from threading import Thread
+from threading import Thread, Lock
 import time
-from typing import Dict
+from typing import Dict, Tuple
 
 from extutils.checker import arg_type_ensure
 from extutils.dt import now_utc_aware
@@ -14,9 +16,23 @@ from JellyBot.systemconfig import ExtraService
 
 
 class LineStickerTempStorageManager:
-    """Class to manage the downloaded sticker files stored in the temporary storage."""
+    """
+    Class to manage the downloaded sticker files stored in the temporary storage.
 
-    _PATH_DICT: Dict[str, datetime] = {}
+    The files are removed once expired, or in least-recently-used order
+    once the total size of the files exceeds :class:`ExtraService.Sticker.MaxStickerTempStorageBytes`.
+
+    Also provides a lock for each file, so that the same file will not be generated concurrently.
+    """
+
+    _PATH_DICT: "OrderedDict[str, Tuple[datetime, int]]" = OrderedDict()
+    """File path to the last usage time and the file size, in least-recently-used order."""
+    _PATH_LOCK = Lock()
+    _total_size = 0
+
+    _FILE_LOCKS: Dict[str, Tuple[Lock, int]] = {}
+    """File path to the lock of the file and the count of the threads holding or waiting for it."""
+    _FILE_LOCKS_LOCK = Lock()
 
     _started = False
 
@@ -40,31 +56,69 @@ class LineStickerTempStorageManager:
 
         cls._started = False
 
+    @classmethod
+    def _remove_file(cls, path: str):
+        # Lock of `_PATH_DICT` should be acquired before calling this
+        _, size = cls._PATH_DICT.pop(path)
+        cls._total_size -= size
+
+        try:
+            os.remove(path)
+        except OSError:
+            # Already removed or still in use
+            pass
+
     @classmethod
     def _remove_expired_files(cls):
         now = now_utc_aware()
 
-        for path, last_used in cls._PATH_DICT.items():
-            if (now - last_used).total_seconds() > ExtraService.Sticker.MaxStickerTempFileLifeSeconds:
-                os.remove(path)
+        with cls._PATH_LOCK:
+            for path, (last_used, _) in list(cls._PATH_DICT.items()):
+                if (now - last_used).total_seconds() > ExtraService.Sticker.MaxStickerTempFileLifeSeconds:
+                    cls._remove_file(path)
+
+    @classmethod
+    def _remove_exceeded_files(cls, keep_path: str):
+        # Lock of `_PATH_DICT` should be acquired before calling this
+        for path in list(cls._PATH_DICT):
+            if cls._total_size <= ExtraService.Sticker.MaxStickerTempStorageBytes:
+                return
+
+            if path != keep_path:
+                cls._remove_file(path)
 
     @classmethod
     @arg_type_ensure
     def create_file(cls, file_path: str):
         """
-        Update the last file usage time at ``file_path``.
+        Record the file at ``file_path`` and update its last usage time.
+
+        This should be called after the file is completely written.
 
         The file at ``file_path`` will be removed by calling ``os.remove()`` once
         :class:`ExtraService.Sticker.MaxStickerTempFileLifeSeconds` seconds has passed
-        since the last call of this method.
+        since the last call of this method or :meth:`touch_file()`.
 
-        Timeout of the file will be reset upon re-calling this method if not yet expired.
+        The least recently used files will be removed if the total size of the recorded files exceeds
+        :class:`ExtraService.Sticker.MaxStickerTempStorageBytes`.
 
         This call also starts the storage monitor if not yet started.
 
         :param file_path: actual file path
         """
-        cls._PATH_DICT[file_path] = now_utc_aware()
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            return
+
+        with cls._PATH_LOCK:
+            if file_path in cls._PATH_DICT:
+                cls._total_size -= cls._PATH_DICT.pop(file_path)[1]
+
+            cls._PATH_DICT[file_path] = (now_utc_aware(), size)
+            cls._total_size += size
+
+            cls._remove_exceeded_files(file_path)
 
         # On-demand monitor to save performance
 
@@ -75,3 +129,51 @@ class LineStickerTempStorageManager:
 
         # Trigger the check once
         cls._remove_expired_files()
+
+    @classmethod
+    @arg_type_ensure
+    def touch_file(cls, file_path: str):
+        """
+        Update the last usage time of the file at ``file_path`` if it is recorded.
+
+        :param file_path: actual file path
+        """
+        with cls._PATH_LOCK:
+            if file_path in cls._PATH_DICT:
+                _, size = cls._PATH_DICT.pop(file_path)
+                cls._PATH_DICT[file_path] = (now_utc_aware(), size)
+
+    @classmethod
+    @contextmanager
+    def lock_file(cls, file_path: str):
+        """
+        Acquire the lock of the file at ``file_path`` until exiting the context.
+
+        Threads generating the same file should hold this lock,
+        so that only the first thread generates the file and the others wait and reuse it.
+
+        :param file_path: actual file path
+        """
+        with cls._FILE_LOCKS_LOCK:
+            lock, count = cls._FILE_LOCKS.get(file_path, (None, 0))
+            if not lock:
+                lock = Lock()
+            cls._FILE_LOCKS[file_path] = (lock, count + 1)
+
+        try:
+            with lock:
+                yield
+        finally:
+            with cls._FILE_LOCKS_LOCK:
+                _, count = cls._FILE_LOCKS[file_path]
+                if count > 1:
+                    cls._FILE_LOCKS[file_path] = (lock, count - 1)
+                else:
+                    del cls._FILE_LOCKS[file_path]
+
+    @classmethod
+    def clear(cls):
+        """Forget all recorded files. The files will **NOT** be removed."""
+        with cls._PATH_LOCK:
+            cls._PATH_DICT.clear()
+            cls._total_size = 0
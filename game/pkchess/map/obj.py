@@ -1,3 +1,4 @@
+from collections import deque
 from random import Random
 from dataclasses import dataclass, InitVar
 from typing import List, Dict, Optional, Set, Tuple, Iterable
@@ -349,56 +350,108 @@ class Map:
         if self.points[destination.X][destination.Y].status != MapPointStatus.EMPTY:
             return None
 
-        return self._get_shortest_path(origin, destination, max_length, [[origin]])
+        return self._get_shortest_path(origin, destination, max_length)
 
-    def _path_constructible(self, path: List[MapCoordinate], new_path_tail: MapCoordinate, destination: MapCoordinate):
-        if new_path_tail.X >= self.width or new_path_tail.Y >= self.height:
-            return False
+    def _is_empty(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height and self.points[x][y].status == MapPointStatus.EMPTY
 
-        tail = path[-1]
+    def _get_shortest_path(self, origin: MapCoordinate, destination: MapCoordinate, max_length: int) \
+            -> Optional[List[MapCoordinate]]:
+        """
+        Helper method of ``self.get_shortest_path()``.
 
-        original_distance = tail.distance(destination)
-        new_distance = new_path_tail.distance(destination)
+        Breadth-first search from ``origin``, extending the path to right, left, up and down in order.
 
-        not_on_path = new_path_tail not in path
-        distance_le = new_distance <= original_distance
-        point_empty = self.points[new_path_tail.X][new_path_tail.Y].status == MapPointStatus.EMPTY
+        A point can be added to the path only if it is empty and getting closer to ``destination``.
+        """
+        dest_x, dest_y = destination.X, destination.Y
 
-        return not_on_path and distance_le and point_empty
+        # Index of a point is `x * height + y`
+        visited = bytearray(self.width * self.height)
+        parents: Dict[int, int] = {}
 
-    def _get_shortest_path(self, origin: MapCoordinate, destination: MapCoordinate, max_length: int,
-                           paths: List[List[MapCoordinate]] = None) -> Optional[List[MapCoordinate]]:
-        """Helper method of ``self.get_shortest_path()``."""
-        new_paths = []
-        for path in paths:
-            # Extend every path to left, right, up, down
+        origin_idx = origin.X * self.height + origin.Y
+        visited[origin_idx] = 1
+
+        queue = deque([(origin.X, origin.Y, 0)])
+        while queue:
+            x, y, moves = queue.popleft()
 
             # Terminate if the current path without adding the new point is longer than allowed
-            if len(path) > max_length:
+            if moves >= max_length:
                 return None
 
-            tail = path[-1]
+            distance = abs(x - dest_x) + abs(y - dest_y)
 
-            new_pts = [
-                tail.apply_offset(1, 0),  # right
-                tail.apply_offset(-1, 0),  # left
-                tail.apply_offset(0, 1),  # up
-                tail.apply_offset(0, -1)  # down
-            ]
+            for new_x, new_y in ((x + 1, y), (x - 1, y), (x, y - 1), (x, y + 1)):
+                if not self._is_empty(new_x, new_y) or abs(new_x - dest_x) + abs(new_y - dest_y) > distance:
+                    continue
 
-            for new_pt in new_pts:
-                if self._path_constructible(path, new_pt, destination):
-                    if new_pt == destination:
-                        return path + [new_pt]
+                new_idx = new_x * self.height + new_y
+                if visited[new_idx]:
+                    continue
 
-                    new_paths.append(path + [new_pt])
+                visited[new_idx] = 1
+                parents[new_idx] = x * self.height + y
 
-        if not new_paths:
-            # Dead-end, returns `None`
-            return None
-        else:
-            # Search deeper
-            return self._get_shortest_path(origin, destination, max_length, new_paths)
+                if new_x == dest_x and new_y == dest_y:
+                    path = [destination]
+                    while new_idx != origin_idx:
+                        new_idx = parents[new_idx]
+                        path.append(MapCoordinate(*divmod(new_idx, self.height)))
+
+                    return list(reversed(path))
+
+                queue.append((new_x, new_y, moves + 1))
+
+        # Dead-end
+        return None
+
+    def get_reachable_coords(self, origin: MapCoordinate, max_moves: int) -> Set[MapCoordinate]:
+        """
+        Get the coordinates of all points reachable from ``origin`` within ``max_moves`` moves.
+
+        A point is reachable if ``self.get_shortest_path()`` could find a path from ``origin`` to it.
+
+        ``origin`` itself will not be included.
+
+        :param origin: origin of the paths
+        :param max_moves: maximum count of the moves allowed
+        :return: set of the coordinates reachable from `origin`
+        :raises PathEndOutOfMapError: if `origin` is out of map
+        """
+        if origin.X >= self.width or origin.Y >= self.height:
+            raise PathEndOutOfMapError(origin, origin, self.width, self.height)
+
+        ret = set()
+
+        # The paths always get closer to its destination, so the points are searched quadrant by quadrant.
+        # A point is reachable if it is empty and the point next to it toward `origin` is reachable.
+        for x_sign, y_sign in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
+            # `reachable[dx][dy]`: if the point at (origin.X + dx * x_sign, origin.Y + dy * y_sign) is reachable
+            reachable: List[List[bool]] = []
+
+            for dx in range(max_moves + 1):
+                row = []
+
+                for dy in range(max_moves + 1 - dx):
+                    if dx == 0 and dy == 0:
+                        row.append(True)
+                        continue
+
+                    x = origin.X + dx * x_sign
+                    y = origin.Y + dy * y_sign
+
+                    ok = self._is_empty(x, y) and (
+                        (dx > 0 and reachable[dx - 1][dy]) or (dy > 0 and row[dy - 1]))
+                    row.append(ok)
+
+                    if ok:
+                        ret.add(MapCoordinate(x, y))
+
+                reachable.append(row)
+
+        return ret
 
     def get_points(self, center: MapCoordinate, offsets: Iterable[Tuple[int, int]]) -> List[MapPoint]:
         if center.X >= self.width or center.X < 0 or center.Y >= self.height or center.Y < 0:
@@ -30,7 +30,7 @@ from .stats import (
     # bot feature usage
     BotFeatureUsageResult, BotFeatureHourlyAvgResult, BotFeaturePerUserUsageResult,
     # models
-    APIStatisticModel, MessageRecordModel, BotFeatureUsageModel,
+    APIStatisticModel, MessageRecordModel, MessageRecordHourlyModel, BotFeatureUsageModel,
     # messages
     MemberMessageCountEntry, MemberMessageCountResult, HourlyIntervalAverageMessageResult, DailyMessageResult,
     MemberMessageByCategoryEntry, MemberMessageByCategoryResult, MemberDailyMessageResult, MeanMessageResultGenerator,
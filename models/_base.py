@@ -1,6 +1,6 @@
 import abc
 from collections import MutableMapping
-from typing import Optional, Set, List
+from typing import Optional, Set, List, Dict, Tuple
 
 from bson import ObjectId
 from pymongo.client_session import ClientSession
@@ -19,6 +19,34 @@ from .field.exceptions import FieldError
 from .warn import warn_keys_not_used, warn_field_key_not_found_for_json_key, warn_action_failed_json_key
 
 
+class _ModelSchema:
+    """
+    Schema of a :class:`Model` compiled from its fields.
+
+    Each field is stored as a :class:`tuple` of (field key, key in ``_dict_``, field, ``val_is_specified``).
+    """
+
+    def __init__(self, model_cls: type):
+        # Check if there's any duplicated json key
+        model_cls._init_cache_json_keys()
+
+        self.fields: Dict[str, Tuple[str, str, BaseField, bool]] = {}
+        self.json_fields: Dict[str, Tuple[str, str, BaseField, bool]] = {}
+        self.default_fields: List[Tuple[str, str, BaseField, bool]] = []
+
+        for fk in sorted(model_cls.model_field_keys()):
+            if fk.lower() == "id" and model_cls.WITH_OID:
+                entry = (fk, "id", model_cls.Id, False)
+            else:
+                entry = (fk, to_snake_case(fk), getattr(model_cls, fk), True)
+
+            self.fields[fk] = entry
+            self.json_fields[entry[2].key] = entry
+
+            if fk not in model_cls.SKIP_DEFAULT_FILLING:
+                self.default_fields.append(entry)
+
+
 class Model(MutableMapping, abc.ABC):
     """
     Should not be inherited from another inherited :class:`Model`.
@@ -48,28 +76,30 @@ class Model(MutableMapping, abc.ABC):
         # Doing so to bypass `__setattr__()` which is left for setting the data
         self.__dict__["_dict_"] = {}  # Dict that actually holding the data
 
+        schema = self.model_schema()
+
         if from_db:
-            kwargs = self._json_to_field_kwargs(**kwargs)
+            # Json keys are directly mapped to the fields in one pass
+            self._input_json(schema, kwargs)
         else:
             kwargs = self._camelcase_kwargs(**kwargs)
 
-        try:
-            self._input_kwargs(**kwargs)
-        except FieldError as e:
-            raise InvalidModelFieldError(self.__class__.__qualname__, e)
+            try:
+                self._input_kwargs(**kwargs)
+            except FieldError as e:
+                raise InvalidModelFieldError(self.__class__.__qualname__, e)
 
-        not_handled = self._fill_default_vals(
-            self.model_field_keys() - {to_camel_case(k) for k in self._dict_})
+        not_handled = self._fill_default_vals(schema)
 
         if len(not_handled) > 0:
             raise RequiredKeyNotFilledError(self.__class__, not_handled)
 
-        self._init_cache_json_keys()  # Call this to check if there's any duplicated json key
         self._check_validity()
 
-        unused_keys = kwargs.keys() - self.model_field_keys() - self.SKIP_DEFAULT_FILLING
-        if len(unused_keys) > 0:
-            warn_keys_not_used(self.__class__.__qualname__, unused_keys)
+        if not from_db:
+            unused_keys = kwargs.keys() - self.model_field_keys() - self.SKIP_DEFAULT_FILLING
+            if len(unused_keys) > 0:
+                warn_keys_not_used(self.__class__.__qualname__, unused_keys)
 
     def __setitem__(self, jk, v) -> None:
         if jk == OID_KEY:
@@ -207,22 +237,40 @@ class Model(MutableMapping, abc.ABC):
             else:
                 raise FieldKeyNotExistError(fk, self.__class__.__qualname__)
 
-    def _fill_default_vals(self, not_filled):
-        filled = set()
+    def _input_json(self, schema: _ModelSchema, json_dict: dict):
+        json_fields = schema.json_fields
+
+        for jk, v in json_dict.items():
+            entry = json_fields.get(jk)  # Filter unrelated json keys
+
+            if not entry:
+                if jk.lower() == "_id":
+                    raise IdUnsupportedError(self.__class__.__qualname__)
+                else:
+                    raise JsonKeyNotExistedError(jk, self.__class__.__qualname__)
 
-        for k in not_filled:
-            if k in self.model_field_keys():
-                if k not in self.SKIP_DEFAULT_FILLING:
-                    default_val = getattr(self, k).default_value
-                    if default_val != ModelDefaultValueExt.Required:
-                        if default_val != ModelDefaultValueExt.Optional:
-                            self._inner_dict_create(k, default_val)
+            _, dict_key, fd, val_is_specified = entry
 
-                        filled.add(k)
+            try:
+                self._dict_[dict_key] = fd.new(v, val_is_specified=val_is_specified)
+            except FieldError as e:
+                raise InvalidModelFieldError(self.__class__.__qualname__, e)
+
+    def _fill_default_vals(self, schema: _ModelSchema) -> Set[str]:
+        not_handled = set()
+
+        for fk, dict_key, fd, _ in schema.default_fields:
+            if dict_key in self._dict_:
+                continue
+
+            default_val = fd.default_value
+            if default_val != ModelDefaultValueExt.Required:
+                if default_val != ModelDefaultValueExt.Optional:
+                    self._dict_[dict_key] = fd.new(default_val)
             else:
-                raise FieldKeyNotExistError(k, self.__class__.__qualname__)
+                not_handled.add(fk)
 
-        return not_filled - filled - self.SKIP_DEFAULT_FILLING
+        return not_handled
 
     def _check_validity(self):
         """
@@ -328,22 +376,6 @@ class Model(MutableMapping, abc.ABC):
 
             return fk in cls.__dict__ and isinstance(cls.__dict__[fk], BaseField)
 
-    @classmethod
-    def _json_to_field_kwargs(cls, **kwargs):
-        tmp = {}
-
-        for jk, v in kwargs.items():
-            fk = cls.json_key_to_field(jk)  # Filter unrelated json keys
-            if fk:
-                tmp[fk] = v
-            else:
-                if jk.lower() == "_id":
-                    raise IdUnsupportedError(cls.__qualname__)
-                else:
-                    raise JsonKeyNotExistedError(jk, cls.__qualname__)
-
-        return tmp
-
     @staticmethod
     def _camelcase_kwargs(**kwargs):
         tmp = {}
@@ -418,6 +450,14 @@ class Model(MutableMapping, abc.ABC):
 
     # caching tools may be used for these
 
+    @classmethod
+    def model_schema(cls) -> _ModelSchema:
+        """Get the schema compiled from the fields of this model."""
+        if not hasattr(cls, "_CacheSchema") or cls.__qualname__ not in cls._CacheSchema:
+            cls._CacheSchema = {cls.__qualname__: _ModelSchema(cls)}
+
+        return cls._CacheSchema[cls.__qualname__]
+
     @classmethod
     def model_fields(cls) -> Set[BaseField]:
         """Get the set of all available fields."""
@@ -508,12 +548,9 @@ class Model(MutableMapping, abc.ABC):
         if isinstance(obj, cls):
             return obj
 
-        init_dict = dict(obj)
-        for k in obj:
-            if k not in cls.model_json_keys():
-                del init_dict[k]
+        json_fields = cls.model_schema().json_fields
 
-        return cls(**init_dict, from_db=True)
+        return cls(**{k: v for k, v in obj.items() if k in json_fields}, from_db=True)
 
     @classmethod
     def replace_uid(cls, col, old: ObjectId, new: ObjectId, session: ClientSession) -> List[str]:
@@ -43,7 +43,7 @@ class FieldInstance:
         default_value_is_ext = ModelDefaultValueExt.is_default_val_ext(base.default_value)
 
         # Skipping type check on init (may fill `None`)
-        if value in (None, FieldInstance.NULL_VAL_SENTINEL) and not base.allow_none:
+        if (value is None or value is FieldInstance.NULL_VAL_SENTINEL) and not base.allow_none:
             if default_value_is_ext:
                 self.force_set(base.none_obj())
             else:
@@ -52,7 +52,7 @@ class FieldInstance:
             self.force_set(None)
         elif not base.is_default_lazy \
                 and default_value_is_ext \
-                and (value == FieldInstance.NULL_VAL_SENTINEL or ModelDefaultValueExt.is_default_val_ext(value)):
+                and (value is FieldInstance.NULL_VAL_SENTINEL or ModelDefaultValueExt.is_default_val_ext(value)):
             if base.default_value == ModelDefaultValueExt.Required:
                 raise FieldValueRequiredError(self.base.key)
             elif base.default_value == ModelDefaultValueExt.Optional:
@@ -145,6 +145,10 @@ class BaseField(abc.ABC):
         self._auto_cast = auto_cast
         # endregion
 
+        # region Compiling accepted value types
+        self._desired_type, self._accepted_types = self._compile_types()
+        # endregion
+
         # region Setting stores UID
         self._stores_uid = stores_uid
         if stores_uid and not self.replace_uid_implemented:
@@ -178,6 +182,26 @@ class BaseField(abc.ABC):
         self._inst_cls: Type[FieldInstance] = inst_cls or FieldInstance
         # endregion
 
+    def _compile_types(self) -> Tuple[type, Tuple[type, ...]]:
+        """
+        Get the desired type and the types accepted by this field, including ``NoneType`` if ``None`` is allowed.
+
+        :return: desired type and the accepted types
+        """
+        # Expected types may not be an iterable
+        expected_types = self.expected_types
+        desired_type = expected_types[0] if isinstance(expected_types, Iterable) else expected_types
+
+        if isinstance(expected_types, tuple):
+            expected_types = list(expected_types)
+        elif isinstance(expected_types, type):
+            expected_types = [expected_types]
+
+        if self.allow_none:
+            expected_types.append(type(None))
+
+        return desired_type, tuple(expected_types)
+
     @property
     def replace_uid_implemented(self) -> bool:
         """The value should be overrided if `replace_uid()` is implemented."""
@@ -202,7 +226,7 @@ class BaseField(abc.ABC):
     @property
     @final
     def desired_type(self) -> type:
-        return self.expected_types[0] if isinstance(self.expected_types, Iterable) else self.expected_types
+        return self._desired_type
 
     @property
     @final
@@ -261,19 +285,9 @@ class BaseField(abc.ABC):
         if not self.allow_none and value is None:
             raise FieldNoneNotAllowedError(self.key)
 
-        # Expected types may not be an iterable
-        expected_types = self.expected_types
-        if isinstance(expected_types, tuple):
-            expected_types = list(expected_types)
-        elif isinstance(expected_types, type):
-            expected_types = [expected_types]
-
-        if self.allow_none:
-            expected_types.append(type(None))
-
         # Check value type
-        if not type(value) in expected_types:
-            raise FieldTypeMismatchError(self.key, type(value), value, expected_types)
+        if not type(value) in self._accepted_types:
+            raise FieldTypeMismatchError(self.key, type(value), value, list(self._accepted_types))
 
         if value is not None and not ModelDefaultValueExt.is_default_val_ext(value):
             self._check_type_matched_not_none(value, attempt_cast=attempt_cast or self.auto_cast)
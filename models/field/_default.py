@@ -15,4 +15,5 @@ class ModelDefaultValueExt:
 
     @staticmethod
     def is_default_val_ext(val: Any):
-        return val in (ModelDefaultValueExt.Required, ModelDefaultValueExt.Optional)
+        # Compare the identity to prevent calling `__eq__()` of `val`
+        return val is ModelDefaultValueExt.Required or val is ModelDefaultValueExt.Optional
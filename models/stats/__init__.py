@@ -1,7 +1,7 @@
 """Implementations of the data/result models related to stats."""
 from .base import DailyResult, HourlyResult
 from .bot import BotFeatureUsageResult, BotFeatureHourlyAvgResult, BotFeaturePerUserUsageResult
-from .model import APIStatisticModel, MessageRecordModel, BotFeatureUsageModel
+from .model import APIStatisticModel, MessageRecordModel, MessageRecordHourlyModel, BotFeatureUsageModel
 from .msg import (
     MemberMessageCountEntry, MemberMessageCountResult, HourlyIntervalAverageMessageResult, DailyMessageResult,
     MemberMessageByCategoryEntry, MemberMessageByCategoryResult, MemberDailyMessageResult, MeanMessageResultGenerator,
@@ -3,7 +3,7 @@ from extutils.dt import localtime
 from models import Model, ModelDefaultValueExt
 from models.field import (
     BooleanField, DictionaryField, APICommandField, DateTimeField, TextField, ObjectIDField,
-    MessageTypeField, BotFeatureField, FloatField
+    MessageTypeField, BotFeatureField, FloatField, IntegerField
 )
 
 
@@ -43,6 +43,16 @@ class MessageRecordModel(Model):
         return localtime(self.id.generation_time)
 
 
+class MessageRecordHourlyModel(Model):
+    """Model of the message count of a user sent in a channel of a message type in an hour (UTC)."""
+
+    ChannelOid = ObjectIDField("ch", default=ModelDefaultValueExt.Required)
+    UserRootOid = ObjectIDField("u", default=ModelDefaultValueExt.Required, stores_uid=True, allow_none=True)
+    MessageType = MessageTypeField("t", default=ModelDefaultValueExt.Required)
+    Hour = DateTimeField("h", default=ModelDefaultValueExt.Required)
+    Count = IntegerField("c", default=0)
+
+
 class BotFeatureUsageModel(Model):
     """Model of a single bot feature usage."""
 
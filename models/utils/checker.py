@@ -1,9 +1,11 @@
 """Implementations of the data checker."""
+import hashlib
 from abc import ABC, abstractmethod
+from datetime import datetime
 from threading import Thread
-from typing import Optional, List, Tuple, Dict
+from typing import Optional, List, Tuple, Dict, Any
 
-from pymongo.cursor import Cursor
+import pymongo
 
 from mongodb.utils import BulkWriteDataHolder
 from models.field import ModelField
@@ -11,6 +13,7 @@ from models import ModelDefaultValueExt, OID_KEY
 from extutils.flags import FlagCodeEnum
 from extutils.emailutils import MailSender
 from extutils.logger import LoggerSkeleton
+from JellyBot.systemconfig import Database
 
 from ..rpdata import PendingRepairDataModel
 
@@ -18,6 +21,12 @@ __all__ = ("ModelFieldChecker",)
 
 logger = LoggerSkeleton("mongo.modelcheck", logger_name_env="MODEL_CHECK")
 
+STAMP_COL_NAME = "_schema_"
+KEY_VERSION = "v"
+KEY_PENDING_VERSION = "pv"
+KEY_WATERMARK = "wm"
+KEY_TS = "ts"
+
 
 class DataRepairResult(FlagCodeEnum):
     """Result of the data repairment."""
@@ -62,6 +71,9 @@ class ModelFieldChecker:
 
     If if fails to repair, the data will be moved to the designated temporary location for manual recovery.
     An email report will be sent to notify the developer at the same time.
+
+    The schema version of the model will be stamped to the collection after the check,
+    so the check will be skipped until the fields of the model change.
     """
 
     @staticmethod
@@ -82,6 +94,15 @@ class ModelFieldChecker:
         """
         ModelFieldChecker.CheckDefaultValue(col_inst).perform_check()
 
+    @staticmethod
+    def reset_stamp(col_inst):
+        """
+        Remove the schema version stamp of the collection, so the collection will be checked on the next check.
+
+        :param col_inst: collection instance to reset the stamp
+        """
+        col_inst.database.get_collection(STAMP_COL_NAME).delete_one({OID_KEY: col_inst.name})
+
     class CheckDefaultValue(FieldCheckerBase):
         """
         Check the default values of the fields of a data model.
@@ -101,6 +122,8 @@ class ModelFieldChecker:
                 if isinstance(f, ModelField):
                     self._model_field_mdl_class.append((f.key, f.model_cls))
 
+            self._stamp_col = col_inst.database.get_collection(STAMP_COL_NAME)
+
         def execute(self):
             """
             This checks the default values of the fields of a data model.
@@ -108,108 +131,162 @@ class ModelFieldChecker:
             If the field does not match its given default value, then try to update it.
 
             If the update is failed, move that data entry to a specific database for repairment.
-            """
-            from mongodb.factory import PendingRepairDataManager  # pylint: disable=import-outside-toplevel
 
-            find_query = self._build_find_query()
+            The data are scanned in the order of ``_id`` in batches of ``Database.ModelCheckBatchSize``.
+            The checkpoint is stored after each batch, so the scan could be resumed if interrupted.
+            """
+            checked_keys = self._get_checked_keys()
 
-            if not find_query:
-                self.post_execute()
+            if not checked_keys:
                 return
 
-            potential_repair_needed = self._col_inst.find(find_query)
+            version = self._get_schema_version(checked_keys)
+            stamp = self._stamp_col.find_one({OID_KEY: self._col_inst.name}) or {}
 
-            if not self._col_inst.find_one(find_query):
-                self.post_execute()
+            if stamp.get(KEY_VERSION) == version:
+                logger.logger.info("Schema of <%s> unchanged. Check skipped.", self._col_inst.full_name)
                 return
 
-            required_write_holder = PendingRepairDataManager.new_bulk_holder(self._col_inst)
-            repaired_write_holder = BulkWriteDataHolder(self._col_inst)
+            last_oid = None
+            if stamp.get(KEY_PENDING_VERSION) == version:
+                last_oid = stamp.get(KEY_WATERMARK)
+            else:
+                self._stamp_col.update_one(
+                    {OID_KEY: self._col_inst.name},
+                    {"$set": {KEY_PENDING_VERSION: version}, "$unset": {KEY_WATERMARK: ""}},
+                    upsert=True)
 
             logger.logger.warning("Scanning potential repairments required data "
                                   "in database <%s>...", self._col_inst.full_name)
 
-            self._scan_data(potential_repair_needed, required_write_holder, repaired_write_holder)
+            find_query = {"$or": [{key: {"$exists": False}} for key, _ in checked_keys]}
+            counter: Dict[FlagCodeEnum, int] = {k: 0 for k in DataRepairResult}
+            required_results = []
 
-            if repaired_write_holder.holding_data:
-                logger.logger.warning("Updating repaired data to database <%s>...", self._col_inst.full_name)
-                repaired_write_holder.complete()
+            while True:
+                filter_ = find_query
+                if last_oid:
+                    filter_ = {"$and": [find_query, {OID_KEY: {"$gt": last_oid}}]}
 
-            if required_write_holder.holding_data:
-                logger.logger.warning("Manual repair required in database <%s>.", self._col_inst.full_name)
+                batch = list(self._col_inst.find(
+                    filter_, sort=[(OID_KEY, pymongo.ASCENDING)], limit=Database.ModelCheckBatchSize))
+
+                if not batch:
+                    break
+
+                self._scan_data(batch, counter, required_results)
+
+                last_oid = batch[-1][OID_KEY]
+                self._stamp_col.update_one({OID_KEY: self._col_inst.name}, {"$set": {KEY_WATERMARK: last_oid}})
 
-                result = required_write_holder.complete()
+                if len(batch) < Database.ModelCheckBatchSize:
+                    break
+
+            self._print_scanning_result(counter)
+
+            if counter[DataRepairResult.REQUIRED_MISSING] > 0:
+                logger.logger.warning("Manual repair required in database <%s>.", self._col_inst.full_name)
                 logger.logger.warning("Sending notification email...")
-                self._send_mail_async(result, required_write_holder)
+                self._send_mail_async(required_results, counter[DataRepairResult.REQUIRED_MISSING])
 
-            self.post_execute()
+            self._stamp_col.update_one(
+                {OID_KEY: self._col_inst.name},
+                {"$set": {KEY_VERSION: version, KEY_TS: datetime.utcnow()},
+                 "$unset": {KEY_PENDING_VERSION: "", KEY_WATERMARK: ""}},
+                upsert=True)
 
         @staticmethod
-        def _build_key_filter(*, prefix: str = None, model_cls=None):
+        def _build_checked_keys(*, prefix: str = None, model_cls=None) -> List[Tuple[str, bool]]:
             if prefix is not None:
                 prefix = prefix + "."
             else:
                 prefix = ""
 
-            or_list = []
+            keys = []
 
             if model_cls:
                 for jk, default in map(lambda f: (f.key, f.default_value), model_cls.model_fields()):
                     if default != ModelDefaultValueExt.Optional:
-                        or_list.append({f"{prefix}{jk}": {"$exists": False}})
+                        keys.append((f"{prefix}{jk}", default == ModelDefaultValueExt.Required))
 
-            return or_list
+            return keys
 
-        def _build_find_query(self):
-            or_list = self._build_key_filter(model_cls=self._model_cls)
+        def _get_checked_keys(self) -> List[Tuple[str, bool]]:
+            """
+            Get the keys to be checked.
+
+            :return: list of (json key path, is required)
+            """
+            keys = self._build_checked_keys(model_cls=self._model_cls)
 
             for key, model_cls in self._model_field_mdl_class:
-                or_list.extend(self._build_key_filter(prefix=key, model_cls=model_cls))
+                keys.extend(self._build_checked_keys(prefix=key, model_cls=model_cls))
 
-            if not or_list:
-                return None
+            return keys
 
-            return {"$or": or_list}
+        @staticmethod
+        def _get_schema_version(checked_keys: List[Tuple[str, bool]]) -> str:
+            # Only the keys affect the result of the check, the default values are not included
+            # because the data which already have the field are not updated even if the default value changes
+            fingerprint = "\n".join(sorted(f"{key}:{int(required)}" for key, required in checked_keys))
 
-        def _scan_data(self, potential_repair_needed: Cursor, required_write_holder: BulkWriteDataHolder,
-                       repaired_write_holder: BulkWriteDataHolder):
-            counter: Dict[FlagCodeEnum, int] = {k: 0 for k in DataRepairResult}
+            return hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()
+
+        def _scan_data(self, batch: List[dict], counter: Dict[FlagCodeEnum, int], required_results: list):
+            from mongodb.factory import PendingRepairDataManager  # pylint: disable=import-outside-toplevel
+
+            required_write_holder = PendingRepairDataManager.new_bulk_holder(self._col_inst)
+            repaired_write_holder = BulkWriteDataHolder(self._col_inst)
+            missing_oids = []
 
-            for data in potential_repair_needed:
-                result, rpdata = self._repair_single_data(required_write_holder, data)
+            for data in batch:
+                result, fields_to_set = self._repair_single_data(required_write_holder, data)
 
                 counter[result] += 1
 
-                if rpdata:
-                    repaired_write_holder.replace_single(rpdata)
+                if result == DataRepairResult.REQUIRED_MISSING:
+                    missing_oids.append(data[OID_KEY])
+                elif fields_to_set:
+                    repaired_write_holder.set_single(data[OID_KEY], fields_to_set)
 
-            self._print_scanning_result(counter)
+            if repaired_write_holder.holding_data:
+                logger.logger.warning("Updating %d repaired data to database <%s>...",
+                                      repaired_write_holder.holded_count, self._col_inst.full_name)
+                repaired_write_holder.complete()
+
+            if required_write_holder.holding_data:
+                required_results.extend(required_write_holder.complete())
+
+                # Delete after the data being stored for the manual repair
+                self._col_inst.delete_many({OID_KEY: {"$in": missing_oids}})
 
         def _repair_single_data(self, required_write_holder: BulkWriteDataHolder, data: dict) -> \
-                Tuple[DataRepairResult, Optional[dict]]:
+                Tuple[DataRepairResult, Optional[Dict[str, Any]]]:
             missing = []
-            changed = self._repair_fields(data, self._model_cls, missing)
+            fields_to_set = self._repair_fields(data, self._model_cls, missing)
 
             # Check all fields of the model field
             for key, model_cls in self._model_field_mdl_class:
-                # `self.repair_fields()` first so it will always being executed (short circuit)
-                changed = self._repair_fields(data[key], model_cls, missing) or changed
+                sub_fields_to_set = self._repair_fields(data[key], model_cls, missing, prefix=key)
+
+                # Repaired sub fields are already included if the whole model field is being set
+                if key not in fields_to_set:
+                    fields_to_set.update(sub_fields_to_set)
 
             if missing:
                 required_write_holder.repsert_single(
                     {f"{PendingRepairDataModel.Data.key}.{OID_KEY}": data[OID_KEY]},
                     PendingRepairDataModel(Data=data, MissingKeys=missing))
 
-                self._col_inst.delete_one({OID_KEY: data[OID_KEY]})
                 return DataRepairResult.REQUIRED_MISSING, None
 
-            repair_result = DataRepairResult.REPAIRED if changed else DataRepairResult.NO_PATCH_NEEDED
-            repaired_data = data if changed else None
+            repair_result = DataRepairResult.REPAIRED if fields_to_set else DataRepairResult.NO_PATCH_NEEDED
 
-            return repair_result, repaired_data
+            return repair_result, fields_to_set or None
 
-        def _repair_fields(self, data: dict, model_cls, missing: List[str]) -> bool:
-            changed = False
+        def _repair_fields(self, data: dict, model_cls, missing: List[str], *, prefix: str = None) \
+                -> Dict[str, Any]:
+            fields_to_set = {}
 
             for json_key, default_val in map(lambda f: (f.key, f.default_value), model_cls.model_fields()):
                 if json_key not in data:
@@ -220,12 +297,12 @@ class ModelFieldChecker:
                             pass  # Optional so no change
                         else:
                             data[json_key] = default_val
-                            changed = True
+                            fields_to_set[f"{prefix}.{json_key}" if prefix else json_key] = default_val
                     except KeyError as ex:
                         raise ValueError(f"Default value rule not set "
                                          f"for json key `{json_key}` in `{self._model_cls.__qualname__}`.") from ex
 
-            return changed
+            return fields_to_set
 
         @staticmethod
         def _print_scanning_result(counter: Dict[FlagCodeEnum, int]):
@@ -239,8 +316,8 @@ class ModelFieldChecker:
                 logger.logger.info(
                     "\t%d data missing some required fields.", counter[DataRepairResult.REQUIRED_MISSING])
 
-        def _send_mail_async(self, result_list: list, required_write_holder: BulkWriteDataHolder):
-            content = f"<b>{required_write_holder.holded_count} data</b> need manual repairments.<br>" \
+        def _send_mail_async(self, result_list: list, required_count: int):
+            content = f"<b>{required_count} data</b> need manual repairments.<br>" \
                       f"Data are originally stored in <code>{self._col_inst.full_name}</code>.<br>" \
                       f"<br>" \
                       f"Results list:<br><ul>" \
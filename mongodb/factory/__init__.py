@@ -15,6 +15,7 @@ from .timer import TimerManager
 from .rmc import RemoteControlManager
 
 from ._base import BaseCollection
+from ._lazy import LazyManager
 from ._dbctrl import SINGLE_DB_NAME, is_test_db, get_single_db_name
 
 from .mixin import GenerateTokenMixin, ControlExtensionMixin
@@ -27,3 +28,14 @@ def get_collection_subclasses() -> List[Type[BaseCollection]]:
     :return: list of classes that inherit `BaseCollection`
     """
     return [cls for cls in BaseCollection.__subclasses__() if cls.__module__.split(".")[:2] == ["mongodb", "factory"]]
+
+
+def ensure_indexes():
+    """
+    Create the indexes of all collections.
+
+    The indexes are not created on the initialization of the managers in production,
+    so this should be called once on each deployment.
+    """
+    for cls in get_collection_subclasses():
+        cls.ensure_indexes()
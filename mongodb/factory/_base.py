@@ -2,9 +2,10 @@
 import os
 from abc import ABC
 from threading import Thread
-from typing import final
+from typing import final, List
 
 from django.conf import settings
+from pymongo import IndexModel
 from pymongo.collection import Collection
 
 from JellyBot.systemconfig import Database
@@ -21,7 +22,19 @@ __all__ = ("BaseCollection",)
 
 
 class BaseCollection(ControlExtensionMixin, ClearableMixin, Collection, ABC):
-    """Base class for a collection instance."""
+    """
+    Base class for a collection instance.
+
+    Indexes of the collection are not created on the initialization in production.
+    :meth:`ensure_indexes()` should be called once on deployment instead.
+    """
+
+    append_only: bool = False
+    """
+    If the documents of this collection are only inserted and never modified.
+
+    Append-only collections skip the periodic full sync of the incremental backup.
+    """
 
     def __init__(self):
         self._db = MONGO_CLIENT.get_database(self.get_db_name())
@@ -30,7 +43,8 @@ class BaseCollection(ControlExtensionMixin, ClearableMixin, Collection, ABC):
 
         self.get_model_cls()  # Dummy call to check if `model_class` has been defined
 
-        self.build_indexes()
+        if not settings.PRODUCTION:
+            self.ensure_indexes()
 
         self.on_init()
         Thread(target=self.on_init_async).start()
@@ -44,13 +58,29 @@ class BaseCollection(ControlExtensionMixin, ClearableMixin, Collection, ABC):
         if settings.PRODUCTION:
             backup_collection(
                 MONGO_CLIENT, self.get_db_name(), self.get_col_name(),
-                SINGLE_DB_NAME is not None, Database.BackupIntervalSeconds)
+                SINGLE_DB_NAME is not None, Database.BackupIntervalSeconds, append_only=self.append_only)
 
     def on_init_async(self):
         """Hook method to be called asychronously on the initialization of this class."""
 
-    def build_indexes(self):
-        """Method to be called when building the indexes of this collection."""
+    @classmethod
+    def get_index_models(cls) -> List[IndexModel]:
+        """
+        Get the indexes of this collection.
+
+        :return: list of the indexes to be created
+        """
+        return []
+
+    @classmethod
+    def ensure_indexes(cls):
+        """Create the indexes of this collection in a single command if any of them does not exist."""
+        index_models = cls.get_index_models()
+
+        if index_models:
+            col = MONGO_CLIENT.get_database(cls.get_db_name()).get_collection(cls.get_col_name())
+            col.create_indexes(index_models)
 
     def clear(self):
         self.delete_many({})
+        ModelFieldChecker.reset_stamp(self)
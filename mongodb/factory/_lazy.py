@@ -0,0 +1,28 @@
+"""Lazy proxy of the manager singletons."""
+from threading import Lock
+from typing import Callable
+
+from django.utils.functional import SimpleLazyObject, empty
+
+__all__ = ("LazyManager",)
+
+
+class LazyManager(SimpleLazyObject):
+    """
+    Proxy of a manager singleton, which instantiates the manager on its first use.
+
+    Instantiating a manager connects to the database and starts its background jobs,
+    so the managers never used by the process will not cost anything.
+
+    The proxy behaves like the manager itself, including :func:`isinstance()`.
+    The manager is guaranteed to be instantiated only once even if it is first used by multiple threads.
+    """
+
+    def __init__(self, manager_factory: Callable):
+        self.__dict__["_lock"] = Lock()
+        super().__init__(manager_factory)
+
+    def _setup(self):
+        with self._lock:
+            if self._wrapped is empty:
+                super()._setup()
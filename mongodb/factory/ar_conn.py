@@ -1,10 +1,14 @@
 """Data managers for the collection of auto-reply modules."""
+import unicodedata
 from datetime import datetime, timedelta
-from typing import Tuple, Optional, List, Generator
+from threading import Lock
+from typing import Tuple, Optional, List, Generator, Set, Callable
 
 import math
 import pymongo
 from bson import ObjectId
+from pymongo import IndexModel
+from cachetools import TTLCache
 
 from JellyBot.systemconfig import AutoReply, Database, DataQuery, Bot
 from extutils.utils import enumerate_ranking
@@ -24,16 +28,153 @@ from mongodb.factory.results import (
     AutoReplyModuleAddResult, AutoReplyModuleTagGetResult
 )
 from mongodb.utils import (
-    ExtendedCursor, case_insensitive_collation
+    ExtendedCursor, IncrementAccumulator, case_insensitive_collation
 )
 from mongodb.factory import ProfileManager
 
 from ._base import BaseCollection
+from ._lazy import LazyManager
 
 __all__ = ("AutoReplyManager", "AutoReplyModuleManager", "AutoReplyModuleTagManager",)
 
 DB_NAME = "ar"
 
+# Characters which are equal under `case_insensitive_collation` only if their normalized forms are equal.
+# Characters beyond this (for example, `ø` and `o`, `あ` and `ア`) could be equal without having the same
+# normalized form, and ASCII control characters are ignored by the collation.
+_EXACT_NORMALIZED_CHARS = frozenset("\t\n\x0b\x0c\r" + "".join(chr(code) for code in range(0x20, 0x7F)))
+
+
+class _AutoReplyKeywordIndex:
+    """
+    In-memory index of the keywords of the active auto-reply modules, grouped by channel.
+
+    Each entry of a channel is a set of normalized ``(keyword, keyword type code)`` of its active modules,
+    along with the keyword type codes having any keyword not comparable by its normalized form.
+
+    A keyword which is not in the loaded entry cannot match any active module in that channel
+    if both the keyword and the keywords of the same type in the entry are comparable by the normalized form,
+    so the lookup of such keyword can be answered without querying the database.
+
+    The entries are loaded lazily and invalidated once the modules of the channel changed.
+
+    The entries also expire after ``AutoReply.KeywordIndexExpirySeconds`` seconds
+    to reflect the changes made by the other processes.
+    """
+
+    def __init__(self):
+        self._cache = TTLCache(maxsize=AutoReply.KeywordIndexCacheSize, ttl=AutoReply.KeywordIndexExpirySeconds)
+        self._lock = Lock()
+        self._generation = 0
+
+    @staticmethod
+    def normalize(keyword: str, keyword_type) -> Tuple[str, int]:
+        """
+        Normalize ``keyword`` and ``keyword_type`` to be the key of the index.
+
+        If ``AutoReply.CaseInsensitive`` is ``True``, ``keyword`` will be casefolded with its diacritics stripped.
+        This is **NOT** equivalent to :data:`case_insensitive_collation`,
+        use :meth:`is_exact()` to check if the normalized keyword could be compared by its normalized form.
+
+        :param keyword: keyword to be normalized
+        :param keyword_type: type of the keyword
+        :return: normalized index key
+        """
+        if AutoReply.CaseInsensitive:
+            keyword = "".join(c for c in unicodedata.normalize("NFKD", keyword) if not unicodedata.combining(c))
+            keyword = keyword.casefold()
+
+        return keyword, int(keyword_type)
+
+    @staticmethod
+    def is_exact(normalized_keyword: str) -> bool:
+        """
+        Check if ``normalized_keyword`` is equal to another normalized keyword under
+        :data:`case_insensitive_collation` only if both normalized keywords are the same.
+
+        Always ``True`` if ``AutoReply.CaseInsensitive`` is ``False`` because the keywords are compared as-is.
+
+        :param normalized_keyword: keyword normalized by :meth:`normalize()`
+        :return: if `normalized_keyword` could be compared by its normalized form
+        """
+        return not AutoReply.CaseInsensitive or all(c in _EXACT_NORMALIZED_CHARS for c in normalized_keyword)
+
+    def get(self, channel_oid: ObjectId, loader: Callable[[ObjectId], Set[Tuple[str, int]]]) \
+            -> Tuple[Set[Tuple[str, int]], Set[int]]:
+        """
+        Get the keyword index of ``channel_oid``. Load the index using ``loader`` if not available.
+
+        :param channel_oid: OID of the channel to get the index
+        :param loader: function to load the normalized keywords of a channel
+        :return: keyword index of `channel_oid` and the keyword type codes having any inexact keyword
+        """
+        with self._lock:
+            ret = self._cache.get(channel_oid)
+            generation = self._generation
+
+        if ret is None:
+            kw_index = loader(channel_oid)
+            ret = (kw_index, {kw_type for kw, kw_type in kw_index if not self.is_exact(kw)})
+
+            with self._lock:
+                # Skip storing the loaded index if any invalidation happened during the loading
+                if generation == self._generation:
+                    self._cache[channel_oid] = ret
+
+        return ret
+
+    def may_match(self, channel_oid: ObjectId, keyword: str, keyword_type,
+                  loader: Callable[[ObjectId], Set[Tuple[str, int]]]) -> bool:
+        """
+        Check if ``keyword`` of ``keyword_type`` could match any active module in ``channel_oid``.
+
+        ``False`` is returned only if no active module could match the keyword.
+
+        :param channel_oid: OID of the channel to check
+        :param keyword: keyword to check
+        :param keyword_type: type of the keyword
+        :param loader: function to load the normalized keywords of a channel
+        :return: if `keyword` could match any active module
+        """
+        kw_index, inexact_types = self.get(channel_oid, loader)
+        kw, kw_type = self.normalize(keyword, keyword_type)
+
+        return (kw, kw_type) in kw_index or not self.is_exact(kw) or kw_type in inexact_types
+
+    def invalidate_channel(self, channel_oid: ObjectId):
+        """
+        Invalidate the keyword index of ``channel_oid``.
+
+        :param channel_oid: OID of the channel to invalidate the index
+        """
+        with self._lock:
+            self._generation += 1
+            self._cache.pop(channel_oid, None)
+
+    def invalidate_keyword(self, keyword: str):
+        """
+        Invalidate the keyword index of all channels containing ``keyword`` of any type.
+
+        :param keyword: keyword to invalidate the indexes
+        """
+        keyword, _ = self.normalize(keyword, 0)
+        exact = self.is_exact(keyword)
+
+        with self._lock:
+            self._generation += 1
+            for channel_oid in [ch_oid for ch_oid, (kw_index, inexact_types) in self._cache.items()
+                                if not exact or inexact_types or any(kw == keyword for kw, _ in kw_index)]:
+                self._cache.pop(channel_oid, None)
+
+    def clear(self):
+        """Clear all the keyword indexes."""
+        with self._lock:
+            self._generation += 1
+            self._cache.clear()
+
+
+_keyword_index = _AutoReplyKeywordIndex()
+
 
 class _AutoReplyModuleManager(BaseCollection):
     """Class for managing the auto-reply modules."""
@@ -44,14 +185,60 @@ class _AutoReplyModuleManager(BaseCollection):
 
     cache_name = f"{database_name}.{collection_name}"
 
-    def build_indexes(self):
-        # Using `_validate_content` to track the uniqueness of the modules instead of creating a index
-        self.create_index(
-            [(AutoReplyModuleModel.KEY_KW_CONTENT, 1),
-             (AutoReplyModuleModel.KEY_KW_TYPE, 1),
-             (AutoReplyModuleModel.ChannelOid.key, 1),
-             (AutoReplyModuleModel.Active.key, 1)],
-            name="Index to get module")
+    def __init__(self):
+        super().__init__()
+
+        self._called_count = IncrementAccumulator(
+            self, AutoReplyModuleModel.CalledCount.key, AutoReplyModuleModel.LastUsed.key,
+            AutoReply.CalledCountFlushIntervalSeconds, AutoReply.CalledCountFlushThreshold
+        )
+
+    @classmethod
+    def get_index_models(cls) -> List[IndexModel]:
+        return [
+            # Using `_validate_content` to track the uniqueness of the modules instead of creating a index
+            IndexModel(
+                [(AutoReplyModuleModel.KEY_KW_CONTENT, 1),
+                 (AutoReplyModuleModel.KEY_KW_TYPE, 1),
+                 (AutoReplyModuleModel.ChannelOid.key, 1),
+                 (AutoReplyModuleModel.Active.key, 1)],
+                name="Index to get module"),
+        ]
+
+    def clear(self):
+        self._called_count.flush()
+        super().clear()
+        _keyword_index.clear()
+
+    def flush_called_count(self):
+        """Write the accumulated called count of the modules into the database."""
+        self._called_count.flush()
+
+    def insert_one_model(self, model: AutoReplyModuleModel) -> Tuple[WriteOutcome, Optional[Exception]]:
+        ret = super().insert_one_model(model)
+
+        _keyword_index.invalidate_channel(model.channel_oid)
+
+        return ret
+
+    def _load_keyword_index(self, channel_oid: ObjectId) -> Set[Tuple[str, int]]:
+        """
+        Load the keyword index of the active modules in ``channel_oid`` from the database.
+
+        :param channel_oid: OID of the channel to load the index
+        :return: keyword index of `channel_oid`
+        """
+        key_kw = AutoReplyModuleModel.Keyword.key
+        key_content = AutoReplyContentModel.Content.key
+        key_type = AutoReplyContentModel.ContentType.key
+
+        return {
+            _AutoReplyKeywordIndex.normalize(doc[key_kw][key_content], doc[key_kw][key_type])
+            for doc in self.find(
+                {AutoReplyModuleModel.ChannelOid.key: channel_oid, AutoReplyModuleModel.Active.key: True},
+                projection={AutoReplyModuleModel.KEY_KW_CONTENT: 1, AutoReplyModuleModel.KEY_KW_TYPE: 1}
+            )
+        }
 
     @staticmethod
     def _has_access_to_pinned(channel_oid: ObjectId, user_oid: ObjectId):
@@ -114,6 +301,8 @@ class _AutoReplyModuleManager(BaseCollection):
             collation=case_insensitive_collation if AutoReply.CaseInsensitive else None
         )
 
+        _keyword_index.invalidate_keyword(keyword)
+
     @staticmethod
     @arg_type_ensure
     def _remove_update_ops(remover_oid: ObjectId):
@@ -215,6 +404,8 @@ class _AutoReplyModuleManager(BaseCollection):
             )
             self._delete_recent_module(mdl.keyword.content)
 
+            _keyword_index.invalidate_channel(mdl.channel_oid)
+
         return AutoReplyModuleAddResult(outcome, ex, mdl)
 
     def module_mark_inactive(self, keyword: str, channel_oid: ObjectId, remover_oid: ObjectId) -> UpdateOutcome:
@@ -239,6 +430,7 @@ class _AutoReplyModuleManager(BaseCollection):
                                        collation=case_insensitive_collation)
 
         if ret.is_success:
+            _keyword_index.invalidate_channel(channel_oid)
             self._delete_recent_module(keyword)
         elif ret == UpdateOutcome.X_NOT_FOUND:
             # If the `Pinned` property becomes True then something found,
@@ -260,6 +452,13 @@ class _AutoReplyModuleManager(BaseCollection):
 
         The called count of the returned module **includes** the current call.
 
+        If ``update_async`` is ``True``, the called count and the last used timestamp will be accumulated
+        and written in batch periodically. The returned module always reflects the accumulated values.
+
+        The keyword will be checked against the in-memory keyword index of the channel first.
+        The database will **NOT** be queried if no active module could match the keyword.
+        Keywords not comparable by the normalized form (for example, ``ø`` and ``o``) always query the database.
+
         :param keyword: expected keyword of the module to get
         :param keyword_type: expected type of the keyword of the module to get
         :param channel_oid: expected affilitated channel
@@ -267,6 +466,9 @@ class _AutoReplyModuleManager(BaseCollection):
         :param update_async: if the info update should be performed asynchronously
         :return: an active auto reply module if exists
         """
+        if not _keyword_index.may_match(channel_oid, keyword, keyword_type, self._load_keyword_index):
+            return None
+
         ret: Optional[AutoReplyModuleModel] = \
             self.find_one_casted(
                 {
@@ -280,28 +482,37 @@ class _AutoReplyModuleManager(BaseCollection):
         if not ret:
             return None
 
+        pending = self._called_count.get_pending(ret.id)
+        if pending:
+            pending_count, pending_last_used = pending
+
+            ret.called_count += pending_count
+            if not ret.last_used or pending_last_used > ret.last_used:
+                ret.last_used = pending_last_used
+
         now = now_utc_aware()
         if not ret.can_be_used(now):
             return None
 
         if update_count:
-            q_found = {AutoReplyModuleModel.Id.key: ret.id}
-            u_query = {
-                "$set": {AutoReplyModuleModel.LastUsed.key: now},
-                "$inc": {AutoReplyModuleModel.CalledCount.key: 1}
-            }
-
             # Normally async is preferred to boost the speed, no async update for tests
             if update_async:
-                self.update_one_async(q_found, u_query)
+                self._called_count.add(ret.id, now)
             else:
-                self.update_one(q_found, u_query)
+                self.update_one(
+                    {AutoReplyModuleModel.Id.key: ret.id},
+                    {
+                        "$set": {AutoReplyModuleModel.LastUsed.key: now},
+                        "$inc": {AutoReplyModuleModel.CalledCount.key: 1}
+                    }
+                )
 
             ret.called_count += 1
 
         return ret
 
-    def get_conn_list(self, channel_oid: ObjectId, keyword: Optional[str] = None, *, active_only: bool = True) \
+    def get_conn_list(self, channel_oid: ObjectId, keyword: Optional[str] = None, *, active_only: bool = True,
+                      with_count: bool = True) \
             -> ExtendedCursor[AutoReplyModuleModel]:
         """
         Get the auto-reply module list in ``channel_oid`` with ``keyword``.
@@ -315,6 +526,7 @@ class _AutoReplyModuleManager(BaseCollection):
         :param channel_oid: channel of the module(s)
         :param keyword: keyword to filter the returning module(s)
         :param active_only: if to return active modules only
+        :param with_count: if the count of the modules should be available on the returned cursor
         :return: a cursor yielding the modules which match the given conditions
         """
         filter_ = {AutoReplyModuleModel.ChannelOid.key: channel_oid}
@@ -325,7 +537,8 @@ class _AutoReplyModuleManager(BaseCollection):
         if active_only:
             filter_[AutoReplyModuleModel.Active.key] = True
 
-        return self.find_cursor_with_count(filter_, sort=[(AutoReplyModuleModel.CalledCount.key, pymongo.DESCENDING)])
+        return self.find_cursor_with_count(filter_, sort=[(AutoReplyModuleModel.CalledCount.key, pymongo.DESCENDING)],
+                                           with_count=with_count)
 
     def get_conn_list_oids(self, conn_oids: List[ObjectId]) -> ExtendedCursor[AutoReplyModuleModel]:
         """
@@ -335,7 +548,8 @@ class _AutoReplyModuleManager(BaseCollection):
         :return: a cursor yielding auto-reply modules which ID is one of `conn_oids` from the most-used one
         """
         return self.find_cursor_with_count({OID_KEY: {"$in": conn_oids}},
-                                           sort=[(AutoReplyModuleModel.CalledCount.key, pymongo.DESCENDING)])
+                                           sort=[(AutoReplyModuleModel.CalledCount.key, pymongo.DESCENDING)],
+                                           with_count=False)
 
     def get_module_count_stats(self, channel_oid: ObjectId, limit: Optional[int] = None) \
             -> ExtendedCursor[AutoReplyModuleModel]:
@@ -346,9 +560,12 @@ class _AutoReplyModuleManager(BaseCollection):
         :param limit: maximum count of the result. No limit if not set or `None`
         :return: a cursor yielding auto-reply module from the most-used module
         """
+        self._called_count.flush()
+
         ret = self.find_cursor_with_count(
             {AutoReplyModuleModel.ChannelOid.key: channel_oid},
-            sort=[(AutoReplyModuleModel.CalledCount.key, pymongo.DESCENDING)], limit=limit if limit else 0
+            sort=[(AutoReplyModuleModel.CalledCount.key, pymongo.DESCENDING)], limit=limit if limit else 0,
+            with_count=False
         )
 
         return ret
@@ -364,6 +581,8 @@ class _AutoReplyModuleManager(BaseCollection):
         :param limit: count of the result to get
         :return: result object containing the stats
         """
+        self._called_count.flush()
+
         pipeline = [
             {"$match": {AutoReplyModuleModel.ChannelOid.key: channel_oid}},
             {"$group": {
@@ -393,8 +612,11 @@ class _AutoReplyModuleTagManager(BaseCollection):
     collection_name = "tag"
     model_class = AutoReplyModuleTagModel
 
-    def build_indexes(self):
-        self.create_index(AutoReplyModuleTagModel.Name.key, name="Auto Reply Tag Identity", unique=True)
+    @classmethod
+    def get_index_models(cls) -> List[IndexModel]:
+        return [
+            IndexModel(AutoReplyModuleTagModel.Name.key, name="Auto Reply Tag Identity", unique=True),
+        ]
 
     def get_insert(self, name, color=ColorFactory.DEFAULT) -> AutoReplyModuleTagGetResult:
         """
@@ -628,7 +850,8 @@ class _AutoReplyManager(ClearableMixin):
         """
         return self._tag.get_insert(name, color)
 
-    def get_conn_list(self, channel_oid: ObjectId, keyword: str = None, active_only: bool = True) \
+    def get_conn_list(self, channel_oid: ObjectId, keyword: str = None, active_only: bool = True,
+                      with_count: bool = True) \
             -> ExtendedCursor[AutoReplyModuleModel]:
         """
         Get the auto-reply module list in ``channel_oid`` with ``keyword``.
@@ -642,9 +865,10 @@ class _AutoReplyManager(ClearableMixin):
         :param channel_oid: channel of the module(s)
         :param keyword: keyword to filter the returning module(s)
         :param active_only: if to return active modules only
+        :param with_count: if the count of the modules should be available on the returned cursor
         :return: a cursor yielding the modules which match the given conditions
         """
-        return self._mod.get_conn_list(channel_oid, keyword, active_only=active_only)
+        return self._mod.get_conn_list(channel_oid, keyword, active_only=active_only, with_count=with_count)
 
     def get_conn_list_oids(self, conn_oids: List[ObjectId]) -> ExtendedCursor[AutoReplyModuleModel]:
         """
@@ -685,6 +909,6 @@ class _AutoReplyManager(ClearableMixin):
         return self._mod.get_unique_keyword_count_stats(channel_oid, limit)
 
 
-AutoReplyManager = _AutoReplyManager()
-AutoReplyModuleManager = _AutoReplyModuleManager()
-AutoReplyModuleTagManager = _AutoReplyModuleTagManager()
+AutoReplyManager = LazyManager(_AutoReplyManager)
+AutoReplyModuleManager = LazyManager(_AutoReplyModuleManager)
+AutoReplyModuleTagManager = LazyManager(_AutoReplyModuleTagManager)
@@ -3,18 +3,20 @@ from typing import Optional, Dict, List
 
 import pymongo
 from bson import ObjectId
-from pymongo import ReturnDocument
+from pymongo import IndexModel, ReturnDocument
 
 from extutils.checker import arg_type_ensure
 from flags import Platform
+from JellyBot.systemconfig import Database
 from models import ChannelModel, ChannelConfigModel, ChannelCollectionModel, OID_KEY
-from mongodb.utils import ExtendedCursor
+from mongodb.utils import ExtendedCursor, ModelCache
 from mongodb.factory.results import (
     WriteOutcome, GetOutcome, OperationOutcome, UpdateOutcome,
     ChannelRegistrationResult, ChannelGetResult, ChannelChangeNameResult, ChannelCollectionRegistrationResult
 )
 
 from ._base import BaseCollection
+from ._lazy import LazyManager
 
 __all__ = ("ChannelManager", "ChannelCollectionManager",)
 
@@ -22,15 +24,35 @@ DB_NAME = "channel"
 
 
 class _ChannelManager(BaseCollection):
-    """Class to manage the channel data."""
+    """
+    Class to manage the channel data.
+
+    Registered channels are cached by its platform and token. The cached channel will be invalidated once updated.
+    """
 
     database_name = DB_NAME
     collection_name = "dict"
     model_class = ChannelModel
 
-    def build_indexes(self):
-        self.create_index(
-            [(ChannelModel.Platform.key, 1), (ChannelModel.Token.key, 1)], name="Channel Identity", unique=True)
+    def __init__(self):
+        super().__init__()
+
+        self._cache: ModelCache[ChannelModel] = ModelCache(Database.IdentityCacheSize, Database.IdentityExpirySeconds)
+
+    @classmethod
+    def get_index_models(cls) -> List[IndexModel]:
+        return [
+            IndexModel(
+                [(ChannelModel.Platform.key, 1), (ChannelModel.Token.key, 1)], name="Channel Identity", unique=True),
+        ]
+
+    def clear(self):
+        super().clear()
+
+        self._cache.clear()
+
+    def _invalidate_oid(self, channel_oid: ObjectId):
+        self._cache.invalidate_models(lambda mdl: mdl.id == channel_oid)
 
     @arg_type_ensure
     def ensure_register(self, platform: Platform, token: str, *, default_name: str = None) \
@@ -45,9 +67,16 @@ class _ChannelManager(BaseCollection):
         :param default_name: default name to be used if channel not yet registered
         :return: channel registration result
         """
+        key = (platform, token)
+
+        mdl, generation = self._cache.get(key)
+        if mdl:
+            return ChannelRegistrationResult(WriteOutcome.O_DATA_EXISTS, model=mdl)
+
         mdl = self.get_channel_token(platform, token)
 
         if mdl:
+            self._cache.set(key, mdl, generation)
             return ChannelRegistrationResult(WriteOutcome.O_DATA_EXISTS, model=mdl)
 
         # Inline import to avoid cyclic import
@@ -92,6 +121,7 @@ class _ChannelManager(BaseCollection):
             {ChannelModel.Platform.key: platform, ChannelModel.Token.key: token},
             {"$set": {ChannelModel.BotAccessible.key: accessibility}}
         )
+        self._cache.invalidate((platform, token))
         if result == UpdateOutcome.X_NOT_FOUND:
             return UpdateOutcome.X_CHANNEL_NOT_FOUND
 
@@ -107,10 +137,13 @@ class _ChannelManager(BaseCollection):
         :param default_name: new default name for the channel
         :return: outcome of the update
         """
-        return self.update_many_outcome(
+        outcome = self.update_many_outcome(
             {ChannelModel.Platform.key: platform, ChannelModel.Token.key: token},
             {"$set": {f"{ChannelModel.Config.key}.{ChannelConfigModel.DefaultName.key}": default_name}}
         )
+        self._cache.invalidate((platform, token))
+
+        return outcome
 
     @arg_type_ensure
     def update_channel_nickname(self, channel_oid: ObjectId, root_oid: ObjectId, new_name: str) \
@@ -136,6 +169,7 @@ class _ChannelManager(BaseCollection):
                 {ChannelModel.Id.key: channel_oid},
                 {"$unset": {f"{ChannelModel.Name.key}.{root_oid}": ""}},
                 return_document=ReturnDocument.AFTER)
+        self._invalidate_oid(channel_oid)
 
         try:
             if ret:
@@ -209,7 +243,7 @@ class _ChannelManager(BaseCollection):
         if accessbible_only:
             filter_[ChannelModel.BotAccessible.key] = True
 
-        return {model.id: model for model in self.find_cursor_with_count(filter_)}
+        return {model.id: model for model in self.find_cursor_with_count(filter_, with_count=False)}
 
     @arg_type_ensure
     def get_channel_default_name(self, default_name: str, *, hide_private: bool = True) \
@@ -281,6 +315,7 @@ class _ChannelManager(BaseCollection):
         result = self.update_one_outcome(
             {ChannelModel.Id.key: channel_oid},
             {"$set": {f"{ChannelModel.Config.key}.{json_key}": config_value}})
+        self._invalidate_oid(channel_oid)
 
         if result == UpdateOutcome.X_NOT_FOUND:
             return UpdateOutcome.X_CHANNEL_NOT_FOUND
@@ -294,6 +329,9 @@ class _ChannelCollectionManager(BaseCollection):
 
     Currently, LINE does not have the concept of channel collection.
     However, in Discord, this concept is called a server (guild in ``discord.py``).
+
+    Registered channel collections are cached by its platform and token.
+    The cached channel collection will be invalidated once updated.
     """
 
     # TEST: ChannelCollectionManager
@@ -302,11 +340,25 @@ class _ChannelCollectionManager(BaseCollection):
     collection_name = "collection"
     model_class = ChannelCollectionModel
 
-    def build_indexes(self):
-        self.create_index(
-            [(ChannelCollectionModel.Platform.key, 1), (ChannelCollectionModel.Token.key, 1)],
-            name="Channel Collection Identity", unique=True)
-        self.create_index(ChannelCollectionModel.ChildChannelOids.key, name="Child Channel Index")
+    def __init__(self):
+        super().__init__()
+
+        self._cache: ModelCache[ChannelCollectionModel] = ModelCache(
+            Database.IdentityCacheSize, Database.IdentityExpirySeconds)
+
+    @classmethod
+    def get_index_models(cls) -> List[IndexModel]:
+        return [
+            IndexModel(
+                [(ChannelCollectionModel.Platform.key, 1), (ChannelCollectionModel.Token.key, 1)],
+                name="Channel Collection Identity", unique=True),
+            IndexModel(ChannelCollectionModel.ChildChannelOids.key, name="Child Channel Index"),
+        ]
+
+    def clear(self):
+        super().clear()
+
+        self._cache.clear()
 
     @arg_type_ensure
     def ensure_register(self, platform: Platform, token: str,
@@ -331,6 +383,12 @@ class _ChannelCollectionManager(BaseCollection):
         :param default_name: default name of the channel collection to use if not registered
         :return: channel collection registration result
         """
+        key = (platform, token)
+
+        entry, generation = self._cache.get(key)
+        if entry and child_channel_oid in entry.child_channel_oids:
+            return ChannelCollectionRegistrationResult(WriteOutcome.O_DATA_EXISTS, None, entry)
+
         if not default_name:
             default_name = f"{token} ({platform.key})"
 
@@ -339,7 +397,13 @@ class _ChannelCollectionManager(BaseCollection):
 
         if outcome.data_found:
             entry = self.get_chcoll(platform, token)
-            self.append_child_channel(entry.id, child_channel_oid)
+            if child_channel_oid not in entry.child_channel_oids:
+                # Cached on the next registration to contain the appended child channel
+                self.append_child_channel(entry.id, child_channel_oid)
+                return ChannelCollectionRegistrationResult(outcome, ex, entry)
+
+        if outcome.is_success:
+            self._cache.set(key, entry, generation)
 
         return ChannelCollectionRegistrationResult(outcome, ex, entry)
 
@@ -389,9 +453,12 @@ class _ChannelCollectionManager(BaseCollection):
         :param channel_oid: OID of the channel to be attached to the channel collection
         :return: outcome of the attachment
         """
-        return self.update_many_outcome(
+        outcome = self.update_many_outcome(
             {ChannelCollectionModel.Id.key: parent_oid},
             {"$addToSet": {ChannelCollectionModel.ChildChannelOids.key: channel_oid}})
+        self._cache.invalidate_models(lambda mdl: mdl.id == parent_oid)
+
+        return outcome
 
     @arg_type_ensure
     def update_default_name(self, platform: Platform, token: str, new_default_name: str) -> UpdateOutcome:
@@ -403,10 +470,13 @@ class _ChannelCollectionManager(BaseCollection):
         :param new_default_name: new default name of the channel collection
         :return: outcome of the update
         """
-        return self.update_many_outcome(
+        outcome = self.update_many_outcome(
             {ChannelCollectionModel.Token.key: token, ChannelCollectionModel.Platform.key: platform},
             {"$set": {ChannelCollectionModel.DefaultName.key: new_default_name}})
+        self._cache.invalidate((platform, token))
+
+        return outcome
 
 
-ChannelManager = _ChannelManager()
-ChannelCollectionManager = _ChannelCollectionManager()
+ChannelManager = LazyManager(_ChannelManager)
+ChannelCollectionManager = LazyManager(_ChannelCollectionManager)
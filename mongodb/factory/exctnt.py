@@ -2,6 +2,7 @@
 from typing import Optional, Any, List, Tuple
 
 from bson import ObjectId
+from pymongo import IndexModel
 
 from JellyBot.systemconfig import Database
 from flags import ExtraContentType
@@ -12,6 +13,7 @@ from extutils.checker import arg_type_ensure
 from extutils.utils import cast_iterable
 
 from ._base import BaseCollection
+from ._lazy import LazyManager
 
 __all__ = ("ExtraContentManager",)
 
@@ -25,9 +27,12 @@ class _ExtraContentManager(BaseCollection):
 
     DefaultTitle = "-"
 
-    def build_indexes(self):
-        self.create_index(ExtraContentModel.Timestamp.key,
-                          expireAfterSeconds=Database.ExtraContentExpirySeconds, name="Timestamp")
+    @classmethod
+    def get_index_models(cls) -> List[IndexModel]:
+        return [
+            IndexModel(ExtraContentModel.Timestamp.key,
+                       expireAfterSeconds=Database.ExtraContentExpirySeconds, name="Timestamp"),
+        ]
 
     def record_extra_message(self, channel_oid: ObjectId, content: List[Tuple[str, str]], title: str = None) \
             -> RecordExtraContentResult:
@@ -83,4 +88,4 @@ class _ExtraContentManager(BaseCollection):
         return self.find_one_casted({OID_KEY: content_id})
 
 
-ExtraContentManager = _ExtraContentManager()
+ExtraContentManager = LazyManager(_ExtraContentManager)
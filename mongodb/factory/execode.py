@@ -1,8 +1,9 @@
 """Execode-related data controllers."""
 from datetime import timedelta
-from typing import Type, Optional, Tuple
+from typing import Type, Optional, Tuple, List
 
 from bson import ObjectId
+from pymongo import IndexModel
 from django.http import QueryDict  # pylint: disable=wrong-import-order
 
 from extutils.dt import now_utc_aware
@@ -19,6 +20,7 @@ from mongodb.factory.results import (
 from JellyBot.systemconfig import Database
 
 from ._base import BaseCollection
+from ._lazy import LazyManager
 from .mixin import GenerateTokenMixin
 
 __all__ = ("ExecodeManager",)
@@ -34,10 +36,13 @@ class _ExecodeManager(GenerateTokenMixin, BaseCollection):
     collection_name = "main"
     model_class = ExecodeEntryModel
 
-    def build_indexes(self):
-        self.create_index(ExecodeEntryModel.Execode.key, name="Execode", unique=True)
-        self.create_index(ExecodeEntryModel.Timestamp.key,
-                          name="Timestamp (for TTL)", expireAfterSeconds=Database.ExecodeExpirySeconds)
+    @classmethod
+    def get_index_models(cls) -> List[IndexModel]:
+        return [
+            IndexModel(ExecodeEntryModel.Execode.key, name="Execode", unique=True),
+            IndexModel(ExecodeEntryModel.Timestamp.key,
+                       name="Timestamp (for TTL)", expireAfterSeconds=Database.ExecodeExpirySeconds),
+        ]
 
     def enqueue_execode(self, root_uid: ObjectId, execode_type: Execode, data_cls: Type[Model] = None,
                         **data_kw_args) \
@@ -196,4 +201,4 @@ class _ExecodeManager(GenerateTokenMixin, BaseCollection):
         return CompleteExecodeResult(outcome, ex, tk_model, set(), cmpl_outcome)
 
 
-ExecodeManager = _ExecodeManager()
+ExecodeManager = LazyManager(_ExecodeManager)
@@ -1,6 +1,6 @@
 """Wrapper for the controls on a MongoDB collection as a mixin."""
 from datetime import datetime, tzinfo
-from threading import Thread
+from functools import partial
 from typing import Optional, Tuple, Union, TypeVar
 
 from bson.errors import InvalidDocument
@@ -8,6 +8,7 @@ from django.conf import settings
 from pymongo.collection import Collection
 from pymongo.errors import DuplicateKeyError
 
+from extutils.bgexec import BACKGROUND_EXECUTOR
 from extutils.dt import TimeRange
 from extutils.utils import dt_to_objectid
 from env_var import is_testing
@@ -238,11 +239,7 @@ class ControlExtensionMixin(CollectionPropertiesMixin, Collection):
         if is_testing():
             self.update_many(filter_, update, upsert=upsert, collation=collation)
         else:
-            Thread(
-                target=self.update_many,
-                args=(filter_, update),
-                kwargs={"upsert": upsert, "collation": collation}
-            ).start()
+            BACKGROUND_EXECUTOR.submit(self.update_many, filter_, update, upsert=upsert, collation=collation)
 
     def update_one_async(self, filter_, update, upsert=False, collation=None):
         """
@@ -256,16 +253,13 @@ class ControlExtensionMixin(CollectionPropertiesMixin, Collection):
         if is_testing():
             self.update_one(filter_, update, upsert=upsert, collation=collation)
         else:
-            Thread(
-                target=self.update_one,
-                args=(filter_, update),
-                kwargs={"upsert": upsert, "collation": collation}
-            ).start()
+            BACKGROUND_EXECUTOR.submit(self.update_one, filter_, update, upsert=upsert, collation=collation)
 
     def find_cursor_with_count(self, filter_: Optional[dict] = None, /,  # pylint: disable=keyword-arg-before-vararg
                                *args,
                                hours_within: Optional[int] = None, start: Optional[datetime] = None,
-                               end: Optional[datetime] = None, **kwargs) \
+                               end: Optional[datetime] = None, with_count: bool = True,
+                               count_limit: Optional[int] = None, estimate_count: bool = False, **kwargs) \
             -> ExtendedCursor[T]:
         """
         Find the data matching the condition ``filter_`` and return it as an :class:`ExtendedCursor`.
@@ -276,11 +270,25 @@ class ControlExtensionMixin(CollectionPropertiesMixin, Collection):
 
         ``start``, ``end`` and ``hours_within`` will be used as the time range parameters for ``filter_``.
 
+        The count of the data is obtained only when ``len()`` is called on the returned cursor.
+
+        - If ``with_count`` is ``False``, the count will not be available.
+          This should be used if the returned cursor is only for iterating,
+          including ``list()`` and ``tuple()``, which call ``len()`` for the length hint.
+
+        - If ``count_limit`` is set, the count will be at most ``count_limit``.
+
+        - If ``estimate_count`` is ``True`` and ``filter_`` is empty,
+          the count will be estimated using the collection metadata. ``count_limit`` will not be applied.
+
         :param filter_: condition to filter the returned data
         :param args: args for `find()`
         :param hours_within: hour range for the time range filtering
         :param start: start time for the time range filtering
         :param end: end time for the time range filtering
+        :param with_count: if the count of the data should be available
+        :param count_limit: max count of the data to be counted
+        :param estimate_count: if the count can be estimated when `filter_` is empty
         :param kwargs: keyword-args for `find()`
         :return: an `ExtendedCursor` yielding the filtered data
         """
@@ -289,8 +297,18 @@ class ControlExtensionMixin(CollectionPropertiesMixin, Collection):
 
         self.attach_time_range(filter_, hours_within=hours_within, start=start, end=end)
 
-        return ExtendedCursor(self.find(filter_, *args, **kwargs), self.count_documents(filter_),
-                              parse_cls=self.get_model_cls())
+        count = None
+        if with_count:
+            count_filter = dict(filter_)
+
+            if estimate_count and not count_filter:
+                count = self.estimated_document_count
+            elif count_limit:
+                count = partial(self.count_documents, count_filter, limit=count_limit)
+            else:
+                count = partial(self.count_documents, count_filter)
+
+        return ExtendedCursor(self.find(filter_, *args, **kwargs), count, parse_cls=self.get_model_cls())
 
     def find_one_casted(self, filter_: Optional[dict] = None, /, *args,  # pylint: disable=keyword-arg-before-vararg
                         **kwargs) -> Optional[T]:
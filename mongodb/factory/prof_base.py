@@ -22,11 +22,14 @@ from typing import Optional, List, Dict, Set, Union
 import pymongo
 from bson import ObjectId
 
-from pymongo import UpdateOne
+from pymongo import IndexModel, UpdateOne
 
+from env_var import is_testing
+from extutils.bgexec import BACKGROUND_EXECUTOR
 from extutils.boolext import to_bool
 from extutils.checker import arg_type_ensure
 from flags import ProfilePermission, ProfilePermissionDefault, PermissionLevel
+from JellyBot.systemconfig import Database
 from models import (
     OID_KEY, ChannelConfigModel, ChannelProfileModel, ChannelProfileConnectionModel, PermissionPromotionRecordModel
 )
@@ -35,10 +38,11 @@ from mongodb.factory.results import (
     WriteOutcome, GetOutcome, OperationOutcome, UpdateOutcome,
     GetPermissionProfileResult, CreateProfileResult
 )
-from mongodb.utils import ExtendedCursor
+from mongodb.utils import ExtendedCursor, ModelCache
 from strres.mongodb import Profile
 
 from ._base import BaseCollection
+from ._lazy import LazyManager
 
 __all__ = ("ProfileDataManager", "UserProfileManager", "PermissionPromotionRecordHolder",)
 
@@ -50,12 +54,68 @@ class _UserProfileManager(BaseCollection):
     collection_name = "user"
     model_class = ChannelProfileConnectionModel
 
-    def build_indexes(self):
-        self.create_index(
-            [(ChannelProfileConnectionModel.UserOid.key, pymongo.DESCENDING),
-             (ChannelProfileConnectionModel.ChannelOid.key, pymongo.DESCENDING)],
-            name="Profile Connection Identity",
-            unique=True)
+    def __init__(self):
+        super().__init__()
+
+        # Keyed by ``(channel OID, user OID)`` which the user is known to be available in the channel.
+        # The entries are invalidated once the user could become unavailable in the channel.
+        self._membership: ModelCache[bool] = ModelCache(
+            Database.Profile.MembershipCacheSize, Database.Profile.MembershipExpirySeconds)
+
+        if not is_testing():
+            BACKGROUND_EXECUTOR.submit(self._warm_membership)
+
+    @classmethod
+    def get_index_models(cls) -> List[IndexModel]:
+        return [
+            IndexModel(
+                [(ChannelProfileConnectionModel.UserOid.key, pymongo.DESCENDING),
+                 (ChannelProfileConnectionModel.ChannelOid.key, pymongo.DESCENDING)],
+                name="Profile Connection Identity",
+                unique=True),
+        ]
+
+    def clear(self):
+        super().clear()
+        self._membership.clear()
+
+    def _warm_membership(self):
+        batch_size = Database.Profile.MembershipWarmBatchSize
+
+        pairs = []
+        generation = self._membership.generation()
+
+        # Only uses native ``pymongo`` methods to reduce the memory usage
+        for data in self.find({ChannelProfileConnectionModel.ProfileOids.key + ".0": {"$exists": True}},
+                              projection={ChannelProfileConnectionModel.ChannelOid.key: 1,
+                                          ChannelProfileConnectionModel.UserOid.key: 1},
+                              limit=Database.Profile.MembershipCacheSize, batch_size=batch_size):
+            pairs.append((data[ChannelProfileConnectionModel.ChannelOid.key],
+                          data[ChannelProfileConnectionModel.UserOid.key]))
+
+            if len(pairs) >= batch_size:
+                self._membership.set_many(((pair, True) for pair in pairs), generation)
+
+                pairs = []
+                generation = self._membership.generation()
+
+        if pairs:
+            self._membership.set_many(((pair, True) for pair in pairs), generation)
+
+    def is_known_available(self, channel_oid: ObjectId, root_oid: ObjectId) -> bool:
+        """
+        Check if the user ``root_oid`` is known to be available in the channel ``channel_oid`` without querying.
+
+        The users are known to be available after the profiles are attached or being loaded on startup,
+        until they are marked unavailable or detached from any profiles.
+
+        Returning ``False`` does **NOT** mean that the user is not in the channel.
+
+        :param channel_oid: channel to check if the user is inside
+        :param root_oid: OID of the user to be checked
+        :return: if the user is known to be available in the channel
+        """
+        return self._membership.get((channel_oid, root_oid))[0] is not None
 
     @arg_type_ensure
     def user_attach_profile(self, channel_oid: ObjectId, root_uid: ObjectId,
@@ -69,6 +129,8 @@ class _UserProfileManager(BaseCollection):
         :param profile_oids: profile(s) to attach
         :return: attachment result
         """
+        generation = self._membership.generation()
+
         id_ = self.update_one(
             {
                 ChannelProfileConnectionModel.ChannelOid.key: channel_oid,
@@ -105,6 +167,9 @@ class _UserProfileManager(BaseCollection):
                 raise ValueError("`Model` should exists because `upserted_id` not exists, "
                                  "however no corresponding model found.")
 
+        if profile_oids:
+            self._membership.set((channel_oid, root_uid), True, generation)
+
         return OperationOutcome.O_COMPLETED
 
     @arg_type_ensure
@@ -139,7 +204,8 @@ class _UserProfileManager(BaseCollection):
             sort=[
                 (ChannelProfileConnectionModel.Starred.key, pymongo.DESCENDING),
                 (ChannelProfileConnectionModel.Id.key, pymongo.DESCENDING)
-            ]
+            ],
+            with_count=False
         ))
 
     def get_channel_prof_conn(self, channel_oid: Union[ObjectId, List[ObjectId]], *, available_only=True) \
@@ -161,7 +227,7 @@ class _UserProfileManager(BaseCollection):
         if available_only:
             filter_[f"{ChannelProfileConnectionModel.ProfileOids.key}.0"] = {"$exists": True}
 
-        return list(self.find_cursor_with_count(filter_))
+        return list(self.find_cursor_with_count(filter_, with_count=False))
 
     def get_users_exist_channel_dict(self, user_oids: List[ObjectId]) -> Dict[ObjectId, Set[ObjectId]]:
         """
@@ -203,13 +269,15 @@ class _UserProfileManager(BaseCollection):
 
         return ret
 
-    def get_available_connections(self) -> ExtendedCursor[ChannelProfileConnectionModel]:
+    def get_available_connections(self, *, with_count: bool = True) -> ExtendedCursor[ChannelProfileConnectionModel]:
         """
         Get the cursor which yields only the connections to the available users.
 
+        :param with_count: if the count of the connections should be available on the returned cursor
         :return: cursor of the connections to the available users
         """
-        return self.find_cursor_with_count({ChannelProfileConnectionModel.ProfileOids.key + ".0": {"$exists": True}})
+        return self.find_cursor_with_count({ChannelProfileConnectionModel.ProfileOids.key + ".0": {"$exists": True}},
+                                           with_count=with_count)
 
     def get_profile_user_oids(self, profile_oid: ObjectId) -> Set[ObjectId]:
         """
@@ -299,15 +367,21 @@ class _UserProfileManager(BaseCollection):
              ChannelProfileConnectionModel.UserOid.key: root_oid},
             {"$set": {
                 ChannelProfileConnectionModel.ProfileOids.key: ChannelProfileConnectionModel.ProfileOids.none_obj()}})
+        self._membership.invalidate((channel_oid, root_oid))
 
-    def detach_profile(self, profile_oid: ObjectId, user_oid: Optional[ObjectId] = None) -> UpdateOutcome:
+    def detach_profile(self, profile_oid: ObjectId, user_oid: Optional[ObjectId] = None, *,
+                       channel_oid: Optional[ObjectId] = None) -> UpdateOutcome:
         """
         Detach profile ``profile_oid`` from user ``user_oid``.
 
         If ``user_oid`` is ``None``, remove the profile from all the users.
 
+        ``channel_oid`` should be the channel of the profile.
+        If ``channel_oid`` is ``None``, the channel will be obtained from the users having the profile.
+
         :param profile_oid: OID of the profile to detach
         :param user_oid: OID of the user for the profile to detach from
+        :param channel_oid: channel of the profile
         :return: outcome of the detachment
         """
         filter_ = {ChannelProfileConnectionModel.ProfileOids.key: profile_oid}
@@ -315,9 +389,23 @@ class _UserProfileManager(BaseCollection):
         if user_oid:
             filter_[ChannelProfileConnectionModel.UserOid.key] = user_oid
 
-        return self.update_many_outcome(
+        if not channel_oid:
+            conn_data = self.find_one(filter_, projection={ChannelProfileConnectionModel.ChannelOid.key: 1})
+            if conn_data:
+                channel_oid = conn_data[ChannelProfileConnectionModel.ChannelOid.key]
+
+        outcome = self.update_many_outcome(
             filter_, {"$pull": {ChannelProfileConnectionModel.ProfileOids.key: profile_oid}})
 
+        # The users in the channel of the profile could have no profiles left after the detachment
+        if channel_oid:
+            if user_oid:
+                self._membership.invalidate((channel_oid, user_oid))
+            else:
+                self._membership.invalidate_keys(lambda key: key[0] == channel_oid)
+
+        return outcome
+
     def change_star(self, channel_oid: ObjectId, root_oid: ObjectId, star: bool) -> bool:
         """
         Change the star mark of the channel for a user.
@@ -343,11 +431,14 @@ class _ProfileDataManager(BaseCollection):
     collection_name = "prof"
     model_class = ChannelProfileModel
 
-    def build_indexes(self):
-        self.create_index(
-            [(ChannelProfileModel.ChannelOid.key, pymongo.DESCENDING),
-             (ChannelProfileModel.Name.key, pymongo.ASCENDING)],
-            name="Profile Identity", unique=True)
+    @classmethod
+    def get_index_models(cls) -> List[IndexModel]:
+        return [
+            IndexModel(
+                [(ChannelProfileModel.ChannelOid.key, pymongo.DESCENDING),
+                 (ChannelProfileModel.Name.key, pymongo.ASCENDING)],
+                name="Profile Identity", unique=True),
+        ]
 
     def on_init_async(self):
         super().on_init_async()
@@ -364,7 +455,7 @@ class _ProfileDataManager(BaseCollection):
         for perm_cat in ProfilePermission:
             perm_key = f"{ChannelProfileModel.Permission.key}.{perm_cat.code}"
 
-            for data in self.find_cursor_with_count({perm_key: {"$exists": False}}):
+            for data in self.find_cursor_with_count({perm_key: {"$exists": False}}, with_count=False):
                 cmds.append(
                     UpdateOne(
                         {OID_KEY: data.id},
@@ -398,7 +489,8 @@ class _ProfileDataManager(BaseCollection):
         :param profile_oid_list: list of the profile OIDs to get the data
         :return: a dict which key is the profile OID and value is the profile model
         """
-        return {model.id: model for model in self.find_cursor_with_count({OID_KEY: {"$in": profile_oid_list}})}
+        return {model.id: model
+                for model in self.find_cursor_with_count({OID_KEY: {"$in": profile_oid_list}}, with_count=False)}
 
     def get_profile_name(self, channel_oid: ObjectId, name: str) -> Optional[ChannelProfileModel]:
         """
@@ -414,7 +506,8 @@ class _ProfileDataManager(BaseCollection):
             {ChannelProfileModel.ChannelOid.key: channel_oid, ChannelProfileModel.Name.key: name.strip()},
         )
 
-    def get_channel_profiles(self, channel_oid: ObjectId, name_keyword: Optional[str] = None) \
+    def get_channel_profiles(self, channel_oid: ObjectId, name_keyword: Optional[str] = None, *,
+                             with_count: bool = True) \
             -> ExtendedCursor[ChannelProfileModel]:
         """
         Get a cursor yielding profiles that are in ``channel_oid`` and the name contains ``partial_keyword``.
@@ -425,6 +518,7 @@ class _ProfileDataManager(BaseCollection):
 
         :param channel_oid: channel of the profiles
         :param name_keyword: partial or exact name of the profiles to get
+        :param with_count: if the count of the profiles should be available on the returned cursor
         :return: cursor yielding profiles according to the given conditions
         """
         filter_ = {ChannelProfileModel.ChannelOid.key: channel_oid}
@@ -432,7 +526,7 @@ class _ProfileDataManager(BaseCollection):
         if name_keyword:
             filter_[ChannelProfileModel.Name.key] = {"$regex": name_keyword, "$options": "i"}
 
-        return self.find_cursor_with_count(filter_, sort=[(OID_KEY, pymongo.ASCENDING)])
+        return self.find_cursor_with_count(filter_, sort=[(OID_KEY, pymongo.ASCENDING)], with_count=with_count)
 
     def get_default_profile(self, channel_oid: ObjectId) -> GetPermissionProfileResult:
         """
@@ -668,6 +762,6 @@ class _PermissionPromotionRecordHolder(BaseCollection):
     model_class = PermissionPromotionRecordModel
 
 
-UserProfileManager = _UserProfileManager()
-ProfileDataManager = _ProfileDataManager()
-PermissionPromotionRecordHolder = _PermissionPromotionRecordHolder()
+UserProfileManager = LazyManager(_UserProfileManager)
+ProfileDataManager = LazyManager(_ProfileDataManager)
+PermissionPromotionRecordHolder = LazyManager(_PermissionPromotionRecordHolder)
@@ -6,17 +6,19 @@ Profile-related data controllers.
     - Any controls besides tests and access to permission promotion record should use
       this class to manipulate the profile data.
 """
-from threading import Thread
-from typing import Optional, List, Dict, Set, Union, Iterable
+from concurrent.futures import Future
+from typing import Optional, List, Dict, Set, Union, Iterable, FrozenSet
 
 from bson import ObjectId
 
 from env_var import is_testing
+from extutils.bgexec import BACKGROUND_EXECUTOR
 from extutils.boolext import to_bool
 from extutils.color import ColorFactory
 from extutils.checker import arg_type_ensure
 from extutils.emailutils import MailSender
 from flags import ProfilePermission, ProfilePermissionDefault, PermissionLevel
+from JellyBot.systemconfig import Database
 from mixin import ClearableMixin
 from models import ChannelProfileListEntry, ChannelProfileModel, ChannelProfileConnectionModel, ChannelModel
 from models.exceptions import ModelConstructionError, RequiredKeyNotFilledError, InvalidModelFieldError
@@ -25,9 +27,10 @@ from mongodb.factory.results import (
     WriteOutcome, OperationOutcome, UpdateOutcome,
     CreateProfileResult, RegisterProfileResult, ArgumentParseResult
 )
-from mongodb.utils import ExtendedCursor
+from mongodb.utils import ExtendedCursor, ModelCache
 from strres.mongodb import Profile
 
+from ._lazy import LazyManager
 from .prof_base import UserProfileManager, ProfileDataManager, PermissionPromotionRecordHolder
 
 __all__ = ("ProfileManager",)
@@ -235,11 +238,30 @@ class _ProfileManager(ClearableMixin):
         self._conn = UserProfileManager
         self._prof = ProfileDataManager
         self._promo = PermissionPromotionRecordHolder
+        # Keyed by ``(channel OID, user OID)``.
+        # The entries are invalidated once the profiles of the user changed.
+        self._perm_cache: ModelCache[FrozenSet[ProfilePermission]] = ModelCache(
+            Database.Profile.PermissionCacheSize, Database.Profile.PermissionExpirySeconds)
 
     def clear(self):
         self._conn.clear()
         self._prof.clear()
         self._promo.clear()
+        self._perm_cache.clear()
+
+    def _invalidate_permissions(self, channel_oid: ObjectId, root_oid: Optional[ObjectId] = None):
+        """
+        Invalidate the cached permissions of ``root_oid`` in ``channel_oid``.
+
+        If ``root_oid`` is ``None``, permissions of all users in ``channel_oid`` will be invalidated.
+
+        :param channel_oid: channel of the user(s) to invalidate the permissions
+        :param root_oid: user to invalidate the permissions
+        """
+        if root_oid:
+            self._perm_cache.invalidate((channel_oid, root_oid))
+        else:
+            self._perm_cache.invalidate_keys(lambda key: key[0] == channel_oid)
 
     # region Create
 
@@ -338,6 +360,7 @@ class _ProfileManager(ClearableMixin):
 
         if prof_result.success:
             attach_outcome = self._conn.user_attach_profile(channel_oid, root_uid, prof_result.model.id)
+            self._invalidate_permissions(channel_oid, root_uid)
 
         return RegisterProfileResult(prof_result.outcome, prof_result.exception, prof_result.model, attach_outcome)
 
@@ -345,16 +368,21 @@ class _ProfileManager(ClearableMixin):
         """
         Same functionality as ``register_new_default`` but execute the method asynchronously.
 
+        Nothing will be executed if the user is already known to be available in the channel.
+
         The method will be executed synchronously if ``TEST`` in environment variable is true.
 
         :param channel_oid: channel of the user
         :param root_uid: OID of the user
         """
+        if self._conn.is_known_available(channel_oid, root_uid):
+            return
+
         if is_testing():
             # No async if testing
             self.register_new_default(channel_oid, root_uid)
         else:
-            Thread(target=self.register_new_default, args=(channel_oid, root_uid)).start()
+            BACKGROUND_EXECUTOR.submit(self.register_new_default, channel_oid, root_uid)
 
     @arg_type_ensure
     def register_new_model(self, root_uid: ObjectId, model: ChannelProfileModel) -> RegisterProfileResult:
@@ -376,6 +404,7 @@ class _ProfileManager(ClearableMixin):
         if create_result.success:
             attach_outcome = self._conn.user_attach_profile(
                 create_result.model.channel_oid, root_uid, create_result.model.id)
+            self._invalidate_permissions(create_result.model.channel_oid, root_uid)
 
         return RegisterProfileResult(
             create_result.outcome, create_result.exception, create_result.model, attach_outcome)
@@ -412,7 +441,12 @@ class _ProfileManager(ClearableMixin):
         if perms and perms - self.get_user_permissions(channel_oid, root_oid):
             return UpdateOutcome.X_INSUFFICIENT_PERMISSION
 
-        return self._prof.update_profile(profile_oid, **update_dict)
+        outcome = self._prof.update_profile(profile_oid, **update_dict)
+        if outcome.is_success:
+            # Permissions of all users having the profile could be changed
+            self._invalidate_permissions(channel_oid)
+
+        return outcome
 
     def update_channel_star(self, channel_oid: ObjectId, root_oid: ObjectId, star: bool) -> bool:
         """
@@ -493,7 +527,10 @@ class _ProfileManager(ClearableMixin):
 
         # --- Attach profile
 
-        return self._conn.user_attach_profile(channel_oid, target_oid, profile_oid)
+        outcome = self._conn.user_attach_profile(channel_oid, target_oid, profile_oid)
+        self._invalidate_permissions(channel_oid, target_oid)
+
+        return outcome
 
     @arg_type_ensure
     def detach_profile_name(self, channel_oid: ObjectId, profile_name: str, user_oid: ObjectId,
@@ -554,26 +591,28 @@ class _ProfileManager(ClearableMixin):
 
         # --- Detach profile
 
-        detach_outcome = self._conn.detach_profile(profile_oid, target_oid)
+        detach_outcome = self._conn.detach_profile(profile_oid, target_oid, channel_oid=channel_oid)
+        self._invalidate_permissions(channel_oid, target_oid)
         if not detach_outcome.is_success:
             return OperationOutcome.X_DETACH_FAILED
 
         return OperationOutcome.O_COMPLETED
 
-    def mark_unavailable_async(self, channel_oid: ObjectId, root_oid: ObjectId) -> Thread:
+    def mark_unavailable_async(self, channel_oid: ObjectId, root_oid: ObjectId) -> Future:
         """
         Mark the user ``root_oid`` in the channel ``channel_oid`` unavailable asynchronously.
 
-        This method returns the :class:`Thread` of marking the user unavailable which is started already.
+        This method returns the :class:`Future` of marking the user unavailable which is submitted already.
 
         :param channel_oid: channel of the user to be marked
         :param root_oid: user to be marked unavailable
-        :return: started thread which marks the user unavailable
+        :return: future of marking the user unavailable
         """
-        thread = Thread(target=self._conn.mark_unavailable, args=(channel_oid, root_oid))
-        thread.start()
+        return BACKGROUND_EXECUTOR.submit(self._mark_unavailable, channel_oid, root_oid)
 
-        return thread
+    def _mark_unavailable(self, channel_oid: ObjectId, root_oid: ObjectId):
+        self._conn.mark_unavailable(channel_oid, root_oid)
+        self._invalidate_permissions(channel_oid, root_oid)
 
     # endregion
 
@@ -595,9 +634,10 @@ class _ProfileManager(ClearableMixin):
         if not detach_result.is_success:
             return detach_result
 
-        return OperationOutcome.O_COMPLETED \
-            if self._prof.delete_profile(profile_oid) \
-            else OperationOutcome.X_DELETE_FAILED
+        deleted = self._prof.delete_profile(profile_oid)
+        self._invalidate_permissions(channel_oid)
+
+        return OperationOutcome.O_COMPLETED if deleted else OperationOutcome.X_DELETE_FAILED
 
     # endregion
 
@@ -728,7 +768,8 @@ class _ProfileManager(ClearableMixin):
         return list(sorted(ret, key=lambda item: item.channel_data.bot_accessible, reverse=True))
 
     @arg_type_ensure
-    def get_channel_profiles(self, channel_oid: ObjectId, prof_name: Optional[str] = None) \
+    def get_channel_profiles(self, channel_oid: ObjectId, prof_name: Optional[str] = None, *,
+                             with_count: bool = True) \
             -> ExtendedCursor[ChannelProfileModel]:
         """
         Get the profiles in a channel.
@@ -740,9 +781,10 @@ class _ProfileManager(ClearableMixin):
 
         :param channel_oid: channel OID of the profiles
         :param prof_name: name of the profiles
+        :param with_count: if the count of the profiles should be available on the returned cursor
         :return: profiles of the channel
         """
-        return self._prof.get_channel_profiles(channel_oid, prof_name)
+        return self._prof.get_channel_profiles(channel_oid, prof_name, with_count=with_count)
 
     def get_profile(self, profile_oid: ObjectId) -> Optional[ChannelProfileModel]:
         """
@@ -850,11 +892,21 @@ class _ProfileManager(ClearableMixin):
         """
         Get the permissions of the user ``root_uid`` in channel ``channel_oid``.
 
+        The permissions are cached until the profiles of the user changed.
+
         :param channel_oid: channel of the user to get the permissions
         :param root_uid: user to get the permissions
         :return: a set of permissions that the user has
         """
-        return self.get_permissions(self.get_user_profiles(channel_oid, root_uid))
+        ret, generation = self._perm_cache.get((channel_oid, root_uid))
+
+        if ret is None:
+            ret = self.get_permissions(self.get_user_profiles(channel_oid, root_uid))
+            self._perm_cache.set((channel_oid, root_uid), frozenset(ret), generation)
+
+            return ret
+
+        return set(ret)
 
     def get_channel_prof_conn(self, channel_oid: Union[ObjectId, List[ObjectId]], *, available_only=False) \
             -> List[ChannelProfileConnectionModel]:
@@ -885,13 +937,14 @@ class _ProfileManager(ClearableMixin):
         """
         return {mdl.user_oid for mdl in self.get_channel_prof_conn(channel_oid, available_only=available_only)}
 
-    def get_available_connections(self) -> ExtendedCursor[ChannelProfileConnectionModel]:
+    def get_available_connections(self, *, with_count: bool = True) -> ExtendedCursor[ChannelProfileConnectionModel]:
         """
         Get the cursor which yields only the connections to the available users.
 
+        :param with_count: if the count of the connections should be available on the returned cursor
         :return: cursor of the connections to the available users
         """
-        return self._conn.get_available_connections()
+        return self._conn.get_available_connections(with_count=with_count)
 
     # endregion
 
@@ -931,6 +984,36 @@ class _ProfileManager(ClearableMixin):
 
         return ret
 
+    def get_user_permissions_dict(self, channel_oid: ObjectId) -> Dict[ObjectId, Set[ProfilePermission]]:
+        """
+        Get a ``dict`` which key is the user OID and value is their permissions in ``channel_oid``.
+
+        Permissions of all members in ``channel_oid`` are resolved using 2 queries
+        and will be stored to the permission cache.
+
+        :param channel_oid: OID of the channel to get the permissions of the members
+        :return: a `dict` containing the user OIDs pointing to their permissions
+        """
+        generation = self._perm_cache.generation()
+
+        user_prof_dict = self._conn.get_user_profile_dict(channel_oid)
+        prof_oids = set()
+        for prof_oids_user in user_prof_dict.values():
+            prof_oids |= prof_oids_user
+
+        prof_dict = self._prof.get_profile_dict(list(prof_oids))
+
+        ret = {}
+
+        for uid, prof_oids_user in user_prof_dict.items():
+            ret[uid] = self.get_permissions(
+                [prof_dict[prof_oid] for prof_oid in prof_oids_user if prof_oid in prof_dict])
+
+        self._perm_cache.set_many(
+            (((channel_oid, uid), frozenset(perms)) for uid, perms in ret.items()), generation)
+
+        return ret
+
     def get_profiles_user_oids(self, profile_oid: List[ObjectId]) -> Dict[ObjectId, Set[ObjectId]]:
         """
         Get a :class:`dict` where key is the profile OID and the value is a set of user OIDs who have th profile.
@@ -989,4 +1072,4 @@ class _ProfileManager(ClearableMixin):
     # endregion
 
 
-ProfileManager = _ProfileManager()
+ProfileManager = LazyManager(_ProfileManager)
@@ -1,14 +1,16 @@
 """Data manager for the remote control system."""
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime, timedelta
 
 from bson import ObjectId
+from pymongo import IndexModel
 
 from JellyBot.systemconfig import Bot
 from extutils.dt import now_utc_aware
 from models import RemoteControlEntryModel
 
 from ._base import BaseCollection
+from ._lazy import LazyManager
 
 __all__ = ("RemoteControlManager",)
 
@@ -20,14 +22,17 @@ class _RemoteControlManager(BaseCollection):
     collection_name = "data"
     model_class = RemoteControlEntryModel
 
-    def build_indexes(self):
-        self.create_index(
-            [(RemoteControlEntryModel.UserOid.key, 1),
-             (RemoteControlEntryModel.SourceChannelOid.key, 1)],
-            name="Entry uniqueness enforcer", unique=True)
-        self.create_index(
-            RemoteControlEntryModel.ExpiryUtc.key, name="TTL for expiry",
-            expireAfterSeconds=0)
+    @classmethod
+    def get_index_models(cls) -> List[IndexModel]:
+        return [
+            IndexModel(
+                [(RemoteControlEntryModel.UserOid.key, 1),
+                 (RemoteControlEntryModel.SourceChannelOid.key, 1)],
+                name="Entry uniqueness enforcer", unique=True),
+            IndexModel(
+                RemoteControlEntryModel.ExpiryUtc.key, name="TTL for expiry",
+                expireAfterSeconds=0),
+        ]
 
     def activate(
             self, user_oid: ObjectId, source_channel_oid: ObjectId, target_channel_oid: ObjectId,
@@ -92,4 +97,4 @@ class _RemoteControlManager(BaseCollection):
         return RemoteControlEntryModel.cast_model(ret)
 
 
-RemoteControlManager = _RemoteControlManager()
+RemoteControlManager = LazyManager(_RemoteControlManager)
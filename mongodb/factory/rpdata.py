@@ -2,6 +2,7 @@ from models import OID_KEY, PendingRepairDataModel
 from extutils.mongo import get_codec_options
 
 from ._base import BaseCollection
+from ._lazy import LazyManager
 from ._dbctrl import SINGLE_DB_NAME
 from .factory import MONGO_CLIENT
 from ..utils import BulkWriteDataHolder
@@ -30,4 +31,4 @@ class _PendingRepairDataManager:
         return BulkWriteDataHolder(col)
 
 
-PendingRepairDataManager = _PendingRepairDataManager()
+PendingRepairDataManager = LazyManager(_PendingRepairDataManager)
@@ -15,6 +15,7 @@ from mongodb.factory.results import WriteOutcome, UrlShortenResult
 from mongodb.utils import ExtendedCursor
 
 from ._base import BaseCollection
+from ._lazy import LazyManager
 
 __all__ = ("ShortUrlDataManager",)
 
@@ -153,4 +154,4 @@ class _ShortUrlDataManager(BaseCollection):
         ).is_success
 
 
-ShortUrlDataManager = _ShortUrlDataManager()
+ShortUrlDataManager = LazyManager(_ShortUrlDataManager)
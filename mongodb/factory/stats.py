@@ -1,29 +1,36 @@
 """Module of various stats data manager."""
+import time
 import traceback
-from datetime import datetime, tzinfo, timedelta
-from threading import Thread
-from typing import Any, Optional, Union, List, Dict, Set
+from collections import deque
+from datetime import datetime, tzinfo, timedelta, timezone
+from threading import Lock, Thread
+from typing import Any, Optional, Union, List, Dict, Set, Deque, Callable, Tuple
 
 import pymongo
 from bson import ObjectId
+from cachetools import TTLCache
+from pymongo import IndexModel, UpdateOne
 
 from env_var import is_testing
 from extutils import dt_to_objectid
+from extutils.bgexec import BACKGROUND_EXECUTOR
 from extutils.checker import arg_type_ensure
 from extutils.emailutils import MailSender
-from extutils.dt import now_utc_aware, localtime, TimeRange
+from extutils.dt import now_utc_aware, localtime, make_tz_aware, TimeRange
 from extutils.locales import UTC, PytzInfo
 from flags import APICommand, MessageType, BotFeature
-from JellyBot.systemconfig import Database
+from JellyBot.systemconfig import Database, Bot
 from models import (
-    APIStatisticModel, MessageRecordModel, OID_KEY, BotFeatureUsageModel,
+    APIStatisticModel, MessageRecordModel, MessageRecordHourlyModel, OID_KEY, BotFeatureUsageModel,
     HourlyIntervalAverageMessageResult, DailyMessageResult, BotFeatureUsageResult, BotFeatureHourlyAvgResult,
     HourlyResult, BotFeaturePerUserUsageResult, MemberMessageByCategoryResult, MemberDailyMessageResult,
     MemberMessageCountResult, MeanMessageResultGenerator, CountBeforeTimeResult
 )
 from mongodb.factory.results import RecordAPIStatisticsResult, WriteOutcome
-from mongodb.utils import ExtendedCursor
+from mongodb.utils import ExtendedCursor, InsertBuffer
+from mongodb.utils.logger import logger
 from ._base import BaseCollection
+from ._lazy import LazyManager
 
 __all__ = ("APIStatisticsManager", "MessageRecordStatisticsManager", "BotFeatureUsageDataManager",)
 
@@ -34,6 +41,7 @@ class _APIStatisticsManager(BaseCollection):
     database_name = DB_NAME
     collection_name = "api"
     model_class = APIStatisticModel
+    append_only = True
 
     # pylint: disable=too-many-arguments
 
@@ -63,10 +71,266 @@ class _APIStatisticsManager(BaseCollection):
     # pylint: enable=too-many-arguments
 
 
+class _ChannelMessageFrequency:
+    """
+    Sliding window of the message timestamps of a channel.
+
+    The timestamps are aggregated into the buckets of a minute.
+    Each bucket is ``[minute, message count, earliest timestamp, latest timestamp]``.
+    """
+
+    __slots__ = ("buckets", "count", "seeded",)
+
+    def __init__(self):
+        self.buckets: Deque[List] = deque()
+        self.count = 0
+        self.seeded = False
+
+    @property
+    def earliest_timestamp(self) -> Optional[float]:
+        """
+        Get the earliest timestamp in the window.
+
+        :return: earliest timestamp in the window. `None` if no messages
+        """
+        return self.buckets[0][2] if self.buckets else None
+
+    def add(self, timestamp: float):
+        """
+        Add a message sent at ``timestamp``.
+
+        :param timestamp: timestamp of the message
+        """
+        minute = int(timestamp // 60)
+
+        if self.buckets and self.buckets[-1][0] >= minute:
+            # Messages could be added slightly out of order by the different threads
+            bucket = self.buckets[-1]
+            bucket[1] += 1
+            bucket[2] = min(bucket[2], timestamp)
+            bucket[3] = max(bucket[3], timestamp)
+        else:
+            self.buckets.append([minute, 1, timestamp, timestamp])
+
+        self.count += 1
+
+    def seed(self, buckets: List[List]):
+        """
+        Prepend the buckets of the messages sent before the earliest message in the window.
+
+        :param buckets: buckets sorted by its minute (ASC)
+        """
+        for bucket in reversed(buckets):
+            self.buckets.appendleft(bucket)
+            self.count += bucket[1]
+
+        self.seeded = True
+
+    def prune(self, cutoff: float):
+        """
+        Drop the buckets which all messages are sent at or before ``cutoff``.
+
+        :param cutoff: timestamp to drop the buckets
+        """
+        while self.buckets and self.buckets[0][3] <= cutoff:
+            self.count -= self.buckets.popleft()[1]
+
+    def frequency(self) -> float:
+        """
+        Get the message frequency in the window.
+
+        The formula is the same as :meth:`_MessageRecordStatisticsManager.get_message_frequency()`.
+
+        :return: message frequency in the window
+        """
+        if not self.count:
+            return 0.0
+
+        return (self.buckets[-1][3] - self.buckets[0][2]) / 60 / self.count
+
+
+class _MessageFrequencyTracker:
+    """
+    In-memory message frequency of the channels in the last ``range_mins`` minutes.
+
+    The window of a channel is fed by every message recorded by this process.
+    The messages sent before the first message fed are loaded from the database once (cold start).
+
+    The windows also expire after ``Database.MessageStats.FrequencyExpirySeconds`` seconds
+    to reflect the messages recorded by the other processes.
+    """
+
+    def __init__(self, range_mins: int):
+        self._range_secs = range_mins * 60
+        self._cache = TTLCache(
+            maxsize=Database.MessageStats.FrequencyCacheSize, ttl=Database.MessageStats.FrequencyExpirySeconds)
+        self._lock = Lock()
+
+    def _get_window(self, channel_oid: ObjectId) -> _ChannelMessageFrequency:
+        window = self._cache.get(channel_oid)
+        if window is None:
+            window = self._cache[channel_oid] = _ChannelMessageFrequency()
+
+        return window
+
+    def add(self, channel_oid: ObjectId, timestamp: Optional[float] = None):
+        """
+        Add a message sent in ``channel_oid`` at ``timestamp``.
+
+        :param channel_oid: channel of the message
+        :param timestamp: timestamp of the message. Current time if not provided
+        """
+        with self._lock:
+            self._get_window(channel_oid).add(timestamp or time.time())
+
+    def get(self, channel_oid: ObjectId, loader: Callable[[ObjectId, float, float], List[List]]) -> float:
+        """
+        Get the message frequency of ``channel_oid``.
+
+        ``loader`` will be called on cold start to load the buckets of the messages
+        sent between the start of the window and the earliest message in memory.
+
+        :param channel_oid: channel to get the message frequency
+        :param loader: function to load the buckets with channel OID, start and end timestamp
+        :return: message frequency of `channel_oid`
+        """
+        now = time.time()
+        cutoff = now - self._range_secs
+
+        with self._lock:
+            window = self._get_window(channel_oid)
+            seeded = window.seeded
+            seed_until = window.earliest_timestamp or now
+
+        if not seeded:
+            buckets = loader(channel_oid, cutoff, seed_until)
+
+            with self._lock:
+                if not window.seeded:
+                    window.seed(buckets)
+
+        with self._lock:
+            window.prune(cutoff)
+
+            return window.frequency()
+
+    def clear(self):
+        """Clear all the windows."""
+        with self._lock:
+            self._cache.clear()
+
+
+def _floor_hour(dt: datetime) -> datetime:
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(dt: datetime) -> datetime:
+    floored = _floor_hour(dt)
+
+    return floored if floored == dt else floored + timedelta(hours=1)
+
+
+class _MessageRecordHourlyManager(BaseCollection):
+    """
+    Class for managing the hourly message count (rollup of the message records).
+
+    The hourly counts are filled by ``_MessageRecordStatisticsManager.catch_up_hourly_counts()``
+    in the order of the hour, so all hours before the latest hour in this collection are complete.
+    """
+
+    database_name = DB_NAME
+    collection_name = "msg-hr"
+    model_class = MessageRecordHourlyModel
+
+    @classmethod
+    def get_index_models(cls) -> List[IndexModel]:
+        return [
+            IndexModel(
+                [(MessageRecordHourlyModel.Hour.key, 1),
+                 (MessageRecordHourlyModel.ChannelOid.key, 1),
+                 (MessageRecordHourlyModel.UserRootOid.key, 1),
+                 (MessageRecordHourlyModel.MessageType.key, 1)],
+                name="Hourly Count Identity", unique=True),
+            IndexModel(
+                [(MessageRecordHourlyModel.ChannelOid.key, 1), (MessageRecordHourlyModel.Hour.key, 1)],
+                name="Channel Hourly Count"),
+        ]
+
+    def get_complete_until(self) -> Optional[datetime]:
+        """
+        Get the hour which the hourly counts before it are complete.
+
+        The latest hour in the collection could be partially filled, so the latest hour itself is returned.
+
+        :return: tz-aware hour which the hourly counts before it are complete. `None` if no hourly counts
+        """
+        latest = self.find_one({}, projection={MessageRecordHourlyModel.Hour.key: 1},
+                               sort=[(MessageRecordHourlyModel.Hour.key, pymongo.DESCENDING)])
+
+        if not latest:
+            return None
+
+        return make_tz_aware(latest[MessageRecordHourlyModel.Hour.key], timezone.utc)
+
+    def upsert_counts(self, counts: List[dict]):
+        """
+        Set the hourly counts.
+
+        ``counts`` should be sorted by the hour (ASC), so the hourly counts are written in the order of the hour.
+
+        :param counts: hourly counts to be set
+        """
+        if not counts:
+            return
+
+        self.bulk_write([
+            UpdateOne({key: value for key, value in count.items() if key != MessageRecordHourlyModel.Count.key},
+                      {"$set": {MessageRecordHourlyModel.Count.key: count[MessageRecordHourlyModel.Count.key]}},
+                      upsert=True)
+            for count in counts
+        ], ordered=True)
+
+
 class _MessageRecordStatisticsManager(BaseCollection):
     database_name = DB_NAME
     collection_name = "msg"
     model_class = MessageRecordModel
+    append_only = True
+
+    def __init__(self):
+        super().__init__()
+
+        self._buffer = InsertBuffer(
+            self, Database.MessageStats.InsertBatchSize, Database.MessageStats.InsertFlushIntervalSeconds,
+            Database.MessageStats.InsertBufferMaxSize
+        )
+        self._frequency = _MessageFrequencyTracker(Bot.Timer.MessageFrequencyRangeMin)
+        self._hourly = _MessageRecordHourlyManager()
+
+    def on_init_async(self):
+        super().on_init_async()
+
+        if not is_testing():
+            Thread(target=self._catch_up_hourly_counts_loop, name="MessageHourlyCount", daemon=True).start()
+
+    def clear(self):
+        self._buffer.flush()
+        super().clear()
+        self._frequency.clear()
+        self._hourly.clear()
+
+    def flush_buffered_messages(self):
+        """Insert the message records buffered by ``record_message_async()`` into the database."""
+        self._buffer.flush()
+
+    @staticmethod
+    def _truncate_content(message_content: Any) -> Any:
+        # Avoid casting `None` to `str`
+        if message_content:
+            # Truncate message content
+            message_content = str(message_content)[:Database.MessageStats.MaxContentCharacter]
+
+        return message_content
 
     # pylint: disable=too-many-arguments
 
@@ -84,10 +348,7 @@ class _MessageRecordStatisticsManager(BaseCollection):
         :param proc_time_secs: message processing time
         :return: outcome of the recording process
         """
-        # Avoid casting `None` to `str`
-        if message_content:
-            # Truncate message content
-            message_content = str(message_content)[:Database.MessageStats.MaxContentCharacter]
+        message_content = self._truncate_content(message_content)
 
         _, outcome, _ = self.insert_one_data(
             ChannelOid=channel_oid, UserRootOid=user_root_oid, MessageType=message_type,
@@ -103,6 +364,9 @@ class _MessageRecordStatisticsManager(BaseCollection):
         """
         Same functionality as ``record_message()`` except that this method executes asynchronously.
 
+        The record will be buffered and inserted in batch.
+        Timestamp of the record is the time of calling this method.
+
         :param channel_oid: channel of the message
         :param user_root_oid: user who sent the message
         :param message_type: type of the message
@@ -111,16 +375,45 @@ class _MessageRecordStatisticsManager(BaseCollection):
         """
         if is_testing():
             # No async if testing
+            self._frequency.add(channel_oid)
             self.record_message(channel_oid, user_root_oid, message_type, message_content, proc_time_secs)
-        else:
-            Thread(
-                target=self.record_message,
-                args=(channel_oid, user_root_oid, message_type, message_content, proc_time_secs)).start()
+            return
+
+        self.record_message_buffered(channel_oid, user_root_oid, message_type, message_content, proc_time_secs)
+
+    @arg_type_ensure
+    def record_message_buffered(self, channel_oid: ObjectId, user_root_oid: Optional[ObjectId],
+                                message_type: MessageType, message_content: Any,
+                                proc_time_secs: float):
+        """
+        Buffer a message record to be inserted in batch. Used by ``record_message_async()`` if not testing.
+
+        Buffered records could be inserted immediately by calling ``flush_buffered_messages()``.
+
+        :param channel_oid: channel of the message
+        :param user_root_oid: user who sent the message
+        :param message_type: type of the message
+        :param message_content: content of the message
+        :param proc_time_secs: message processing time
+        """
+        self._frequency.add(channel_oid)
+
+        try:
+            model = MessageRecordModel(
+                Id=ObjectId(), ChannelOid=channel_oid, UserRootOid=user_root_oid, MessageType=message_type,
+                MessageContent=self._truncate_content(message_content), ProcessTimeSecs=proc_time_secs
+            )
+        except Exception:  # pylint: disable=broad-except
+            logger.logger.exception("Failed to construct the message record to be buffered.")
+            return
+
+        self._buffer.add(model.to_json())
 
     # pylint: enable=too-many-arguments
 
     @arg_type_ensure
-    def get_recent_messages(self, channel_oid: ObjectId, *, limit: Optional[int] = None, skip: Optional[int] = None) \
+    def get_recent_messages(self, channel_oid: ObjectId, *, limit: Optional[int] = None, skip: Optional[int] = None,
+                            with_count: bool = True) \
             -> ExtendedCursor[MessageRecordModel]:
         """
         Get recent messages in the ``channel_oid``.
@@ -132,6 +425,7 @@ class _MessageRecordStatisticsManager(BaseCollection):
         :param channel_oid: channel of the returned messages
         :param limit: max count of the results
         :param skip: count of the messages to skip
+        :param with_count: if the count of the messages should be available on the returned cursor
         :return: a cursor yielding messages in `channel_oid` from the most recent one
         """
         addl_kwargs = {}
@@ -145,7 +439,7 @@ class _MessageRecordStatisticsManager(BaseCollection):
             addl_kwargs["skip"] = skip
 
         return self.find_cursor_with_count({MessageRecordModel.ChannelOid.key: channel_oid},
-                                           sort=[(OID_KEY, pymongo.DESCENDING)], **addl_kwargs)
+                                           sort=[(OID_KEY, pymongo.DESCENDING)], with_count=with_count, **addl_kwargs)
 
     @arg_type_ensure
     def get_message_frequency(self, channel_oid: ObjectId, range_mins: Union[float, int, None] = None) -> float:
@@ -183,6 +477,260 @@ class _MessageRecordStatisticsManager(BaseCollection):
 
         return range_mins / rct_msg_count
 
+    def _load_message_frequency_buckets(self, channel_oid: ObjectId, start: float, end: float) -> List[List]:
+        """
+        Load the minute buckets of the messages in ``channel_oid`` sent between ``start`` and ``end``.
+
+        :param channel_oid: channel of the messages
+        :param start: start timestamp (exclusive)
+        :param end: end timestamp (exclusive)
+        :return: buckets sorted by its minute (ASC)
+        """
+        pipeline = [
+            {"$match": {
+                MessageRecordModel.ChannelOid.key: channel_oid,
+                OID_KEY: {
+                    "$gt": ObjectId.from_datetime(datetime.utcfromtimestamp(start)),
+                    "$lt": ObjectId.from_datetime(datetime.utcfromtimestamp(end))
+                }
+            }},
+            {"$group": {
+                "_id": {"$dateToString": {"date": "$_id", "format": "%Y-%m-%dT%H:%M"}},
+                "count": {"$sum": 1},
+                "earliest": {"$min": "$_id"},
+                "latest": {"$max": "$_id"}
+            }},
+            {"$sort": {"earliest": pymongo.ASCENDING}}
+        ]
+
+        ret = []
+
+        for data in self.aggregate(pipeline):
+            earliest = data["earliest"].generation_time.timestamp()
+            latest = data["latest"].generation_time.timestamp()
+
+            ret.append([int(earliest // 60), data["count"], earliest, latest])
+
+        return ret
+
+    @arg_type_ensure
+    def get_recent_message_frequency(self, channel_oid: ObjectId) -> float:
+        """
+        Get the message frequency of the last ``Bot.Timer.MessageFrequencyRangeMin`` minutes
+        with the same formula as ``get_message_frequency()``.
+
+        The frequency is calculated in memory using the messages recorded by ``record_message_async()``.
+
+        The database will be queried only on the first call of a channel
+        to load the messages sent before this process started recording.
+
+        :param channel_oid: message of the channel
+        :return: sec / message
+        """
+        return self._frequency.get(channel_oid, self._load_message_frequency_buckets)
+
+    def _catch_up_hourly_counts_loop(self):
+        while True:
+            try:
+                self.catch_up_hourly_counts()
+            except Exception:  # pylint: disable=broad-except
+                logger.logger.exception("Failed to catch up the hourly message counts.")
+
+            time.sleep(Database.MessageStats.HourlyCatchUpIntervalSeconds)
+
+    def catch_up_hourly_counts(self, until: Optional[datetime] = None) -> int:
+        """
+        Aggregate the message records into the hourly counts from where the hourly counts are complete
+        until the hour of ``until``.
+
+        ``until`` will be the current time minus ``Database.MessageStats.HourlyCatchUpLagSeconds`` if not given,
+        so the message records inserted with a delay will not be missed.
+
+        :param until: hourly counts will be aggregated until the hour of this (exclusive)
+        :return: count of the hourly counts written
+        """
+        until = _floor_hour(
+            make_tz_aware(until, timezone.utc) if until
+            else now_utc_aware() - timedelta(seconds=Database.MessageStats.HourlyCatchUpLagSeconds)
+        )
+
+        start = self._hourly.get_complete_until()
+        if not start:
+            earliest = self.find_one({}, projection={OID_KEY: 1}, sort=[(OID_KEY, pymongo.ASCENDING)])
+            if not earliest:
+                return 0
+
+            start = _floor_hour(earliest[OID_KEY].generation_time)
+
+        written = 0
+
+        while start < until:
+            end = min(start + timedelta(hours=Database.MessageStats.HourlyCatchUpChunkHours), until)
+
+            pipeline = [
+                {"$match": {OID_KEY: {"$gte": ObjectId.from_datetime(start), "$lt": ObjectId.from_datetime(end)}}},
+                {"$group": {
+                    OID_KEY: {
+                        MessageRecordHourlyModel.ChannelOid.key: "$" + MessageRecordModel.ChannelOid.key,
+                        MessageRecordHourlyModel.UserRootOid.key: "$" + MessageRecordModel.UserRootOid.key,
+                        MessageRecordHourlyModel.MessageType.key: "$" + MessageRecordModel.MessageType.key,
+                        MessageRecordHourlyModel.Hour.key: {
+                            "$dateFromParts": {
+                                "year": {"$year": "$_id"},
+                                "month": {"$month": "$_id"},
+                                "day": {"$dayOfMonth": "$_id"},
+                                "hour": {"$hour": "$_id"}
+                            }
+                        }
+                    },
+                    MessageRecordHourlyModel.Count.key: {"$sum": 1}
+                }},
+                {"$sort": {OID_KEY + "." + MessageRecordHourlyModel.Hour.key: pymongo.ASCENDING}}
+            ]
+
+            count_key = MessageRecordHourlyModel.Count.key
+            counts = [dict(data[OID_KEY], **{count_key: data[count_key]}) for data in self.aggregate(pipeline)]
+            self._hourly.upsert_counts(counts)
+
+            written += len(counts)
+            start = end
+
+        return written
+
+    def _split_by_hourly_counts(self, match_d: dict, tzinfo_: Optional[tzinfo]) \
+            -> Tuple[Optional[dict], Optional[dict], Optional[Tuple[Optional[datetime], datetime]]]:
+        """
+        Split ``match_d`` into the filter of the message records and the filter of the hourly counts.
+
+        The hourly counts are used for the complete hours in the time range of ``match_d``.
+        The message records are used for the rest, which are the partial hours at the both ends of the time range
+        and the hours not yet aggregated (including the current hour).
+
+        The hourly counts will not be used if the UTC offset of ``tzinfo_`` is not in whole hours,
+        because the hourly counts cannot be separated correctly by the local date or hour.
+
+        :param match_d: filter of the message records containing the time range
+        :param tzinfo_: timezone to be used to separate the data
+        :return: filter of the message records (`None` if nothing to get), filter of the hourly counts
+            (`None` if not to be used) and the time range covered by the hourly counts
+        """
+        if tzinfo_ and localtime(now_utc_aware(), tzinfo_).utcoffset() % timedelta(hours=1):
+            return match_d, None, None
+
+        complete_until = self._hourly.get_complete_until()
+        if not complete_until:
+            return match_d, None, None
+
+        others = {key: value for key, value in match_d.items() if key != OID_KEY}
+        id_filter = match_d.get(OID_KEY, {})
+        lower_oid = id_filter.get("$gte")
+        upper_oid = id_filter.get("$lte")
+
+        hourly_start = _ceil_hour(lower_oid.generation_time) if lower_oid else None
+        hourly_end = min(_floor_hour(upper_oid.generation_time), complete_until) if upper_oid else complete_until
+
+        if hourly_start and hourly_start >= hourly_end:
+            return match_d, None, None
+
+        # Message records before and after the range of the hourly counts
+        raw_ranges = []
+        if lower_oid and lower_oid.generation_time < hourly_start:
+            raw_ranges.append({OID_KEY: {"$gte": lower_oid, "$lt": ObjectId.from_datetime(hourly_start)}})
+        if not upper_oid or upper_oid.generation_time >= hourly_end:
+            tail = {"$gte": ObjectId.from_datetime(hourly_end)}
+            if upper_oid:
+                tail["$lte"] = upper_oid
+            raw_ranges.append({OID_KEY: tail})
+
+        raw_match = dict(others, **{"$or": raw_ranges}) if raw_ranges else None
+
+        hour_filter = {"$lt": hourly_end}
+        if hourly_start:
+            hour_filter["$gte"] = hourly_start
+        hourly_match = dict(others, **{MessageRecordHourlyModel.Hour.key: hour_filter})
+
+        return raw_match, hourly_match, (hourly_start, hourly_end)
+
+    def _aggregate_count(self, raw_match: Optional[dict], hourly_match: Optional[dict],
+                         group_id: Callable[[str], dict], count_key: str, *, sort: bool = False,
+                         raw_stages: Optional[List[dict]] = None, hourly_stages: Optional[List[dict]] = None) \
+            -> List[dict]:
+        """
+        Count the messages grouped by ``group_id`` from both the message records and the hourly counts,
+        then merge the results of the same group.
+
+        :param raw_match: filter of the message records (`None` to not to get from the message records)
+        :param hourly_match: filter of the hourly counts (`None` to not to get from the hourly counts)
+        :param group_id: function to get the `_id` expression of `$group` by the field path of the timestamp
+        :param count_key: key of the count in the result
+        :param sort: if the results should be sorted by `_id`
+        :param raw_stages: additional stages to be executed on the message records before `$group`
+        :param hourly_stages: additional stages to be executed on the hourly counts before `$group`
+        :return: aggregated results
+        """
+        results = []
+
+        if raw_match:
+            results.extend(self.aggregate(
+                [{"$match": raw_match}]
+                + (raw_stages or [])
+                + [{"$group": {OID_KEY: group_id("$" + OID_KEY), count_key: {"$sum": 1}}}]
+            ))
+        if hourly_match:
+            results.extend(self._hourly.aggregate(
+                [{"$match": hourly_match}]
+                + (hourly_stages or [])
+                + [{"$group": {
+                    OID_KEY: group_id("$" + MessageRecordHourlyModel.Hour.key),
+                    count_key: {"$sum": "$" + MessageRecordHourlyModel.Count.key}
+                }}]
+            ))
+
+        merged: Dict[tuple, dict] = {}
+
+        for data in results:
+            key = tuple(data[OID_KEY].items())
+
+            if key in merged:
+                merged[key][count_key] += data[count_key]
+            else:
+                merged[key] = data
+
+        ret = list(merged.values())
+        if sort:
+            ret.sort(key=lambda data: tuple(data[OID_KEY].values()))
+
+        return ret
+
+    @staticmethod
+    def _get_daily_hour_windows(start: datetime, end: datetime, tzinfo_: tzinfo, hour: int) \
+            -> Optional[List[dict]]:
+        """
+        Get the filters of the message records in the local ``hour`` of each day between ``start`` and ``end``.
+
+        :param start: start of the time range
+        :param end: end of the time range (exclusive)
+        :param tzinfo_: timezone of the local hour
+        :param hour: local hour to get the filters
+        :return: filters of each local hour. `None` if the count exceeds `HourlyPartialWindowMaxCount`
+        """
+        windows = []
+        current = start
+
+        while current < end:
+            if localtime(current, tzinfo_).hour != hour:
+                current += timedelta(hours=1)
+                continue
+
+            if len(windows) >= Database.MessageStats.HourlyPartialWindowMaxCount:
+                return None
+
+            windows.append({OID_KEY: {"$gte": ObjectId.from_datetime(current),
+                                      "$lt": ObjectId.from_datetime(current + timedelta(hours=1))}})
+            current += timedelta(hours=23)
+
+        return windows
+
     def get_user_last_message_ts(self, channel_oid: ObjectId, user_oids: List[ObjectId], tzinfo_: tzinfo = None) \
             -> Dict[ObjectId, datetime]:
         """
@@ -378,18 +926,16 @@ class _MessageRecordStatisticsManager(BaseCollection):
         match_d = self._channel_oids_filter(channel_oids)
         self.attach_time_range(match_d, hours_within=hours_within, start=start, end=end, tzinfo_=tzinfo_)
 
-        aggr_pipeline = [
-            {"$match": match_d},
-            {"$group": {
-                OID_KEY: {
-                    MemberMessageByCategoryResult.KEY_MEMBER_ID: "$" + MessageRecordModel.UserRootOid.key,
-                    MemberMessageByCategoryResult.KEY_CATEGORY: "$" + MessageRecordModel.MessageType.key
-                },
-                MemberMessageByCategoryResult.KEY_COUNT: {"$sum": 1}
-            }}
-        ]
+        raw_match, hourly_match, _ = self._split_by_hourly_counts(match_d, tzinfo_)
 
-        return MemberMessageByCategoryResult(list(self.aggregate(aggr_pipeline)))
+        return MemberMessageByCategoryResult(self._aggregate_count(
+            raw_match, hourly_match,
+            lambda _: {
+                MemberMessageByCategoryResult.KEY_MEMBER_ID: "$" + MessageRecordModel.UserRootOid.key,
+                MemberMessageByCategoryResult.KEY_CATEGORY: "$" + MessageRecordModel.MessageType.key
+            },
+            MemberMessageByCategoryResult.KEY_COUNT
+        ))
 
     def hourly_interval_message_count(self, channel_oids: Union[ObjectId, List[ObjectId]], *,
                                       tzinfo_: PytzInfo = UTC.to_tzinfo(), hours_within: Optional[int] = None,
@@ -408,22 +954,20 @@ class _MessageRecordStatisticsManager(BaseCollection):
         match_d = self._channel_oids_filter(channel_oids)
         self.attach_time_range(match_d, hours_within=hours_within, start=start, end=end, tzinfo_=tzinfo_)
 
-        pipeline = [
-            {"$match": match_d},
-            {"$group": {
-                "_id": {
+        raw_match, hourly_match, _ = self._split_by_hourly_counts(match_d, tzinfo_)
+
+        return HourlyIntervalAverageMessageResult(
+            self._aggregate_count(
+                raw_match, hourly_match,
+                lambda ts: {
                     HourlyIntervalAverageMessageResult.KEY_HR:
-                        {"$hour": {"date": "$_id", "timezone": tzinfo_.tzidentifier}},
+                        {"$hour": {"date": ts, "timezone": tzinfo_.tzidentifier}},
                     HourlyIntervalAverageMessageResult.KEY_CATEGORY:
                         "$" + MessageRecordModel.MessageType.key
                 },
-                HourlyIntervalAverageMessageResult.KEY_COUNT: {"$sum": 1}
-            }},
-            {"$sort": {"_id": pymongo.ASCENDING}}
-        ]
-
-        return HourlyIntervalAverageMessageResult(
-            list(self.aggregate(pipeline)),
+                HourlyIntervalAverageMessageResult.KEY_COUNT,
+                sort=True
+            ),
             HourlyResult.data_days_collected(self, match_d, hr_range=hours_within, start=start, end=end),
             end_time=end
         )
@@ -444,31 +988,30 @@ class _MessageRecordStatisticsManager(BaseCollection):
         """
         match_d = self._channel_oids_filter(channel_oids)
         self.attach_time_range(match_d, hours_within=hours_within, start=start, end=end, tzinfo_=tzinfo_)
-        pipeline = [
-            {"$match": match_d},
-            {"$group": {
-                "_id": {
+
+        raw_match, hourly_match, _ = self._split_by_hourly_counts(match_d, tzinfo_)
+
+        return DailyMessageResult(
+            self._aggregate_count(
+                raw_match, hourly_match,
+                lambda ts: {
                     DailyMessageResult.KEY_DATE: {
                         "$dateToString": {
-                            "date": "$_id",
+                            "date": ts,
                             "format": DailyMessageResult.FMT_DATE,
                             "timezone": tzinfo_.tzidentifier
                         }
                     },
                     DailyMessageResult.KEY_HOUR: {
                         "$hour": {
-                            "date": "$_id",
+                            "date": ts,
                             "timezone": tzinfo_.tzidentifier
                         }
                     }
                 },
-                DailyMessageResult.KEY_COUNT: {"$sum": 1}
-            }},
-            {"$sort": {"_id": pymongo.ASCENDING}}
-        ]
-
-        return DailyMessageResult(
-            list(self.aggregate(pipeline)),
+                DailyMessageResult.KEY_COUNT,
+                sort=True
+            ),
             HourlyResult.data_days_collected(self, match_d, hr_range=hours_within, start=start, end=end),
             tzinfo_,
             start=start, end=end)
@@ -500,25 +1043,23 @@ class _MessageRecordStatisticsManager(BaseCollection):
 
         self.attach_time_range(match_d, trange=trange)
 
-        pipeline = [
-            {"$match": match_d},
-            {"$group": {
-                "_id": {
+        raw_match, hourly_match, _ = self._split_by_hourly_counts(match_d, tzinfo_)
+
+        return MeanMessageResultGenerator(
+            self._aggregate_count(
+                raw_match, hourly_match,
+                lambda ts: {
                     MeanMessageResultGenerator.KEY_DATE: {
                         "$dateToString": {
-                            "date": "$_id",
+                            "date": ts,
                             "format": MeanMessageResultGenerator.FMT_DATE,
                             "timezone": tzinfo_.tzidentifier
                         }
                     }
                 },
-                MeanMessageResultGenerator.KEY_COUNT: {"$sum": 1}
-            }},
-            {"$sort": {"_id": pymongo.ASCENDING}}
-        ]
-
-        return MeanMessageResultGenerator(
-            list(self.aggregate(pipeline)),
+                MeanMessageResultGenerator.KEY_COUNT,
+                sort=True
+            ),
             HourlyResult.data_days_collected(self, match_d, hr_range=hours_within, start=trange.start_org, end=end),
             tzinfo_,
             trange=trange, max_mean_days=max_mean_days)
@@ -545,37 +1086,72 @@ class _MessageRecordStatisticsManager(BaseCollection):
 
         self.attach_time_range(match_d, trange=trange)
 
-        pipeline = [
-            {"$match": match_d},
-            {"$project": {
-                CountBeforeTimeResult.KEY_SEC_OF_DAY: {
-                    "$add": [
-                        {"$multiply": [{"$hour": {"date": "$_id", "timezone": tzinfo_.tzidentifier}}, 3600]},
-                        {"$multiply": [{"$minute": {"date": "$_id", "timezone": tzinfo_.tzidentifier}}, 60]},
-                        {"$second": {"date": "$_id", "timezone": tzinfo_.tzidentifier}}
-                    ]
-                }
-            }},
-            {"$match": {
-                CountBeforeTimeResult.KEY_SEC_OF_DAY: {"$lt": trange.end_time_seconds}
-            }},
-            {"$group": {
-                "_id": {
+        raw_match, hourly_match, hourly_range = self._split_by_hourly_counts(match_d, tzinfo_)
+
+        # Hour containing the end time of each day is only partially counted,
+        # so it is counted from the message records instead
+        end_hour, end_secs_in_hour = divmod(trange.end_time_seconds, 3600)
+        if hourly_match and end_secs_in_hour:
+            hourly_start, hourly_end = hourly_range
+            if not hourly_start:
+                earliest = self._hourly.find_one(hourly_match, sort=[(MessageRecordHourlyModel.Hour.key, 1)])
+                hourly_start = make_tz_aware(earliest[MessageRecordHourlyModel.Hour.key], timezone.utc) \
+                    if earliest else hourly_end
+
+            partial_windows = self._get_daily_hour_windows(hourly_start, hourly_end, tzinfo_, end_hour)
+
+            if partial_windows is None:
+                raw_match, hourly_match = match_d, None
+            elif partial_windows:
+                if not raw_match:
+                    raw_match = {key: value for key, value in hourly_match.items()
+                                 if key != MessageRecordHourlyModel.Hour.key}
+                    raw_match["$or"] = []
+
+                raw_match["$or"].extend(partial_windows)
+
+        return CountBeforeTimeResult(
+            self._aggregate_count(
+                raw_match, hourly_match,
+                lambda ts: {
                     CountBeforeTimeResult.KEY_DATE: {
                         "$dateToString": {
-                            "date": "$_id",
+                            "date": ts,
                             "format": CountBeforeTimeResult.FMT_DATE,
                             "timezone": tzinfo_.tzidentifier
                         }
                     }
                 },
-                CountBeforeTimeResult.KEY_COUNT: {"$sum": 1}
-            }},
-            {"$sort": {"_id": pymongo.ASCENDING}}
-        ]
-
-        return CountBeforeTimeResult(
-            list(self.aggregate(pipeline)),
+                CountBeforeTimeResult.KEY_COUNT,
+                sort=True,
+                raw_stages=[
+                    {"$project": {
+                        CountBeforeTimeResult.KEY_SEC_OF_DAY: {
+                            "$add": [
+                                {"$multiply": [{"$hour": {"date": "$_id", "timezone": tzinfo_.tzidentifier}}, 3600]},
+                                {"$multiply": [{"$minute": {"date": "$_id", "timezone": tzinfo_.tzidentifier}}, 60]},
+                                {"$second": {"date": "$_id", "timezone": tzinfo_.tzidentifier}}
+                            ]
+                        }
+                    }},
+                    {"$match": {
+                        CountBeforeTimeResult.KEY_SEC_OF_DAY: {"$lt": trange.end_time_seconds}
+                    }}
+                ],
+                hourly_stages=[
+                    {"$match": {
+                        "$expr": {
+                            "$lt": [
+                                {"$hour": {
+                                    "date": "$" + MessageRecordHourlyModel.Hour.key,
+                                    "timezone": tzinfo_.tzidentifier
+                                }},
+                                end_hour
+                            ]
+                        }
+                    }}
+                ]
+            ),
             HourlyResult.data_days_collected(self, match_d, hr_range=hours_within, start=trange.start_org, end=end),
             tzinfo_,
             trange=trange)
@@ -600,25 +1176,23 @@ class _MessageRecordStatisticsManager(BaseCollection):
 
         self.attach_time_range(match_d, trange=trange)
 
-        pipeline = [
-            {"$match": match_d},
-            {"$group": {
-                "_id": {
+        raw_match, hourly_match, _ = self._split_by_hourly_counts(match_d, tzinfo_)
+
+        return MemberDailyMessageResult(
+            self._aggregate_count(
+                raw_match, hourly_match,
+                lambda ts: {
                     MemberDailyMessageResult.KEY_DATE: {
                         "$dateToString": {
-                            "date": "$_id",
+                            "date": ts,
                             "format": MemberDailyMessageResult.FMT_DATE,
                             "timezone": tzinfo_.tzidentifier
                         }
                     },
                     MemberDailyMessageResult.KEY_MEMBER: "$" + MessageRecordModel.UserRootOid.key
                 },
-                MemberDailyMessageResult.KEY_COUNT: {"$sum": 1}
-            }}
-        ]
-
-        return MemberDailyMessageResult(
-            list(self.aggregate(pipeline)),
+                MemberDailyMessageResult.KEY_COUNT
+            ),
             HourlyResult.data_days_collected(self, match_d, hr_range=hours_within, start=start, end=end),
             tzinfo_,
             trange=trange)
@@ -628,6 +1202,7 @@ class _BotFeatureUsageDataManager(BaseCollection):
     database_name = DB_NAME
     collection_name = "bot"
     model_class = BotFeatureUsageModel
+    append_only = True
 
     @arg_type_ensure
     def record_usage(self, feature_used: BotFeature, channel_oid: ObjectId, root_oid: ObjectId):
@@ -665,7 +1240,7 @@ class _BotFeatureUsageDataManager(BaseCollection):
         if is_testing():
             self.record_usage(feature_used, channel_oid, root_oid)
         else:
-            Thread(target=self.record_usage, args=(feature_used, channel_oid, root_oid)).start()
+            BACKGROUND_EXECUTOR.submit(self.record_usage, feature_used, channel_oid, root_oid)
 
     # Statistics
 
@@ -788,6 +1363,6 @@ class _BotFeatureUsageDataManager(BaseCollection):
         return BotFeaturePerUserUsageResult(list(self.aggregate(pipeline)))
 
 
-APIStatisticsManager = _APIStatisticsManager()
-MessageRecordStatisticsManager = _MessageRecordStatisticsManager()
-BotFeatureUsageDataManager = _BotFeatureUsageDataManager()
+APIStatisticsManager = LazyManager(_APIStatisticsManager)
+MessageRecordStatisticsManager = LazyManager(_MessageRecordStatisticsManager)
+BotFeatureUsageDataManager = LazyManager(_BotFeatureUsageDataManager)
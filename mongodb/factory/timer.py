@@ -1,9 +1,15 @@
 """Data manager for the timers."""
+import heapq
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Optional, List
+from threading import Lock
+import time
+from typing import Optional, List, Dict, Tuple, Callable
 
 import pymongo
 from bson import ObjectId
+from pymongo import IndexModel
+from cachetools import TTLCache
 
 from models import TimerModel, TimerListResult, OID_KEY
 from mongodb.factory.results import WriteOutcome
@@ -13,20 +19,289 @@ from extutils.dt import is_tz_naive, now_utc_aware, make_tz_aware
 from JellyBot.systemconfig import Bot
 
 from ._base import BaseCollection
+from ._lazy import LazyManager
 
 __all__ = ("TimerManager",)
 
 DB_NAME = "timer"
 
 
+@dataclass
+class _ChannelTimerSchedule:
+    """
+    Timers of a channel waiting to be notified.
+
+    ``notify`` and ``time_up`` are min-heaps of ``(target time, timer OID)``.
+
+    A heap entry is alive only if its timer OID is in ``timers``, so the deleted timers can be dropped lazily.
+    """
+
+    timers: Dict[ObjectId, TimerModel] = field(default_factory=dict)
+    notify: List[Tuple[datetime, ObjectId]] = field(default_factory=list)
+    time_up: List[Tuple[datetime, ObjectId]] = field(default_factory=list)
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    def add(self, model: TimerModel):
+        """
+        Add ``model`` to the schedule.
+
+        :param model: timer to be added
+        """
+        self.timers[model.id] = model
+
+        if not model.notified:
+            heapq.heappush(self.notify, (model.target_time, model.id))
+        if not model.notified_expired:
+            heapq.heappush(self.time_up, (model.target_time, model.id))
+
+    def next_target_time(self) -> Optional[datetime]:
+        """
+        Get the earliest target time of the timers waiting to be notified.
+
+        :return: earliest target time of the timers waiting to be notified. `None` if nothing to be notified
+        """
+        for heap in (self.notify, self.time_up):
+            while heap and heap[0][1] not in self.timers:
+                heapq.heappop(heap)
+
+        return min([heap[0][0] for heap in (self.notify, self.time_up) if heap], default=None)
+
+    def pop_until(self, heap: List[Tuple[datetime, ObjectId]], until: datetime) -> List[TimerModel]:
+        """
+        Pop all alive timers in ``heap`` which target time is before ``until``.
+
+        :param heap: heap to pop the timers
+        :param until: timers which target time is before this will be popped
+        :return: list of the popped timers sorted by its target time (ASC)
+        """
+        ret = []
+
+        while heap and heap[0][0] < until:
+            _, timer_oid = heapq.heappop(heap)
+
+            model = self.timers.get(timer_oid)
+            if model:
+                ret.append(model)
+
+        return ret
+
+
+class _TimerSchedule:
+    """
+    In-memory schedule of the timers waiting to be notified, grouped by channel.
+
+    Checking if a channel has any timers to be notified is an in-memory lookup
+    which does not query the database.
+
+    The schedule of a channel is loaded lazily and kept in sync by the insertion and the deletion of the timers.
+
+    The schedules also expire after ``Bot.Timer.ScheduleExpirySeconds`` seconds
+    to reflect the changes made by the other processes.
+    A schedule having nothing to be notified is reloaded
+    if it was loaded more than ``Bot.Timer.ScheduleMissReloadSeconds`` seconds ago,
+    so the timers added by the other processes are noticed sooner.
+
+    Popped timers should be claimed in the database before being notified,
+    because the other processes may hold the same timers in their schedules.
+    """
+
+    def __init__(self):
+        self._cache = TTLCache(maxsize=Bot.Timer.ScheduleCacheSize, ttl=Bot.Timer.ScheduleExpirySeconds)
+        self._lock = Lock()
+        self._generation = 0
+
+    def _get(self, channel_oid: ObjectId, loader: Callable[[ObjectId], List[TimerModel]]) -> _ChannelTimerSchedule:
+        with self._lock:
+            ret = self._cache.get(channel_oid)
+            generation = self._generation
+
+        if ret is not None:
+            return ret
+
+        ret = _ChannelTimerSchedule()
+        for model in loader(channel_oid):
+            ret.add(model)
+
+        with self._lock:
+            # Another thread may have loaded the schedule or the timers may have changed during the loading
+            if channel_oid in self._cache:
+                return self._cache[channel_oid]
+
+            if generation == self._generation:
+                self._cache[channel_oid] = ret
+
+        return ret
+
+    def next_target_time(self, channel_oid: ObjectId, loader: Callable[[ObjectId], List[TimerModel]]) \
+            -> Optional[datetime]:
+        """
+        Get the earliest target time of the timers waiting to be notified in ``channel_oid``.
+
+        :param channel_oid: channel of the timers
+        :param loader: function to load the timers of a channel which are waiting to be notified
+        :return: earliest target time of the timers waiting to be notified. `None` if nothing to be notified
+        """
+        schedule = self._get(channel_oid, loader)
+
+        with self._lock:
+            ret = schedule.next_target_time()
+
+        if ret is None and time.monotonic() - schedule.loaded_at > Bot.Timer.ScheduleMissReloadSeconds:
+            self.invalidate(channel_oid)
+
+            schedule = self._get(channel_oid, loader)
+
+            with self._lock:
+                ret = schedule.next_target_time()
+
+        return ret
+
+    def pop_notify(self, channel_oid: ObjectId, now: datetime, within_secs: int,
+                   loader: Callable[[ObjectId], List[TimerModel]]) -> List[TimerModel]:
+        """
+        Pop the unnotified timers in ``channel_oid`` which will timeup in ``within_secs`` seconds.
+
+        Timers already timed up will be discarded without being returned.
+
+        :param channel_oid: channel of the timers
+        :param now: current time
+        :param within_secs: timers that will timeup within this amount of seconds will be returned
+        :param loader: function to load the timers of a channel which are waiting to be notified
+        :return: a list of timers sorted by its target time (ASC)
+        """
+        schedule = self._get(channel_oid, loader)
+
+        with self._lock:
+            schedule.pop_until(schedule.notify, now)
+
+            return schedule.pop_until(schedule.notify, now + timedelta(seconds=within_secs))
+
+    def pop_time_up(self, channel_oid: ObjectId, now: datetime,
+                    loader: Callable[[ObjectId], List[TimerModel]]) -> List[TimerModel]:
+        """
+        Pop the timers in ``channel_oid`` which timed up but not yet notified.
+
+        :param channel_oid: channel of the timers
+        :param now: current time
+        :param loader: function to load the timers of a channel which are waiting to be notified
+        :return: a list of timers sorted by its target time (ASC)
+        """
+        schedule = self._get(channel_oid, loader)
+
+        with self._lock:
+            return schedule.pop_until(schedule.time_up, now)
+
+    def add(self, model: TimerModel):
+        """
+        Add the newly inserted timer ``model`` to the schedule of its channel if loaded.
+
+        :param model: timer inserted
+        """
+        with self._lock:
+            self._generation += 1
+
+            schedule = self._cache.get(model.channel_oid)
+            if schedule is not None:
+                schedule.add(model)
+
+    def remove(self, timer_oid: ObjectId):
+        """
+        Remove the timer ``timer_oid`` from the schedules.
+
+        :param timer_oid: OID of the deleted timer
+        """
+        with self._lock:
+            self._generation += 1
+
+            for schedule in self._cache.values():
+                schedule.timers.pop(timer_oid, None)
+
+    def invalidate(self, channel_oid: ObjectId):
+        """
+        Drop the schedule of ``channel_oid``, so it will be loaded from the database on the next use.
+
+        :param channel_oid: channel of the schedule to be dropped
+        """
+        with self._lock:
+            self._generation += 1
+            self._cache.pop(channel_oid, None)
+
+    def clear(self):
+        """Clear all the schedules."""
+        with self._lock:
+            self._generation += 1
+            self._cache.clear()
+
+
 class _TimerManager(BaseCollection):
     database_name = DB_NAME
     collection_name = "timer"
     model_class = TimerModel
 
-    def build_indexes(self):
-        self.create_index(TimerModel.Keyword.key)
-        self.create_index(TimerModel.DeletionTime.key, expireAfterSeconds=0)
+    def __init__(self):
+        super().__init__()
+
+        self._schedule = _TimerSchedule()
+
+    @classmethod
+    def get_index_models(cls) -> List[IndexModel]:
+        return [
+            IndexModel(TimerModel.Keyword.key),
+            IndexModel(TimerModel.DeletionTime.key, expireAfterSeconds=0),
+        ]
+
+    def clear(self):
+        super().clear()
+        self._schedule.clear()
+
+    def insert_one_model(self, model: TimerModel) -> Tuple[WriteOutcome, Optional[Exception]]:
+        ret = super().insert_one_model(model)
+        outcome, _ = ret
+
+        if outcome.is_inserted:
+            self._schedule.add(model)
+
+        return ret
+
+    def _load_schedule(self, channel_oid: ObjectId) -> List[TimerModel]:
+        """
+        Load the timers in ``channel_oid`` which are waiting to be notified from the database.
+
+        :param channel_oid: channel of the timers
+        :return: a list of timers waiting to be notified
+        """
+        return list(self.find_cursor_with_count({
+            TimerModel.ChannelOid.key: channel_oid,
+            "$or": [
+                {TimerModel.Notified.key: False},
+                {TimerModel.NotifiedExpired.key: False}
+            ]
+        }, with_count=False))
+
+    def _claim(self, channel_oid: ObjectId, models: List[TimerModel], flag_key: str) -> List[TimerModel]:
+        """
+        Set ``flag_key`` of each timer in ``models`` to ``True`` if it is still ``False`` in the database.
+
+        The timers may also be held by the schedules of the other processes,
+        so only the timers claimed by this call should be notified.
+
+        The schedule of ``channel_oid`` will be dropped if any of the timers was claimed by the others,
+        because the schedule is outdated.
+
+        :param channel_oid: channel of the timers
+        :param models: timers popped from the schedule
+        :param flag_key: key of the flag to be set
+        :return: timers claimed by this call
+        """
+        ret = [
+            model for model in models
+            if self.update_one({OID_KEY: model.id, flag_key: False}, {"$set": {flag_key: True}}).modified_count
+        ]
+
+        if len(ret) < len(models):
+            self._schedule.invalidate(channel_oid)
+
+        return ret
 
     @arg_type_ensure
     def add_new_timer(
@@ -57,6 +332,8 @@ class _TimerManager(BaseCollection):
         :param timer_oid: OID of the timer to be deleted
         :return: if the timer was successfully deleted
         """
+        self._schedule.remove(timer_oid)
+
         return self.delete_one({OID_KEY: timer_oid}).deleted_count > 0
 
     @arg_type_ensure
@@ -96,6 +373,24 @@ class _TimerManager(BaseCollection):
             )
         )
 
+    @arg_type_ensure
+    def has_timer_to_notify(self, channel_oid: ObjectId) -> bool:
+        """
+        Check if there are any timers in ``channel_oid`` to be notified
+        within ``Bot.Timer.MaxNotifyRangeSeconds`` seconds or already timed up.
+
+        This does not query the database unless the timers of ``channel_oid`` are not loaded into the memory,
+        or there are no timers in the loaded schedule
+        and the schedule was loaded more than ``Bot.Timer.ScheduleMissReloadSeconds`` seconds ago.
+
+        :param channel_oid: channel of the timers
+        :return: if there are any timers in `channel_oid` to be notified
+        """
+        next_target_time = self._schedule.next_target_time(channel_oid, self._load_schedule)
+
+        return next_target_time is not None \
+            and next_target_time < now_utc_aware() + timedelta(seconds=Bot.Timer.MaxNotifyRangeSeconds)
+
     @arg_type_ensure
     def get_notify(self, channel_oid: ObjectId, within_secs: Optional[int] = None) -> List[TimerModel]:
         """
@@ -103,26 +398,18 @@ class _TimerManager(BaseCollection):
 
         Returned timers will be sorted by its target time (ASC).
 
+        The database will be updated only if there are any timers to be returned.
+        Timers already notified by the other processes will not be returned.
+
         :param channel_oid: channel of the timers
         :param within_secs: timers that will timeup within this amount of seconds will be returned
         :return: a list of timers that is not yet notified and will timeup in `within_secs` seconds
         """
-        now = now_utc_aware()
+        ret = self._schedule.pop_notify(
+            channel_oid, now_utc_aware(), within_secs if within_secs else Bot.Timer.MaxNotifyRangeSeconds,
+            self._load_schedule)
 
-        filter_ = {
-            TimerModel.ChannelOid.key: channel_oid,
-            TimerModel.TargetTime.key: {
-                "$lt": now + timedelta(seconds=within_secs if within_secs else Bot.Timer.MaxNotifyRangeSeconds),
-                "$gt": now
-            },
-            TimerModel.Notified.key: False
-        }
-
-        ret = list(self.find_cursor_with_count(filter_, sort=[(TimerModel.TargetTime.key, pymongo.ASCENDING)]))
-
-        self.update_many_async(filter_, {"$set": {TimerModel.Notified.key: True}})
-
-        return ret
+        return self._claim(channel_oid, ret, TimerModel.Notified.key)
 
     @arg_type_ensure
     def get_time_up(self, channel_oid: ObjectId) -> List[TimerModel]:
@@ -131,22 +418,15 @@ class _TimerManager(BaseCollection):
 
         All timers in the returned result will be sorted by its target time (ASC).
 
+        The database will be updated only if there are any timers to be returned.
+        Timers already notified by the other processes will not be returned.
+
         :param channel_oid: channel of the timers
         :return: a list of timers that is not yet notified and already timed up
         """
-        now = now_utc_aware()
-
-        filter_ = {
-            TimerModel.ChannelOid.key: channel_oid,
-            TimerModel.TargetTime.key: {"$lt": now},
-            TimerModel.NotifiedExpired.key: False
-        }
+        ret = self._schedule.pop_time_up(channel_oid, now_utc_aware(), self._load_schedule)
 
-        ret = list(self.find_cursor_with_count(filter_, sort=[(TimerModel.TargetTime.key, pymongo.ASCENDING)]))
-
-        self.update_many_async(filter_, {"$set": {TimerModel.NotifiedExpired.key: True}})
-
-        return ret
+        return self._claim(channel_oid, ret, TimerModel.NotifiedExpired.key)
 
     @staticmethod
     def get_notify_within_secs(message_frequency: float):
@@ -164,4 +444,4 @@ class _TimerManager(BaseCollection):
         return min(message_frequency * 20 + 600, Bot.Timer.MaxNotifyRangeSeconds)
 
 
-TimerManager = _TimerManager()
+TimerManager = LazyManager(_TimerManager)
@@ -5,18 +5,21 @@ from typing import Optional, Dict, List, Union, NamedTuple
 
 from bson import ObjectId
 
-from pymongo import ReturnDocument
+from pymongo import IndexModel, ReturnDocument
 
 from extutils.gidentity import GoogleIdentityUserData
 from extutils.emailutils import MailSender
 from extutils.locales import DEFAULT_LOCALE
 from extutils.checker import arg_type_ensure
 from flags import Platform
+from JellyBot.systemconfig import Database
 from models import APIUserModel, OnPlatformUserModel, RootUserModel, RootUserConfigModel, OID_KEY, ChannelModel, \
     ChannelCollectionModel
 from mongodb.factory.results import OperationOutcome
+from mongodb.utils import ModelCache
 
 from ._base import BaseCollection
+from ._lazy import LazyManager
 from .mixin import GenerateTokenMixin
 from .results import (
     WriteOutcome, GetOutcome, UpdateOutcome,
@@ -41,9 +44,12 @@ class _APIUserManager(GenerateTokenMixin, BaseCollection):
     collection_name = "api"
     model_class = APIUserModel
 
-    def build_indexes(self):
-        self.create_index(APIUserModel.GoogleUid.key, unique=True, name="Google Identity Unique ID")
-        self.create_index(APIUserModel.Token.key, unique=True, name="Jelly Bot API Token")
+    @classmethod
+    def get_index_models(cls) -> List[IndexModel]:
+        return [
+            IndexModel(APIUserModel.GoogleUid.key, unique=True, name="Google Identity Unique ID"),
+            IndexModel(APIUserModel.Token.key, unique=True, name="Jelly Bot API Token"),
+        ]
 
     def ensure_register(self, id_data: GoogleIdentityUserData) -> APIUserRegistrationResult:
         """
@@ -105,9 +111,12 @@ class _OnPlatformIdentityManager(BaseCollection):
     collection_name = "onplat"
     model_class = OnPlatformUserModel
 
-    def build_indexes(self):
-        self.create_index([(OnPlatformUserModel.Platform.key, 1), (OnPlatformUserModel.Token.key, 1)],
-                          unique=True, name="Compound - Identity")
+    @classmethod
+    def get_index_models(cls) -> List[IndexModel]:
+        return [
+            IndexModel([(OnPlatformUserModel.Platform.key, 1), (OnPlatformUserModel.Token.key, 1)],
+                       unique=True, name="Compound - Identity"),
+        ]
 
     @arg_type_ensure
     def ensure_register(self, platform: Platform, user_token: str) -> OnPlatformUserRegistrationResult:
@@ -154,19 +163,33 @@ class _OnPlatformIdentityManager(BaseCollection):
 
 
 class _RootUserManager(BaseCollection):
-    """Class to manage the root user data. This also serve as the main data controller of the user identities."""
+    """
+    Class to manage the root user data. This also serve as the main data controller of the user identities.
+
+    Root user data registered via on-platform identity are cached by its platform and token.
+    The cached data will be invalidated once updated.
+    """
 
     database_name = DB_NAME
     collection_name = "root"
     model_class = RootUserModel
 
-    def build_indexes(self):
-        self.create_index(
-            RootUserModel.ApiOid.key, unique=True, name="API User OID",
-            partialFilterExpression={RootUserModel.ApiOid.key: {"$exists": True}})
-        self.create_index(
-            RootUserModel.OnPlatOids.key, unique=True, name="On Platform Identity OIDs",
-            partialFilterExpression={RootUserModel.OnPlatOids.key: {"$exists": True}})
+    def __init__(self):
+        super().__init__()
+
+        self._onplat_cache: ModelCache[RootUserModel] = ModelCache(
+            Database.IdentityCacheSize, Database.IdentityExpirySeconds)
+
+    @classmethod
+    def get_index_models(cls) -> List[IndexModel]:
+        return [
+            IndexModel(
+                RootUserModel.ApiOid.key, unique=True, name="API User OID",
+                partialFilterExpression={RootUserModel.ApiOid.key: {"$exists": True}}),
+            IndexModel(
+                RootUserModel.OnPlatOids.key, unique=True, name="On Platform Identity OIDs",
+                partialFilterExpression={RootUserModel.OnPlatOids.key: {"$exists": True}}),
+        ]
 
     def clear(self):
         super().clear()
@@ -175,6 +198,11 @@ class _RootUserManager(BaseCollection):
         OnPlatformIdentityManager.clear()
         OnPlatformUserModel.clear_name_cache()
 
+        self._onplat_cache.clear()
+
+    def _invalidate_oids(self, *root_oids: ObjectId):
+        self._onplat_cache.invalidate_models(lambda mdl: mdl.id in root_oids)
+
     def register_onplat(self, platform: Platform, user_token: str) -> RootUserRegistrationResult:
         """
         Ensure that the on-platform user is registered.
@@ -183,6 +211,13 @@ class _RootUserManager(BaseCollection):
         :param user_token: token of the user
         :return: result of the user identity registration
         """
+        key = (platform, user_token)
+
+        model, generation = self._onplat_cache.get(key)
+        if model:
+            return RootUserRegistrationResult(
+                WriteOutcome.O_DATA_EXISTS, None, model, WriteOutcome.O_DATA_EXISTS, None)
+
         user_reg_result = OnPlatformIdentityManager.ensure_register(platform, user_token)
         plat_oid = user_reg_result.model.id if user_reg_result.outcome.is_success else None
 
@@ -201,8 +236,12 @@ class _RootUserManager(BaseCollection):
             if not model:
                 raise ValueError(f"Data of root OID {model.id} not found while it should be found.")
 
+            self._onplat_cache.set(key, model, generation)
+
             return RootUserRegistrationResult(WriteOutcome.O_DATA_EXISTS, ex, model, outcome, user_reg_result)
 
+        self._onplat_cache.set(key, model, generation)
+
         return RootUserRegistrationResult(WriteOutcome.O_INSERTED, ex, model, outcome, user_reg_result)
 
     def register_google(self, id_data: GoogleIdentityUserData) -> RootUserRegistrationResult:
@@ -458,7 +497,7 @@ class _RootUserManager(BaseCollection):
         :return: a `dict` containing all on-platform identity data
         """
         ret = {}
-        for onplat_data in OnPlatformIdentityManager.find_cursor_with_count():
+        for onplat_data in OnPlatformIdentityManager.find_cursor_with_count(with_count=False):
             ret[onplat_data.id] = onplat_data
 
         return ret
@@ -478,7 +517,7 @@ class _RootUserManager(BaseCollection):
         if root_oids:
             filter_[OID_KEY] = {"$in": root_oids}
 
-        for root_data in self.find_cursor_with_count(filter_):
+        for root_data in self.find_cursor_with_count(filter_, with_count=False):
             ret[root_data.id] = root_data.on_plat_oids
 
         return ret
@@ -578,6 +617,7 @@ class _RootUserManager(BaseCollection):
         actual_dst = min(src_root_oid, dest_root_oid)
 
         ack_rm = self.delete_many({RootUserModel.Id.key: {"$in": [src_root_oid, dest_root_oid]}}).acknowledged
+        self._invalidate_oids(src_root_oid, dest_root_oid)
 
         if not ack_rm:
             return OperationOutcome.X_NOT_DELETED
@@ -593,6 +633,7 @@ class _RootUserManager(BaseCollection):
             data[RootUserModel.OnPlatOids.key] = src_op
 
         _, outcome, _ = self.insert_one_data(from_db=True, **data)
+        self._invalidate_oids(src_root_oid, dest_root_oid)
 
         if not outcome.is_success:
             return OperationOutcome.X_NOT_UPDATED
@@ -615,6 +656,7 @@ class _RootUserManager(BaseCollection):
             {OID_KEY: root_oid},
             {"$set": {RootUserModel.Config.key: RootUserConfigModel(**update_vars)}},
             return_document=ReturnDocument.AFTER)
+        self._invalidate_oids(root_oid)
 
         if updated:
             updated = RootUserModel.cast_model(updated)
@@ -625,6 +667,6 @@ class _RootUserManager(BaseCollection):
         return RootUserUpdateResult(outcome, None, updated)
 
 
-APIUserManager = _APIUserManager()
-OnPlatformIdentityManager = _OnPlatformIdentityManager()
-RootUserManager = _RootUserManager()
+APIUserManager = LazyManager(_APIUserManager)
+OnPlatformIdentityManager = LazyManager(_OnPlatformIdentityManager)
+RootUserManager = LazyManager(_RootUserManager)
@@ -94,7 +94,7 @@ class ProfileHelper:
         ret = []
 
         # Get channel profiles. Terminate if no available profiles
-        profs = list(ProfileManager.get_channel_profiles(channel_oid, partial_name))
+        profs = list(ProfileManager.get_channel_profiles(channel_oid, partial_name, with_count=False))
         if not profs:
             return ret
 
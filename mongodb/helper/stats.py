@@ -597,7 +597,8 @@ class MessageStatsDataProcessor:
         :return: a `HandledMessageRecords`
         """
         ret = []
-        msgs = list(MessageRecordStatisticsManager.get_recent_messages(channel_data.id, limit=limit, skip=skip))
+        msgs = list(MessageRecordStatisticsManager.get_recent_messages(
+            channel_data.id, limit=limit, skip=skip, with_count=False))
         uids = {msg.user_root_oid for msg in msgs}
         uids_handled = IdentitySearcher.get_batch_user_name(uids, channel_data)
 
@@ -1,4 +1,7 @@
 from .cursor import ExtendedCursor
 from .bulk import BulkWriteDataHolder
+from .accum import IncrementAccumulator
+from .insbuf import InsertBuffer
+from .mdlcache import ModelCache
 from .misc import case_insensitive_collation
 from .backup import backup_collection
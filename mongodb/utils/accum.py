@@ -0,0 +1,142 @@
+"""Write-behind accumulator of the counter increments."""
+import atexit
+from datetime import datetime
+from threading import Thread, Lock, Event
+from typing import Dict, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from models import OID_KEY
+
+from .logger import logger
+
+__all__ = ("IncrementAccumulator",)
+
+
+class IncrementAccumulator:
+    """
+    Accumulate the counter increments of the documents in memory and write them in batch.
+
+    For each document, the increments of ``inc_key`` are summed and the latest timestamp of ``ts_key`` is kept.
+
+    Pending increments will be written by a single unordered ``bulk_write()`` if either:
+
+    - ``flush_interval`` seconds passed since the last flush
+
+    - count of the documents holding pending increments reaches ``flush_threshold``
+
+    - the process is exiting
+
+    Increments being written are still considered as pending until the write completes.
+    Increments failed to be written will be merged back to be written on the next flush.
+    """
+
+    def __init__(self, col, inc_key: str, ts_key: str, flush_interval: float, flush_threshold: int):
+        self._col = col
+        self._inc_key = inc_key
+        self._ts_key = ts_key
+        self._flush_interval = flush_interval
+        self._flush_threshold = flush_threshold
+
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._pending: Dict[ObjectId, Tuple[int, datetime]] = {}
+        self._in_flight: Dict[ObjectId, Tuple[int, datetime]] = {}
+
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+        atexit.register(self.close)
+
+    @staticmethod
+    def _merge(data: Dict[ObjectId, Tuple[int, datetime]], oid: ObjectId, count: int, timestamp: datetime):
+        if oid in data:
+            prev_count, prev_timestamp = data[oid]
+            data[oid] = (prev_count + count, max(prev_timestamp, timestamp))
+        else:
+            data[oid] = (count, timestamp)
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = Thread(target=self._flush_loop, daemon=True)
+            self._thread.start()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self._flush_interval):
+            self.flush()
+
+    def add(self, oid: ObjectId, timestamp: datetime, count: int = 1):
+        """
+        Add an increment of ``count`` which occurred at ``timestamp`` to the document of ``oid``.
+
+        :param oid: OID of the document to be incremented
+        :param timestamp: time of the increment
+        :param count: count to increment
+        """
+        with self._lock:
+            self._merge(self._pending, oid, count, timestamp)
+            pending_count = len(self._pending)
+
+            self._ensure_thread()
+
+        if pending_count >= self._flush_threshold:
+            self.flush()
+
+    def get_pending(self, oid: ObjectId) -> Optional[Tuple[int, datetime]]:
+        """
+        Get the increments of ``oid`` which are not yet written into the database.
+
+        :param oid: OID of the document
+        :return: pending increment count and the latest timestamp of `oid` if any, `None` otherwise
+        """
+        ret = {}
+
+        with self._lock:
+            for data in (self._in_flight, self._pending):
+                if oid in data:
+                    self._merge(ret, oid, *data[oid])
+
+        return ret.get(oid)
+
+    def flush(self):
+        """Write all pending increments into the database."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+
+                self._in_flight, self._pending = self._pending, {}
+
+            in_flight = list(self._in_flight.items())
+            reqs = [
+                UpdateOne(
+                    {OID_KEY: oid},
+                    {"$inc": {self._inc_key: count}, "$max": {self._ts_key: timestamp}}
+                )
+                for oid, (count, timestamp) in in_flight
+            ]
+
+            failed = []
+
+            try:
+                self._col.bulk_write(reqs, ordered=False)
+            except BulkWriteError as ex:
+                # Unordered bulk write still applies the other operations
+                failed = [in_flight[err["index"]] for err in ex.details.get("writeErrors", [])]
+                logger.logger.exception(f"Failed to flush {len(failed)} accumulated increments. ({ex})")
+            except PyMongoError as ex:
+                failed = in_flight
+                logger.logger.exception(f"Failed to flush {len(reqs)} accumulated increments. ({ex})")
+
+            with self._lock:
+                self._in_flight = {}
+
+                for oid, (count, timestamp) in failed:
+                    self._merge(self._pending, oid, count, timestamp)
+
+    def close(self):
+        """Stop the periodic flushing and write all pending increments into the database."""
+        self._stop.set()
+        self.flush()
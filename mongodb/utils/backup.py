@@ -1,12 +1,18 @@
+import heapq
 import os
 import time
-from datetime import datetime
-from threading import Thread
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from threading import Thread, Condition
+from typing import List, Optional
 
 import pymongo
-from pymongo import errors
+from bson import ObjectId
+from pymongo import ReplaceOne
+from pymongo.collection import Collection
 
 from extutils.logger import LoggerSkeleton
+from JellyBot.systemconfig import Database
 
 __all__ = ("backup_collection",)
 
@@ -22,43 +28,215 @@ target_client = None
 if target_mongo_url:
     target_client = pymongo.MongoClient(target_mongo_url)
 
+CHECKPOINT_COL_NAME = "_backup_"
+KEY_COL = "col"
+KEY_TS = "ts"
+KEY_WATERMARK = "wm"
+KEY_FULL_TS = "full-ts"
+KEY_FULL_WATERMARK = "full-wm"
+
+
+@dataclass(order=True)
+class _BackupJob:
+    next_run: float
+    org_client: pymongo.MongoClient = field(compare=False)
+    db_name: str = field(compare=False)
+    col_name: str = field(compare=False)
+    is_single_db: bool = field(compare=False)
+    backup_interval: int = field(compare=False)
+    append_only: bool = field(compare=False, default=False)
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.db_name}.{self.col_name}"
+
+    @property
+    def origin_col(self) -> Collection:
+        return self.org_client.get_database(self.db_name).get_collection(self.col_name)
+
+    @property
+    def target_db(self):
+        return target_client.get_database(self.col_name.split(".", 1)[0] if self.is_single_db else self.db_name)
+
+    @property
+    def target_col(self) -> Collection:
+        return self.target_db.get_collection(self.col_name.split(".", 1)[1] if self.is_single_db else self.col_name)
+
+    @property
+    def checkpoint_col(self) -> Collection:
+        return self.target_db.get_collection(CHECKPOINT_COL_NAME)
+
+
+class _BackupScheduler:
+    """
+    Scheduler running all the backup jobs one by one in a single thread.
+
+    The thread will be started on the first job added.
+    """
+
+    def __init__(self):
+        self._jobs: List[_BackupJob] = []
+        self._cond = Condition()
+        self._thread: Optional[Thread] = None
+
+    def add(self, job: _BackupJob):
+        """
+        Add a backup job to be run at ``job.next_run``.
+
+        :param job: backup job to be added
+        """
+        with self._cond:
+            heapq.heappush(self._jobs, job)
+
+            if not self._thread:
+                self._thread = Thread(target=self._run_loop, name="MongoBackup", daemon=True)
+                self._thread.start()
+
+            self._cond.notify()
+
+    def _next_job(self) -> _BackupJob:
+        with self._cond:
+            while True:
+                if self._jobs:
+                    wait_secs = self._jobs[0].next_run - time.time()
+                    if wait_secs <= 0:
+                        return heapq.heappop(self._jobs)
+                else:
+                    wait_secs = None
+
+                self._cond.wait(wait_secs)
+
+    def _run_loop(self):
+        while True:
+            job = self._next_job()
+
+            if Database.BackupIncremental:
+                _backup_incremental(job)
+            else:
+                _backup_full_copy(job)
+
+            job.next_run = time.time() + job.backup_interval
+            self.add(job)
+
+
+_scheduler = _BackupScheduler()
+
 
 def backup_collection(
-        org_client: pymongo.MongoClient, db_name: str, col_name: str, is_single_db: bool, backup_interval: int):
+        org_client: pymongo.MongoClient, db_name: str, col_name: str, is_single_db: bool, backup_interval: int,
+        *, append_only: bool = False):
+    """
+    Schedule to backup the collection every ``backup_interval`` seconds.
+
+    If ``Database.BackupIncremental`` is ``True``, only the documents inserted after the last checkpoint
+    will be copied to the target instance.
+    All documents will be copied by upserting every ``Database.BackupFullSyncIntervalSeconds`` seconds
+    to reflect the modifications, unless ``append_only`` is ``True``.
+    Deletions will **NOT** be reflected in this mode.
+
+    Otherwise, the target collection will be dropped and all documents will be copied.
+
+    All backups are run one by one in a single thread.
+    """
     if not target_client:
         logger.logger.warning("Attempted to backup the data while the backup service is not activated.")
         logger.logger.warning(f"DB Name: {db_name} / Collection Name: {col_name} / Is single DB: {is_single_db}.")
         return
 
-    Thread(target=backup_collection_thread,
-           args=(org_client, db_name, col_name, is_single_db, backup_interval)).start()
+    _scheduler.add(
+        _BackupJob(time.time(), org_client, db_name, col_name, is_single_db, backup_interval, append_only))
+
+
+def _upsert_batched(job: _BackupJob, filter_: dict, full_sync: bool) -> int:
+    """
+    Upsert the documents matching ``filter_`` into the target collection in batch, in the order of ``_id``.
+
+    The checkpoint will be updated after each batch, so the backup could be resumed if interrupted.
+
+    :return: count of the documents copied
+    """
+    count = 0
+    batch = []
+    last_id = None
+
+    def write_batch():
+        job.target_col.bulk_write(batch, ordered=False)
+
+        update = {"$max": {KEY_WATERMARK: last_id}}
+        if full_sync:
+            update["$set"] = {KEY_FULL_WATERMARK: last_id}
+        job.checkpoint_col.update_one({KEY_COL: job.col_name}, update, upsert=True)
+
+    for doc in job.origin_col.find(filter_, sort=[("_id", pymongo.ASCENDING)], batch_size=Database.BackupBatchSize):
+        batch.append(ReplaceOne({"_id": doc["_id"]}, doc, upsert=True))
+        last_id = doc["_id"]
+
+        if len(batch) >= Database.BackupBatchSize:
+            write_batch()
+            count += len(batch)
+            batch = []
+
+    if batch:
+        write_batch()
+        count += len(batch)
+
+    return count
+
+
+def _backup_incremental(job: _BackupJob):
+    logger.logger.info(f"Incremental backup of `{job.full_name}` in progress...")
+
+    try:
+        checkpoint = job.checkpoint_col.find_one({KEY_COL: job.col_name}) or {}
+        now = datetime.utcnow()
+
+        # Documents of an append-only collection are never modified, so the watermark alone covers them
+        full_ts = checkpoint.get(KEY_FULL_TS)
+        full_sync = not job.append_only and (
+            not full_ts
+            or KEY_FULL_WATERMARK in checkpoint
+            or now - full_ts > timedelta(seconds=Database.BackupFullSyncIntervalSeconds))
+
+        # Documents could be inserted a while after its `_id` was generated (for example, buffered insertion),
+        # so the documents which `_id` is too close to now are left for the next run
+        filter_ = {"_id": {"$lt": ObjectId.from_datetime(now - timedelta(seconds=Database.BackupLagSeconds))}}
+        if full_sync:
+            # Resume the interrupted full sync
+            if KEY_FULL_WATERMARK in checkpoint:
+                filter_["_id"]["$gt"] = checkpoint[KEY_FULL_WATERMARK]
+        elif KEY_WATERMARK in checkpoint:
+            filter_["_id"]["$gt"] = checkpoint[KEY_WATERMARK]
+
+        count = _upsert_batched(job, filter_, full_sync)
+
+        update = {"$set": {KEY_TS: now}}
+        if full_sync:
+            update["$set"][KEY_FULL_TS] = now
+            update["$unset"] = {KEY_FULL_WATERMARK: ""}
+        job.checkpoint_col.update_one({KEY_COL: job.col_name}, update, upsert=True)
+    except pymongo.errors.BulkWriteError as e:
+        logger.logger.error(f"Backup of `{job.full_name}` yielded `BulkWriteError`. ({e.details})")
+    except Exception as e:
+        logger.logger.error(f"Backup of `{job.full_name}` failed. Error: {e} ({type(e)})")
+    else:
+        logger.logger.info(f"Incremental backup of `{job.full_name}` completed on {datetime.now()}. "
+                           f"{count} documents copied{' (full sync)' if full_sync else ''}.")
 
 
-def backup_collection_thread(
-        org_client: pymongo.MongoClient, db_name: str, col_name: str, is_single_db: bool, backup_interval: int):
-    while True:
-        if is_single_db:
-            target_db_name, target_col_name = col_name.split(".", 1)
-        else:
-            target_db_name, target_col_name = db_name, col_name
+def _backup_full_copy(job: _BackupJob):
+    logger.logger.info(f"Backup of `{job.full_name}` in progress...")
 
-        origin_col = org_client.get_database(db_name).get_collection(col_name)
-        target_col = target_client.get_database(target_db_name).get_collection(target_col_name)
-        target_col_backup = target_client.get_database(target_db_name).get_collection("_backup_")
+    try:
+        target_col = job.target_col
         target_col.drop()
 
-        logger.logger.info(f"Backup of `{db_name}.{col_name}` in progress...")
-        try:
-            target_col.insert_many(origin_col.find())
-            target_col_backup.update_one({"col": col_name},
-                                         {"$set": {"ts": datetime.utcnow()}}, upsert=True)
-        except pymongo.errors.InvalidOperation as e:
-            logger.logger.info(f"Backup of `{db_name}.{col_name}` yielded `InvalidOperation`. ({e})")
-        except pymongo.errors.BulkWriteError as e:
-            logger.logger.error(f"Backup of `{db_name}.{col_name}` yielded `BulkWriteError`. ({e.details})")
-        except Exception as e:
-            logger.logger.error(f"Backup of `{db_name}.{col_name}` failed. Error: {e} ({type(e)})")
-
-        logger.logger.info(f"Backup of `{db_name}.{col_name}` completed on {datetime.now()}.`")
-
-        time.sleep(backup_interval)
+        target_col.insert_many(job.origin_col.find())
+        job.checkpoint_col.update_one({KEY_COL: job.col_name}, {"$set": {KEY_TS: datetime.utcnow()}}, upsert=True)
+    except pymongo.errors.InvalidOperation as e:
+        logger.logger.info(f"Backup of `{job.full_name}` yielded `InvalidOperation`. ({e})")
+    except pymongo.errors.BulkWriteError as e:
+        logger.logger.error(f"Backup of `{job.full_name}` yielded `BulkWriteError`. ({e.details})")
+    except Exception as e:
+        logger.logger.error(f"Backup of `{job.full_name}` failed. Error: {e} ({type(e)})")
+    else:
+        logger.logger.info(f"Backup of `{job.full_name}` completed on {datetime.now()}.`")
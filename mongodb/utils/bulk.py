@@ -1,4 +1,4 @@
-from pymongo import ReplaceOne
+from pymongo import ReplaceOne, UpdateOne
 from pymongo.errors import BulkWriteError
 
 from models import OID_KEY
@@ -39,3 +39,10 @@ class BulkWriteDataHolder:
         :param data: Must contains `_id` field.
         """
         self._reqs.append(ReplaceOne({OID_KEY: data[OID_KEY]}, data))
+
+    def set_single(self, oid, fields):
+        """
+        :param oid: `_id` of the data to be updated.
+        :param fields: Fields to be set. Keys could be dotted paths.
+        """
+        self._reqs.append(UpdateOne({OID_KEY: oid}, {"$set": fields}))
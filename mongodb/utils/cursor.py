@@ -1,5 +1,5 @@
 """Customized ``pymongo`` cursor."""
-from typing import Generic, TypeVar, Type
+from typing import Callable, Generic, TypeVar, Type, Union
 
 from models import Model
 
@@ -7,9 +7,16 @@ T = TypeVar("T", bound=Model)  # pylint: disable=invalid-name
 
 
 class ExtendedCursor(Generic[T]):
-    """Customized ``pymongo`` cursor class."""
+    """
+    Customized ``pymongo`` cursor class.
 
-    def __init__(self, cursor, count, parse_cls: Type[T] = None):
+    ``count`` could be either the count itself or a function to get the count.
+    If it is a function, it will be called only once on the first call of ``len()``.
+
+    If ``count`` is ``None``, the count is not available and ``len()`` raises :class:`TypeError`.
+    """
+
+    def __init__(self, cursor, count: Union[int, Callable[[], int], None], parse_cls: Type[T] = None):
         self._cursor = cursor
         self._count = count
         self._parse_cls = parse_cls
@@ -22,6 +29,12 @@ class ExtendedCursor(Generic[T]):
                 yield dict_
 
     def __len__(self):
+        if self._count is None:
+            raise TypeError("Count is not available for the cursor created without counting.")
+
+        if callable(self._count):
+            self._count = self._count()
+
         return self._count
 
     def limit(self, limit) -> 'ExtendedCursor':
@@ -39,11 +52,26 @@ class ExtendedCursor(Generic[T]):
             self._cursor = self._cursor.limit(limit)
         return self
 
+    @property
+    def count_available(self) -> bool:
+        """
+        Check if the count of this cursor is available.
+
+        :return: if `len()` could be called on this cursor
+        """
+        return self._count is not None
+
     @property
     def empty(self):
         """
         Check if this cursor is empty.
 
+        If the count is not yet obtained, this checks if the cursor yields any data
+        instead of counting all the data.
+
         :return: if this cursor is empty
         """
-        return len(self) == 0
+        if isinstance(self._count, int):
+            return self._count == 0
+
+        return next(iter(self._cursor.clone().limit(1)), None) is None
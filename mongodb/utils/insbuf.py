@@ -0,0 +1,156 @@
+"""Write-behind buffer of the documents to be inserted."""
+import atexit
+from threading import Thread, Lock, Event
+from typing import List, Optional
+
+from pymongo.errors import PyMongoError, BulkWriteError
+
+from .logger import logger
+
+__all__ = ("InsertBuffer",)
+
+
+class InsertBuffer:
+    """
+    Buffer the documents in memory and insert them in batch.
+
+    Buffered documents will be inserted by a single unordered ``insert_many()`` if either:
+
+    - ``flush_interval`` seconds passed since the last flush
+
+    - count of the buffered documents reaches ``batch_size``
+
+    - the process is exiting
+
+    The insertion is performed by a dedicated thread, so adding a document never waits for the database.
+
+    At most ``max_size`` documents will be buffered.
+    Documents added while the buffer is full will be dropped and logged.
+
+    The documents should have ``_id`` set before being added
+    if the ``_id`` is expected to reflect the time being added instead of the time being inserted.
+
+    Batches failed to be inserted because of the connection or the server errors will be put back to the buffer
+    and retried on the next flush. Documents rejected by the server (for example, duplicated ``_id``) are dropped.
+    Retrying a batch is safe because ``_id`` of the documents were already set by the first attempt.
+    """
+
+    def __init__(self, col, batch_size: int, flush_interval: float, max_size: int):
+        self._col = col
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_size = max_size
+
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._docs: List[dict] = []
+        self._dropped = 0
+
+        self._wakeup = Event()
+        self._stop = False
+        self._thread: Optional[Thread] = None
+
+        atexit.register(self.close)
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = Thread(target=self._flush_loop, name=f"InsertBuffer-{self._col.name}", daemon=True)
+            self._thread.start()
+
+    def _flush_loop(self):
+        while not self._stop:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+
+            self.flush()
+
+    @property
+    def buffered_count(self) -> int:
+        """
+        Get the count of the documents not yet inserted.
+
+        :return: count of the documents not yet inserted
+        """
+        return len(self._docs)
+
+    @property
+    def dropped_count(self) -> int:
+        """
+        Get the count of the documents dropped because the buffer is full.
+
+        :return: count of the documents dropped
+        """
+        return self._dropped
+
+    def add(self, doc: dict) -> bool:
+        """
+        Add ``doc`` to the buffer.
+
+        :param doc: document to be inserted
+        :return: if `doc` is added to the buffer
+        """
+        with self._lock:
+            if len(self._docs) >= self._max_size:
+                self._dropped += 1
+                dropped = self._dropped
+            else:
+                self._docs.append(doc)
+                dropped = 0
+
+            buffered_count = len(self._docs)
+
+            self._ensure_thread()
+
+        if dropped:
+            logger.logger.warning(f"Insert buffer of `{self._col.full_name}` is full ({self._max_size}). "
+                                  f"Document dropped. Total dropped: {dropped}")
+            return False
+
+        if buffered_count >= self._batch_size:
+            self._wakeup.set()
+
+        return True
+
+    def flush(self):
+        """Insert all buffered documents into the database."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._docs:
+                    return
+
+                docs, self._docs = self._docs, []
+
+            for start in range(0, len(docs), self._batch_size):
+                batch = docs[start:start + self._batch_size]
+
+                try:
+                    self._col.insert_many(batch, ordered=False)
+                except BulkWriteError as ex:
+                    logger.logger.error(f"Error occurred during inserting {len(batch)} buffered documents "
+                                        f"into `{self._col.full_name}`. ({ex.details.get('writeErrors')})")
+                except PyMongoError as ex:
+                    logger.logger.exception(f"Failed to insert {len(batch)} buffered documents "
+                                            f"into `{self._col.full_name}`. Retrying on the next flush. ({ex})")
+
+                    self._requeue(docs[start:])
+                    return
+
+    def _requeue(self, docs: List[dict]):
+        with self._lock:
+            # Documents failed to be inserted were added earlier, so they are put in front
+            self._docs = docs + self._docs
+
+            exceeded = len(self._docs) - self._max_size
+            if exceeded > 0:
+                self._docs = self._docs[exceeded:]
+                self._dropped += exceeded
+
+        if exceeded > 0:
+            logger.logger.warning(f"Insert buffer of `{self._col.full_name}` is full ({self._max_size}). "
+                                  f"{exceeded} oldest documents dropped on retry.")
+
+    def close(self):
+        """Stop the periodic flushing and insert all buffered documents into the database."""
+        self._stop = True
+        self._wakeup.set()
+        self.flush()
@@ -0,0 +1,114 @@
+"""In-memory cache of the models loaded from the database."""
+from threading import Lock
+from typing import Callable, Generic, Hashable, Iterable, Optional, Tuple, TypeVar
+
+from cachetools import TTLCache
+
+__all__ = ("ModelCache",)
+
+T = TypeVar("T")  # pylint: disable=invalid-name
+
+
+class ModelCache(Generic[T]):
+    """
+    Bounded in-memory cache of the models, expiring after ``ttl`` seconds.
+
+    Every invalidation increments the generation of the cache.
+    Models loaded before an invalidation will not be stored, so the stale models will not be cached
+    if the model is updated while being loaded.
+
+    The models should be invalidated once they are updated.
+    The expiry reflects the changes made by the other processes.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = Lock()
+        self._generation = 0
+
+    def get(self, key: Hashable) -> Tuple[Optional[T], int]:
+        """
+        Get the cached model of ``key``.
+
+        The generation returned should be passed to :meth:`set()` when storing the loaded model.
+
+        :param key: key of the model
+        :return: cached model (`None` if not cached) and the current generation
+        """
+        with self._lock:
+            return self._cache.get(key), self._generation
+
+    def generation(self) -> int:
+        """
+        Get the current generation to be passed to :meth:`set()` or :meth:`set_many()`.
+
+        :return: current generation
+        """
+        with self._lock:
+            return self._generation
+
+    def set(self, key: Hashable, model: T, generation: int):
+        """
+        Store ``model`` as ``key``.
+
+        ``model`` will not be stored if any invalidation happened after ``generation`` was obtained.
+
+        :param key: key of the model
+        :param model: model to be stored
+        :param generation: generation obtained before loading the model
+        """
+        with self._lock:
+            if generation == self._generation:
+                self._cache[key] = model
+
+    def set_many(self, items: Iterable[Tuple[Hashable, T]], generation: int):
+        """
+        Store each model in ``items`` as its paired key.
+
+        None of the models will be stored if any invalidation happened after ``generation`` was obtained.
+
+        :param items: pairs of the key and the model to be stored
+        :param generation: generation obtained before loading the models
+        """
+        with self._lock:
+            if generation == self._generation:
+                for key, model in items:
+                    self._cache[key] = model
+
+    def invalidate(self, key: Hashable):
+        """
+        Invalidate the model of ``key``.
+
+        :param key: key of the model to be invalidated
+        """
+        with self._lock:
+            self._generation += 1
+            self._cache.pop(key, None)
+
+    def invalidate_keys(self, predicate: Callable[[Hashable], bool]):
+        """
+        Invalidate all models which ``predicate`` returns ``True`` for their key.
+
+        :param predicate: function to check if the model of the key should be invalidated
+        """
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._cache if predicate(key)]:
+                self._cache.pop(key, None)
+
+    def invalidate_models(self, predicate: Callable[[T], bool]):
+        """
+        Invalidate all models which ``predicate`` returns ``True``.
+
+        :param predicate: function to check if the model should be invalidated
+        """
+        with self._lock:
+            self._generation += 1
+            for key in [key for key, model in self._cache.items() if predicate(model)]:
+                self._cache.pop(key, None)
+
+    def clear(self):
+        """Clear all cached models."""
+        with self._lock:
+            self._generation += 1
+            self._cache.clear()
@@ -1,12 +1,12 @@
 import time
 from abc import ABC
-from threading import Thread
 from typing import Any, Optional, Union
 
 from bson import ObjectId
 from linebot.models import TextMessage, ImageMessage, StickerMessage, MessageEvent
 from discord import Message, ChannelType
 
+from extutils.bgexec import BACKGROUND_EXECUTOR
 from extutils.emailutils import MailSender
 from flags import Platform, MessageType, ChannelType as SysChannelType, ImageContentType
 from models import ChannelModel, RootUserModel, ChannelCollectionModel
@@ -159,8 +159,9 @@ class MessageEventObjectFactory:
             -> Optional[ChannelModel]:
         ret = ChannelManager.ensure_register(platform, token, default_name=default_name)
         if ret.success:
-            # Use Thread so no need to wait until the update is completed
-            Thread(target=ChannelManager.mark_accessibility, args=(platform, token, True)).start()
+            if not ret.model.bot_accessible:
+                # Execute in the background so no need to wait until the update is completed
+                BACKGROUND_EXECUTOR.submit(ChannelManager.mark_accessibility, platform, token, True)
         else:
             MailSender.send_email_async(f"Platform: {platform} / Token: {token}",
                                         subject="Channel Registration Failed")
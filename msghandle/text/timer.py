@@ -21,9 +21,12 @@ def process_timer_get(e: TextMessageEventObject) -> List[HandledMessageEvent]:
 
 
 def process_timer_notification(e: TextMessageEventObject) -> List[HandledMessageEvent]:
+    if not TimerManager.has_timer_to_notify(e.channel_oid):
+        return []
+
     within_secs = min(
         TimerManager.get_notify_within_secs(
-            MessageRecordStatisticsManager.get_message_frequency(e.channel_oid, Bot.Timer.MessageFrequencyRangeMin)
+            MessageRecordStatisticsManager.get_recent_message_frequency(e.channel_oid)
         ),
         Bot.Timer.MaxNotifyRangeSeconds
     )
@@ -0,0 +1,147 @@
+"""
+Script to run the micro-benchmarks of the hot paths.
+
+Usage: ``python script_benchmark.py [benchmark name ...]``. All benchmarks will be run if not specified.
+"""
+import os
+import sys
+import timeit
+from typing import Callable, Dict
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "JellyBot.settings")
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {}
+
+
+def benchmark(fn):
+    """Register ``fn`` as a benchmark, which name is the name of ``fn``."""
+    BENCHMARKS[fn.__name__] = fn
+    return fn
+
+
+def report(name: str, stmt: Callable[[], None], number: int, repeat: int = 5) -> float:
+    """
+    Run ``stmt`` ``number`` times for ``repeat`` rounds and print the time spent per call of the best round.
+
+    :param name: name of the measured statement
+    :param stmt: statement to be measured
+    :param number: count of the executions in each round
+    :param repeat: count of the rounds
+    :return: best time spent per call in microseconds
+    """
+    per_call_us = min(timeit.repeat(stmt, number=number, repeat=repeat)) / number * 1E6
+    print(f"{name:<40} {per_call_us:>10.3f} us/call")
+
+    return per_call_us
+
+
+@benchmark
+def flag_cast():
+    """Compare :meth:`FlagEnumMixin.cast()` to the linear scan comparing each member."""
+    from extutils.flags import FlagDoubleEnum  # pylint: disable=import-outside-toplevel
+
+    # 30 members, which is about the size of the larger flags in `flags`
+    SampleEnum = FlagDoubleEnum("SampleEnum", {f"M{i}": (i, f"K{i}", f"D{i}") for i in range(30)})
+
+    def linear_scan(item):
+        for member in list(SampleEnum):
+            if member == item:
+                return member
+
+        return None
+
+    for item in (29, "29", "M29"):
+        base = report(f"linear scan ({item!r})", lambda: linear_scan(item), 20000)
+        new = report(f"cast ({item!r})", lambda: SampleEnum.cast(item), 20000)
+        print(f"{'':<40} {base / new:>10.1f}x")
+
+
+@benchmark
+def arg_type_ensure():
+    """Compare the call of the functions decorated by ``arg_type_ensure`` to the plain function call."""
+    from bson import ObjectId  # pylint: disable=import-outside-toplevel
+
+    from extutils.checker import arg_type_ensure as decorator  # pylint: disable=import-outside-toplevel
+
+    def getter(channel_oid: ObjectId, keyword: str, *, case_insensitive: bool = True):
+        return channel_oid, keyword, case_insensitive
+
+    getter_ensured = decorator(getter)
+    oid = ObjectId()
+
+    report("plain", lambda: getter(oid, "A", case_insensitive=False), 100000)
+    report("ensured (types matched)", lambda: getter_ensured(oid, "A", case_insensitive=False), 100000)
+    report("ensured (types converted)", lambda: getter_ensured(str(oid), 7, case_insensitive=1), 100000)
+
+
+@benchmark
+def model_decode():
+    """
+    Decode 100k documents of :class:`MessageRecordModel` and :class:`AutoReplyModuleModel` from the database.
+
+    Compares the decoding using the compiled schema (``from_db=True``) to constructing the model
+    using the field keys converted from the json keys, which is how the documents were decoded previously.
+    """
+    # pylint: disable=import-outside-toplevel
+    import django
+    import bson
+    from bson import ObjectId
+
+    django.setup()
+
+    from extutils.mongo import get_codec_options
+    from flags import MessageType, AutoReplyContentType
+    from models import MessageRecordModel, AutoReplyModuleModel, AutoReplyContentModel
+    # pylint: enable=import-outside-toplevel
+
+    count = 100000
+    codec_options = get_codec_options()
+
+    def make_docs(model_fn):
+        # Round-trip through BSON so the documents are shaped like the ones returned from `pymongo`
+        return [bson.decode(bson.encode(model_fn().to_json(), codec_options=codec_options),
+                            codec_options=codec_options)
+                for _ in range(count)]
+
+    docs = {
+        MessageRecordModel: make_docs(lambda: MessageRecordModel(
+            Id=ObjectId(), ChannelOid=ObjectId(), UserRootOid=ObjectId(), MessageType=MessageType.TEXT,
+            MessageContent="ABC", ProcessTimeSecs=0.5)),
+        AutoReplyModuleModel: make_docs(lambda: AutoReplyModuleModel(
+            Id=ObjectId(), ChannelOid=ObjectId(), CreatorOid=ObjectId(),
+            Keyword=AutoReplyContentModel(Content="A", ContentType=AutoReplyContentType.TEXT),
+            Responses=[AutoReplyContentModel(Content="B", ContentType=AutoReplyContentType.TEXT),
+                       AutoReplyContentModel(Content="C", ContentType=AutoReplyContentType.TEXT)],
+            TagIds=[ObjectId()]))
+    }
+
+    for model_cls, model_docs in docs.items():
+        def decode_kwargs(doc, cls=model_cls):
+            return cls(**{cls.json_key_to_field(jk): v for jk, v in doc.items()})
+
+        def decode_from_db(doc, cls=model_cls):
+            return cls(**doc, from_db=True)
+
+        results = []
+
+        for path, decode in (("kwargs", decode_kwargs), ("from_db", decode_from_db)):
+            doc_iter = iter(model_docs)
+
+            # Each document is decoded once
+            per_call_us = report(f"{model_cls.__qualname__} ({path})", lambda: decode(next(doc_iter)), count, repeat=1)
+            print(f"{'':<40} {per_call_us * count / 1E6:>10.2f} s/{count}")
+
+            results.append(per_call_us)
+
+        print(f"{'':<40} {results[0] / results[1]:>10.1f}x")
+
+
+def main():
+    """Run the benchmarks specified in the command line arguments, or all benchmarks if not specified."""
+    for name in sys.argv[1:] or BENCHMARKS:
+        print(f"=== {name} ===")
+        BENCHMARKS[name]()
+
+
+if __name__ == '__main__':
+    main()
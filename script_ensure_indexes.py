@@ -0,0 +1,21 @@
+"""Script to create the indexes of all collections. Should be run on each deployment."""
+import os
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "JellyBot.settings")
+
+
+def main():
+    """Main process."""
+    import django  # pylint: disable=import-outside-toplevel
+
+    django.setup()
+
+    # Inline import because the settings have to be set up first
+    from mongodb.factory import ensure_indexes  # pylint: disable=import-outside-toplevel
+
+    ensure_indexes()
+    print("=== Indexes ensured ===")
+
+
+if __name__ == '__main__':
+    main()
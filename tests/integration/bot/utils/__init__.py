@@ -1 +1,2 @@
 from .calculator import *  # noqa
+from .calcpool import *  # noqa
@@ -0,0 +1,67 @@
+import time
+from threading import Thread
+
+from sympy import Integer
+
+from bot.utils.calcpool import (
+    CalculatorPool, normalize_expression, KIND_OK, KIND_LIMIT, KIND_BUSY, KIND_RAISE
+)
+from tests.base import TestCase
+
+__all__ = ["TestCalculatorPool"]
+
+
+class TestCalculatorPool(TestCase):
+    def setUpTestCase(self) -> None:
+        self.pool = CalculatorPool(1, 1, 64, 2, 10, 0.2)
+
+    def tearDownTestCase(self) -> None:
+        self.pool.shutdown()
+
+    def test_normalize(self):
+        self.assertEqual("a = 7\n  a + 1", normalize_expression("a = 7  \n  a + 1 \t"))
+
+    def test_evaluate(self):
+        self.assertEqual((KIND_OK, Integer(10)), self.pool.evaluate("5+5"))
+
+    def test_timeout(self):
+        self.assertEqual((KIND_LIMIT, None), self.pool.evaluate("while True: pass\n1"))
+        # Worker should be restarted
+        self.assertEqual((KIND_OK, Integer(10)), self.pool.evaluate("5+5"))
+
+    def test_memory_limit(self):
+        self.assertEqual((KIND_LIMIT, None), self.pool.evaluate("a = [0] * 10 ** 9\n1"))
+        self.assertEqual((KIND_OK, Integer(10)), self.pool.evaluate("5+5"))
+
+    def test_raise(self):
+        kind, payload = self.pool.evaluate("a = 1 / 0\n1")
+
+        self.assertEqual(KIND_RAISE, kind)
+        self.assertIsInstance(payload, ZeroDivisionError)
+
+    def test_recycle(self):
+        for i in range(5):
+            self.assertEqual((KIND_OK, Integer(i)), self.pool.evaluate(f"{i}"))
+
+    def test_cached(self):
+        self.assertEqual((KIND_LIMIT, None), self.pool.evaluate("while True: pass\n1"))
+        # Cached, otherwise it takes 1 second
+        self.assertEqual((KIND_LIMIT, None), self.pool.evaluate("while True: pass  \n1"))
+
+        self.pool.clear_cache()
+        self.assertEqual((KIND_OK, Integer(10)), self.pool.evaluate("5+5"))
+
+    def test_all_workers_busy(self):
+        thread = Thread(target=self.pool.evaluate, args=("while True: pass\n1",))
+        thread.start()
+        # noinspection PyProtectedMember
+        while not self.pool._idle.empty():
+            time.sleep(0.01)
+
+        _start = time.time()
+        self.assertEqual((KIND_BUSY, None), self.pool.evaluate("5+5"))
+        self.assertLess(time.time() - _start, 0.8)
+
+        thread.join()
+        # Busy outcome should not be cached
+        self.assertEqual((KIND_OK, Integer(10)), self.pool.evaluate("5+5"))
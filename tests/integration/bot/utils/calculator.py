@@ -95,3 +95,17 @@ class TestBotCalculator(TestCase):
         self.assertEqual(expr, result.calc_expr, "Calculation expression not match.")
         self.assertFalse(result.latex_available, "LaTeX should not be available.")
         self.assertFalse(result.has_evaluated, "Expression should not be evaluated.")
+
+    def test_limit_exceeded(self):
+        expr = "while True: pass\n1"
+        self.assertEqual([], calculate_expression(expr))
+
+        result = calculate_expression(expr, output_error=True)
+
+        if not result:
+            self.fail("No error output")
+
+        result = result[0]
+
+        self.assertEqual("1", result.calc_expr, "Calculation expression not match.")
+        self.assertFalse(result.has_evaluated, "Expression should not be evaluated.")
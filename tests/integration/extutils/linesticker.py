@@ -1,6 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
 import copy
+from io import BytesIO
 import os
 from tempfile import TemporaryDirectory
+from unittest.mock import patch
 from zipfile import is_zipfile, ZipFile
 
 from django.urls import reverse
@@ -527,6 +530,75 @@ class TestLineStickerUtilsDownload(TestCase):
     def test_get_downloaded_pack_not_exists(self):
         self.assertIsNone(LineStickerUtils.get_downloaded_sticker_pack("1"))
 
+    def test_stream_pack(self):
+        stream_data = b"".join(LineStickerUtils.stream_sticker_pack("11952172"))
+
+        with ZipFile(BytesIO(stream_data)) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            name_list = zip_file.namelist()
+            self.assertGreater(len(name_list), 0)
+            self.assertTrue(all(f_name.endswith(".png") for f_name in name_list))
+
+        with LineStickerUtils.get_stored_sticker_pack("11952172") as f:
+            self.assertEqual(f.read(), stream_data)
+
+    def test_stream_pack_already_downloaded(self):
+        result = LineStickerUtils.download_sticker_pack("11952172")
+
+        self.assertTrue(result.succeed)
+
+        stream_data = b"".join(LineStickerUtils.stream_sticker_pack("11952172"))
+
+        with LineStickerUtils.get_stored_sticker_pack("11952172") as f:
+            self.assertEqual(f.read(), stream_data)
+
+    def test_stream_pack_concurrent(self):
+        stream = LineStickerUtils.stream_sticker_pack("11952172")
+        stream_data = next(stream)
+
+        # Streams after the first one follow the zip being written
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(lambda: b"".join(LineStickerUtils.stream_sticker_pack("11952172")))
+
+            stream_data += b"".join(stream)
+
+            self.assertEqual(future.result(), stream_data)
+
+        with LineStickerUtils.get_stored_sticker_pack("11952172") as f:
+            self.assertEqual(f.read(), stream_data)
+
+    def test_stream_pack_closed_early(self):
+        stream = LineStickerUtils.stream_sticker_pack("11952172")
+
+        self.assertGreater(len(next(stream)), 0)
+
+        stream.close()
+
+        # Zip is completed regardless of the closed stream
+        with LineStickerUtils.get_downloaded_sticker_pack("11952172") as f:
+            self.assertTrue(is_zipfile(f))
+
+    def test_stream_pack_download_failed(self):
+        sticker_ids = LineStickerUtils.get_pack_meta("11952172").sticker_ids
+        failed_id = sticker_ids[0]
+        get_downloaded_sticker = LineStickerUtils.get_downloaded_sticker
+
+        def get_sticker(sticker_id):
+            if sticker_id == failed_id:
+                raise ConnectionError()
+
+            return get_downloaded_sticker(sticker_id)
+
+        with patch.object(LineStickerUtils, "get_downloaded_sticker", side_effect=get_sticker):
+            stream_data = b"".join(LineStickerUtils.stream_sticker_pack("11952172"))
+
+        with ZipFile(BytesIO(stream_data)) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            self.assertEqual(sorted(f"{sid}.png" for sid in sticker_ids[1:]), sorted(zip_file.namelist()))
+
+    def test_stream_pack_not_exists(self):
+        self.assertIsNone(LineStickerUtils.stream_sticker_pack("1"))
+
 
 class TestLineStickerMetadata(TestCase):
     TEST_DICT = {
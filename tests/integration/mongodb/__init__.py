@@ -2,3 +2,4 @@ from .factory import *  # noqa
 from .helper import *  # noqa
 from .impl import *  # noqa
 from .results import *  # noqa
+from .utils import *  # noqa
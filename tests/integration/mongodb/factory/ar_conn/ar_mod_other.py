@@ -1,7 +1,7 @@
 import time
 
 from flags import AutoReplyContentType
-from models import AutoReplyContentModel
+from models import AutoReplyContentModel, AutoReplyModuleModel
 from models.ar import UniqueKeywordCountEntry
 from mongodb.factory.ar_conn import AutoReplyModuleManager
 from tests.base import TestModelMixin
@@ -199,3 +199,103 @@ class TestAutoReplyModuleManagerOther(TestModelMixin, TestAutoReplyModuleManager
         result = AutoReplyModuleManager.get_unique_keyword_count_stats(self.channel_oid)
         self.assertIsNone(result.limit)
         self.assertEqual(result.data, expected)
+
+    def test_get_kw_index_miss(self):
+        AutoReplyModuleManager.add_conn(**self.get_mdl_1_args())
+
+        self.assertIsNone(
+            AutoReplyModuleManager.get_conn("X", AutoReplyContentType.TEXT, self.get_mdl_1().channel_oid))
+        self.assertIsNone(
+            AutoReplyModuleManager.get_conn(
+                self.get_mdl_1().keyword.content, AutoReplyContentType.LINE_STICKER, self.get_mdl_1().channel_oid))
+
+    def test_get_kw_index_case_insensitive(self):
+        AutoReplyModuleManager.add_conn(**self.get_mdl_1_args())
+
+        mdl = AutoReplyModuleManager.get_conn(
+            self.get_mdl_1().keyword.content.lower(), self.get_mdl_1().keyword.content_type,
+            self.get_mdl_1().channel_oid, update_async=False)
+        self.assertIsNotNone(mdl)
+        self.assertEqual(mdl.keyword, self.get_mdl_1().keyword)
+
+    def _assert_kw_index_collation_equal(self, keyword: str, keyword_get: str):
+        args = self.get_mdl_1_args()
+        args["Keyword"] = AutoReplyContentModel(Content=keyword, ContentType=AutoReplyContentType.TEXT)
+        AutoReplyModuleManager.add_conn(**args)
+
+        mdl = AutoReplyModuleManager.get_conn(
+            keyword_get, AutoReplyContentType.TEXT, self.get_mdl_1().channel_oid, update_async=False)
+        self.assertIsNotNone(mdl)
+        self.assertEqual(mdl.keyword.content, keyword)
+
+    def test_get_kw_index_collation_stroke(self):
+        self._assert_kw_index_collation_equal("ø", "o")
+
+    def test_get_kw_index_collation_stroke_reversed(self):
+        self._assert_kw_index_collation_equal("o", "ø")
+
+    def test_get_kw_index_collation_kana(self):
+        self._assert_kw_index_collation_equal("あ", "ア")
+
+    def test_get_kw_index_collation_kana_reversed(self):
+        self._assert_kw_index_collation_equal("ア", "あ")
+
+    def test_get_kw_index_after_add(self):
+        # Load the keyword index of the channel
+        self.assertIsNone(
+            AutoReplyModuleManager.get_conn(
+                self.get_mdl_1().keyword.content, self.get_mdl_1().keyword.content_type,
+                self.get_mdl_1().channel_oid))
+
+        AutoReplyModuleManager.add_conn(**self.get_mdl_1_args())
+
+        self.assertIsNotNone(
+            AutoReplyModuleManager.get_conn(
+                self.get_mdl_1().keyword.content, self.get_mdl_1().keyword.content_type,
+                self.get_mdl_1().channel_oid, update_async=False))
+
+    def test_get_kw_index_after_del(self):
+        AutoReplyModuleManager.add_conn(**self.get_mdl_1_args())
+
+        # Load the keyword index of the channel
+        self.assertIsNotNone(
+            AutoReplyModuleManager.get_conn(
+                self.get_mdl_1().keyword.content, self.get_mdl_1().keyword.content_type,
+                self.get_mdl_1().channel_oid, update_async=False))
+
+        AutoReplyModuleManager.module_mark_inactive(
+            self.get_mdl_1().keyword.content, self.get_mdl_1().channel_oid, self.CREATOR_OID)
+
+        self.assertIsNone(
+            AutoReplyModuleManager.get_conn(
+                self.get_mdl_1().keyword.content, self.get_mdl_1().keyword.content_type,
+                self.get_mdl_1().channel_oid, update_async=False))
+
+    def test_get_kw_index_after_insert(self):
+        # Load the keyword index of the channel
+        self.assertIsNone(
+            AutoReplyModuleManager.get_conn(
+                self.get_mdl_1().keyword.content, self.get_mdl_1().keyword.content_type,
+                self.get_mdl_1().channel_oid))
+
+        AutoReplyModuleManager.insert_one_model(self.get_mdl_1())
+
+        self.assertIsNotNone(
+            AutoReplyModuleManager.get_conn(
+                self.get_mdl_1().keyword.content, self.get_mdl_1().keyword.content_type,
+                self.get_mdl_1().channel_oid, update_async=False))
+
+    def test_get_count_call_accumulated(self):
+        mdl = AutoReplyModuleManager.add_conn(**self.get_mdl_1_args()).model
+        self.assertEqual(mdl.called_count, 0)
+
+        for i in range(1, 4):
+            mdl = AutoReplyModuleManager.get_conn(
+                self.get_mdl_1().keyword.content, self.get_mdl_1().keyword.content_type, self.get_mdl_1().channel_oid)
+            self.assertEqual(mdl.called_count, i)
+
+        AutoReplyModuleManager.flush_called_count()
+
+        mdl = AutoReplyModuleManager.find_one_casted({AutoReplyModuleModel.Id.key: mdl.id})
+        self.assertEqual(mdl.called_count, 3)
+        self.assertIsNotNone(mdl.last_used)
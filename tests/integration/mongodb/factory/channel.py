@@ -95,6 +95,29 @@ class TestChannelManager(TestModelMixin, TestDatabaseMixin):
         self.assertTrue(result.success)
         self.assertEqual(result.model, mdl)
 
+    def test_register_exists_cached(self):
+        mdl = ChannelManager.ensure_register(Platform.LINE, "U1234567").model
+
+        # Deleting without invalidation to check if the data is returned from the cache
+        ChannelManager.delete_many({})
+
+        result = ChannelManager.ensure_register(Platform.LINE, "U1234567")
+
+        self.assertEqual(result.outcome, WriteOutcome.O_DATA_EXISTS)
+        self.assertEqual(result.model, mdl)
+
+    def test_register_cache_invalidated(self):
+        mdl = ChannelManager.ensure_register(Platform.LINE, "U1234567").model
+
+        ChannelManager.set_config(mdl.id, ChannelConfigModel.InfoPrivate.key, True)
+        self.assertTrue(ChannelManager.ensure_register(Platform.LINE, "U1234567").model.config.info_private)
+
+        ChannelManager.mark_accessibility(Platform.LINE, "U1234567", False)
+        self.assertFalse(ChannelManager.ensure_register(Platform.LINE, "U1234567").model.bot_accessible)
+
+        ChannelManager.update_channel_default_name(Platform.LINE, "U1234567", "N")
+        self.assertEqual(ChannelManager.ensure_register(Platform.LINE, "U1234567").model.config.default_name, "N")
+
     def test_register_default_name(self):
         result = ChannelManager.ensure_register(Platform.LINE, "U1234567", default_name="N")
 
@@ -213,6 +213,23 @@ class TestProfileManagerCRUD(TestModelMixin, TestDatabaseMixin):
         self.assertEqual(result.attach_outcome, OperationOutcome.O_COMPLETED)
         self.assertModelEqual(ProfileDataManager.find_one_casted(), result.model)
 
+    def test_register_new_default_async_known_available(self):
+        ChannelManager.clear()
+        channel_oid = ChannelManager.ensure_register(Platform.LINE, "U123456").model.id
+
+        ProfileManager.register_new_default_async(channel_oid, self.USER_OID)
+        self.assertEqual(UserProfileManager.count_documents({}), 1)
+
+        # Registration skipped because the user is known to be in the channel
+        UserProfileManager.delete_many({})
+        ProfileManager.register_new_default_async(channel_oid, self.USER_OID)
+        self.assertEqual(UserProfileManager.count_documents({}), 0)
+
+        # Registration performed again after the user left
+        ProfileManager.mark_unavailable_async(channel_oid, self.USER_OID).result()
+        ProfileManager.register_new_default_async(channel_oid, self.USER_OID)
+        self.assertEqual(UserProfileManager.count_documents({}), 1)
+
     def test_register_new_default_channel_not_found(self):
         ChannelManager.clear()
 
@@ -554,7 +571,7 @@ class TestProfileManagerCRUD(TestModelMixin, TestDatabaseMixin):
                                           ProfileOids=[mdl.id, mdl2.id])
         )
 
-        ProfileManager.mark_unavailable_async(self.CHANNEL_OID, self.USER_OID).join()
+        ProfileManager.mark_unavailable_async(self.CHANNEL_OID, self.USER_OID).result()
 
         self.assertModelEqual(
             UserProfileManager.find_one_casted(),
@@ -574,7 +591,7 @@ class TestProfileManagerCRUD(TestModelMixin, TestDatabaseMixin):
                                           ProfileOids=[mdl.id, mdl2.id])
         )
 
-        ProfileManager.mark_unavailable_async(self.CHANNEL_OID, self.USER_OID_2).join()
+        ProfileManager.mark_unavailable_async(self.CHANNEL_OID, self.USER_OID_2).result()
 
         self.assertModelEqual(
             UserProfileManager.find_one_casted(),
@@ -596,6 +596,72 @@ class TestProfileManagerGetInfo(TestModelMixin, TestDatabaseMixin):
     def test_user_perms_no_data(self):
         self.assertEqual(ProfileManager.get_user_permissions(self.CHANNEL_OID, self.USER_OID), set())
 
+    def test_user_perms_cache_update_profile(self):
+        mdl = ChannelProfileModel(ChannelOid=self.CHANNEL_OID, Name="ABC",
+                                  Permission={ProfilePermission.AR_ACCESS_PINNED_MODULE.code_str: True})
+        ProfileDataManager.insert_one_model(mdl)
+        UserProfileManager.insert_one_model(
+            ChannelProfileConnectionModel(ChannelOid=self.CHANNEL_OID, UserOid=self.USER_OID, ProfileOids=[mdl.id])
+        )
+
+        perms = ProfilePermissionDefault.get_overridden_permissions(PermissionLevel.NORMAL)
+
+        self.assertEqual(ProfileManager.get_user_permissions(self.CHANNEL_OID, self.USER_OID),
+                         perms | {ProfilePermission.AR_ACCESS_PINNED_MODULE})
+
+        ProfileManager.update_profile(
+            self.CHANNEL_OID, self.USER_OID, mdl.id,
+            **{f"{ChannelProfileModel.Permission.key}.{ProfilePermission.AR_ACCESS_PINNED_MODULE.code_str}": False})
+
+        self.assertEqual(ProfileManager.get_user_permissions(self.CHANNEL_OID, self.USER_OID), perms)
+
+    def test_user_perms_cache_mark_unavailable(self):
+        mdl = ChannelProfileModel(ChannelOid=self.CHANNEL_OID, Name="ABC")
+        ProfileDataManager.insert_one_model(mdl)
+        UserProfileManager.insert_one_model(
+            ChannelProfileConnectionModel(ChannelOid=self.CHANNEL_OID, UserOid=self.USER_OID, ProfileOids=[mdl.id])
+        )
+
+        self.assertEqual(ProfileManager.get_user_permissions(self.CHANNEL_OID, self.USER_OID),
+                         ProfilePermissionDefault.get_overridden_permissions(PermissionLevel.NORMAL))
+
+        ProfileManager.mark_unavailable_async(self.CHANNEL_OID, self.USER_OID).result()
+
+        self.assertEqual(ProfileManager.get_user_permissions(self.CHANNEL_OID, self.USER_OID), set())
+
+    def test_user_perms_dict(self):
+        mdl = ChannelProfileModel(ChannelOid=self.CHANNEL_OID, Name="ABC", PermissionLevel=PermissionLevel.MOD)
+        mdl2 = ChannelProfileModel(ChannelOid=self.CHANNEL_OID, Name="DEF",
+                                   Permission={ProfilePermission.PRF_CED.code_str: True})
+        ProfileDataManager.insert_one_model(mdl)
+        ProfileDataManager.insert_one_model(mdl2)
+        UserProfileManager.insert_one_model(
+            ChannelProfileConnectionModel(ChannelOid=self.CHANNEL_OID, UserOid=self.USER_OID,
+                                          ProfileOids=[mdl.id, mdl2.id])
+        )
+        UserProfileManager.insert_one_model(
+            ChannelProfileConnectionModel(ChannelOid=self.CHANNEL_OID, UserOid=self.USER_OID_2,
+                                          ProfileOids=[mdl2.id])
+        )
+        UserProfileManager.insert_one_model(
+            ChannelProfileConnectionModel(ChannelOid=self.CHANNEL_OID, UserOid=self.USER_OID_3, ProfileOids=[])
+        )
+
+        expected = {
+            self.USER_OID: ProfilePermissionDefault.get_overridden_permissions(PermissionLevel.MOD)
+            | {ProfilePermission.PRF_CED},
+            self.USER_OID_2: ProfilePermissionDefault.get_overridden_permissions(PermissionLevel.NORMAL)
+            | {ProfilePermission.PRF_CED},
+            self.USER_OID_3: set()
+        }
+
+        self.assertEqual(ProfileManager.get_user_permissions_dict(self.CHANNEL_OID), expected)
+        for uid, perms in expected.items():
+            self.assertEqual(ProfileManager.get_user_permissions(self.CHANNEL_OID, uid), perms)
+
+    def test_user_perms_dict_no_data(self):
+        self.assertEqual(ProfileManager.get_user_permissions_dict(self.CHANNEL_OID), {})
+
     def test_channel_prof_conn(self):
         mdl = ChannelProfileConnectionModel(ChannelOid=self.CHANNEL_OID, UserOid=self.USER_OID,
                                             ProfileOids=[self.PROF_OID_1])
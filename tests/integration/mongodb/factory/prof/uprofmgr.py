@@ -620,3 +620,57 @@ class TestUserProfileManager(TestModelMixin, TestDatabaseMixin):
         self.assertFalse(changed)
         changed = UserProfileManager.change_star(self.CHANNEL_OID, ObjectId(), True)
         self.assertFalse(changed)
+
+    def test_known_available_attach(self):
+        self.assertFalse(UserProfileManager.is_known_available(self.CHANNEL_OID, self.USER_OID))
+
+        UserProfileManager.user_attach_profile(self.CHANNEL_OID, self.USER_OID, self.PROF_OID_1)
+
+        self.assertTrue(UserProfileManager.is_known_available(self.CHANNEL_OID, self.USER_OID))
+        self.assertFalse(UserProfileManager.is_known_available(self.CHANNEL_OID_2, self.USER_OID))
+        self.assertFalse(UserProfileManager.is_known_available(self.CHANNEL_OID, self.USER_OID_2))
+
+    def test_known_available_mark_unavailable(self):
+        UserProfileManager.user_attach_profile(self.CHANNEL_OID, self.USER_OID, self.PROF_OID_1)
+        UserProfileManager.user_attach_profile(self.CHANNEL_OID, self.USER_OID_2, self.PROF_OID_1)
+
+        UserProfileManager.mark_unavailable(self.CHANNEL_OID, self.USER_OID)
+
+        self.assertFalse(UserProfileManager.is_known_available(self.CHANNEL_OID, self.USER_OID))
+        self.assertTrue(UserProfileManager.is_known_available(self.CHANNEL_OID, self.USER_OID_2))
+
+    def test_known_available_detach(self):
+        UserProfileManager.user_attach_profile(self.CHANNEL_OID, self.USER_OID, self.PROF_OID_1)
+        UserProfileManager.user_attach_profile(self.CHANNEL_OID, self.USER_OID_2, self.PROF_OID_1)
+
+        UserProfileManager.detach_profile(self.PROF_OID_1, self.USER_OID)
+
+        self.assertFalse(UserProfileManager.is_known_available(self.CHANNEL_OID, self.USER_OID))
+        self.assertTrue(UserProfileManager.is_known_available(self.CHANNEL_OID, self.USER_OID_2))
+
+        UserProfileManager.detach_profile(self.PROF_OID_1)
+
+        self.assertFalse(UserProfileManager.is_known_available(self.CHANNEL_OID, self.USER_OID_2))
+
+    def test_known_available_detach_other_channel(self):
+        UserProfileManager.user_attach_profile(self.CHANNEL_OID, self.USER_OID, self.PROF_OID_1)
+        UserProfileManager.user_attach_profile(self.CHANNEL_OID_2, self.USER_OID, self.PROF_OID_2)
+        UserProfileManager.user_attach_profile(self.CHANNEL_OID_2, self.USER_OID_2, self.PROF_OID_2)
+
+        UserProfileManager.detach_profile(self.PROF_OID_1)
+
+        self.assertFalse(UserProfileManager.is_known_available(self.CHANNEL_OID, self.USER_OID))
+        self.assertTrue(UserProfileManager.is_known_available(self.CHANNEL_OID_2, self.USER_OID))
+        self.assertTrue(UserProfileManager.is_known_available(self.CHANNEL_OID_2, self.USER_OID_2))
+
+        UserProfileManager.detach_profile(self.PROF_OID_2, self.USER_OID, channel_oid=self.CHANNEL_OID_2)
+
+        self.assertFalse(UserProfileManager.is_known_available(self.CHANNEL_OID_2, self.USER_OID))
+        self.assertTrue(UserProfileManager.is_known_available(self.CHANNEL_OID_2, self.USER_OID_2))
+
+    def test_known_available_clear(self):
+        UserProfileManager.user_attach_profile(self.CHANNEL_OID, self.USER_OID, self.PROF_OID_1)
+
+        UserProfileManager.clear()
+
+        self.assertFalse(UserProfileManager.is_known_available(self.CHANNEL_OID, self.USER_OID))
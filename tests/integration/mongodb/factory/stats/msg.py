@@ -138,6 +138,56 @@ class TestMessageRecordStatisticsManager(TestTimeComparisonMixin, TestModelMixin
         self.assertEqual(MessageRecordStatisticsManager.get_message_frequency(self.CHANNEL_OID), 0)
         self.assertEqual(MessageRecordStatisticsManager.get_message_frequency(self.CHANNEL_OID_2), 0)
 
+    def test_get_recent_msg_freq(self):
+        now = datetime.utcnow().replace(tzinfo=pytz.utc)
+
+        MessageRecordStatisticsManager.insert_many([
+            MessageRecordModel(Id=ObjectId.from_datetime(now - timedelta(hours=hrs)),
+                               ChannelOid=self.CHANNEL_OID, UserRootOid=self.USER_OID,
+                               MessageType=MessageType.TEXT, MessageContent="ABC", ProcessTimeSecs=2.13)
+            for hrs in (30, 5, 3, 1)
+        ])
+
+        # Loaded from the database
+        self.assertAlmostEqual(
+            MessageRecordStatisticsManager.get_recent_message_frequency(self.CHANNEL_OID),
+            MessageRecordStatisticsManager.get_message_frequency(self.CHANNEL_OID, 1440),
+            places=2
+        )
+
+        MessageRecordStatisticsManager.record_message_async(
+            self.CHANNEL_OID, self.USER_OID, MessageType.TEXT, "DEF", 2.13)
+
+        # Fed by the recorded message
+        self.assertAlmostEqual(
+            MessageRecordStatisticsManager.get_recent_message_frequency(self.CHANNEL_OID),
+            MessageRecordStatisticsManager.get_message_frequency(self.CHANNEL_OID, 1440),
+            places=2
+        )
+
+    def test_record_message_buffered(self):
+        MessageRecordStatisticsManager.record_message_buffered(
+            self.CHANNEL_OID, self.USER_OID, MessageType.TEXT, "ABC", 2.13)
+        MessageRecordStatisticsManager.record_message_buffered(
+            self.CHANNEL_OID, self.USER_OID, MessageType.TEXT, "DEF", 2.13)
+
+        self.assertEqual(MessageRecordStatisticsManager.count_documents({}), 0)
+
+        MessageRecordStatisticsManager.flush_buffered_messages()
+
+        self.assertEqual(
+            [msg.message_content for msg in MessageRecordStatisticsManager.get_recent_messages(self.CHANNEL_OID)],
+            ["DEF", "ABC"]
+        )
+
+    def test_get_recent_msg_freq_no_msg(self):
+        self.assertEqual(MessageRecordStatisticsManager.get_recent_message_frequency(self.CHANNEL_OID), 0)
+
+        MessageRecordStatisticsManager.record_message_async(
+            self.CHANNEL_OID, self.USER_OID, MessageType.TEXT, "DEF", 2.13)
+
+        self.assertEqual(MessageRecordStatisticsManager.get_recent_message_frequency(self.CHANNEL_OID), 0)
+
     def test_get_user_last_ts(self):
         self._insert_messages()
 
@@ -2671,3 +2721,73 @@ class TestMessageRecordStatisticsManager(TestTimeComparisonMixin, TestModelMixin
                 "2020-06-02": {}
             }
         )
+
+    def _get_stats_with_hourly_counts(self, get_stats):
+        # Partial hours at both ends are counted from the message records
+        kwargs = {
+            "start": datetime(2020, 5, 31, 2, 30, tzinfo=pytz.utc),
+            "end": datetime(2020, 6, 2, 1, 30, tzinfo=pytz.utc),
+            "tzinfo_": LocaleInfo.get_tzinfo("Asia/Taipei")
+        }
+
+        self._insert_messages_4()
+        expected = get_stats(**kwargs)
+
+        self.assertGreater(MessageRecordStatisticsManager.catch_up_hourly_counts(), 0)
+
+        return expected, get_stats(**kwargs)
+
+    def test_catch_up_hourly_counts(self):
+        self._insert_messages_4()
+
+        until = datetime(2020, 6, 1, tzinfo=pytz.utc)
+
+        self.assertEqual(MessageRecordStatisticsManager.catch_up_hourly_counts(until), 3)
+        # Hours before the latest hour should not be aggregated again
+        self.assertEqual(MessageRecordStatisticsManager.catch_up_hourly_counts(until), 1)
+
+    def test_catch_up_hourly_counts_no_data(self):
+        self.assertEqual(MessageRecordStatisticsManager.catch_up_hourly_counts(), 0)
+
+    def test_hourly_counts_by_category(self):
+        expected, actual = self._get_stats_with_hourly_counts(
+            lambda **kwargs: MessageRecordStatisticsManager.get_user_messages_by_category(
+                [self.CHANNEL_OID, self.CHANNEL_OID_2], **kwargs))
+
+        self.assertEqual(actual.data, expected.data)
+
+    def test_hourly_counts_hr_avg(self):
+        expected, actual = self._get_stats_with_hourly_counts(
+            lambda **kwargs: MessageRecordStatisticsManager.hourly_interval_message_count(
+                [self.CHANNEL_OID, self.CHANNEL_OID_2], **kwargs))
+
+        self.assertEqual(actual.data, expected.data)
+
+    def test_hourly_counts_daily(self):
+        expected, actual = self._get_stats_with_hourly_counts(
+            lambda **kwargs: MessageRecordStatisticsManager.daily_message_count(
+                [self.CHANNEL_OID, self.CHANNEL_OID_2], **kwargs))
+
+        self.assertEqual(actual.data, expected.data)
+        self.assertEqual(actual.data_sum, expected.data_sum)
+
+    def test_hourly_counts_mean(self):
+        expected, actual = self._get_stats_with_hourly_counts(
+            lambda **kwargs: MessageRecordStatisticsManager.mean_message_count(
+                [self.CHANNEL_OID, self.CHANNEL_OID_2], **kwargs))
+
+        self.assertEqual(actual.data, expected.data)
+
+    def test_hourly_counts_before_time(self):
+        expected, actual = self._get_stats_with_hourly_counts(
+            lambda **kwargs: MessageRecordStatisticsManager.message_count_before_time(
+                [self.CHANNEL_OID, self.CHANNEL_OID_2], **kwargs))
+
+        self.assertEqual(actual.data_count, expected.data_count)
+
+    def test_hourly_counts_member_daily(self):
+        expected, actual = self._get_stats_with_hourly_counts(
+            lambda **kwargs: MessageRecordStatisticsManager.member_daily_message_count(
+                [self.CHANNEL_OID, self.CHANNEL_OID_2], **kwargs))
+
+        self.assertEqual(actual.data_count, expected.data_count)
@@ -651,6 +651,142 @@ class TestTimerManager(TestModelMixin, TestTimeComparisonMixin):
 
         self.assertEqual(len(result), 0)
 
+    def test_get_notify_added_after_loaded(self):
+        timer_time = now_utc_aware(for_mongo=True) + timedelta(seconds=580)
+
+        # Load the timers of the channel
+        self.assertEqual(len(TimerManager.get_notify(TestTimerManager.CHANNEL_OID, 600)), 0)
+
+        outcome = TimerManager.add_new_timer(TestTimerManager.CHANNEL_OID, "KEYWORD", "FUTURE", timer_time)
+        self.assertEqual(outcome, WriteOutcome.O_INSERTED)
+
+        result = TimerManager.get_notify(TestTimerManager.CHANNEL_OID, 600)
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].title, "FUTURE")
+
+    def test_get_notify_deleted_after_loaded(self):
+        timer_time = now_utc_aware(for_mongo=True) + timedelta(seconds=580)
+
+        outcome, ex = TimerManager.insert_one_model(
+            TimerModel(
+                ChannelOid=TestTimerManager.CHANNEL_OID, Keyword="KEYWORD", Title="FUTURE",
+                TargetTime=timer_time
+            )
+        )
+        self.assertEqual(outcome, WriteOutcome.O_INSERTED)
+
+        # Load the timers of the channel
+        self.assertTrue(TimerManager.has_timer_to_notify(TestTimerManager.CHANNEL_OID))
+
+        TimerManager.del_timer(TimerManager.find_one_casted().id)
+
+        self.assertFalse(TimerManager.has_timer_to_notify(TestTimerManager.CHANNEL_OID))
+        self.assertEqual(len(TimerManager.get_notify(TestTimerManager.CHANNEL_OID, 600)), 0)
+
+    def test_get_notify_claimed_by_others(self):
+        timer_time = now_utc_aware(for_mongo=True) + timedelta(seconds=580)
+
+        outcome, ex = TimerManager.insert_one_model(
+            TimerModel(
+                ChannelOid=TestTimerManager.CHANNEL_OID, Keyword="KEYWORD", Title="FUTURE",
+                TargetTime=timer_time
+            )
+        )
+        self.assertEqual(outcome, WriteOutcome.O_INSERTED)
+
+        # Load the timers of the channel
+        self.assertTrue(TimerManager.has_timer_to_notify(TestTimerManager.CHANNEL_OID))
+
+        # Notified by the other process
+        TimerManager.update_many({}, {"$set": {TimerModel.Notified.key: True}})
+
+        self.assertEqual(len(TimerManager.get_notify(TestTimerManager.CHANNEL_OID, 600)), 0)
+
+    def test_get_notify_added_by_others_after_claim_miss(self):
+        timer_time = now_utc_aware(for_mongo=True) + timedelta(seconds=580)
+
+        outcome, ex = TimerManager.insert_one_model(
+            TimerModel(
+                ChannelOid=TestTimerManager.CHANNEL_OID, Keyword="KEYWORD", Title="FUTURE",
+                TargetTime=timer_time
+            )
+        )
+        self.assertEqual(outcome, WriteOutcome.O_INSERTED)
+
+        # Load the timers of the channel
+        self.assertTrue(TimerManager.has_timer_to_notify(TestTimerManager.CHANNEL_OID))
+
+        # Notified and added by the other process
+        TimerManager.update_many({}, {"$set": {TimerModel.Notified.key: True}})
+        outcome, ex = TimerManager.insert_one_model(
+            TimerModel(
+                ChannelOid=TestTimerManager.CHANNEL_OID, Keyword="KEYWORD", Title="FUTURE 2",
+                TargetTime=timer_time
+            )
+        )
+        self.assertEqual(outcome, WriteOutcome.O_INSERTED)
+
+        self.assertEqual(len(TimerManager.get_notify(TestTimerManager.CHANNEL_OID, 600)), 0)
+
+        result = TimerManager.get_notify(TestTimerManager.CHANNEL_OID, 600)
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].title, "FUTURE 2")
+
+    def test_get_notify_added_by_others_on_miss(self):
+        reload_secs_org = Bot.Timer.ScheduleMissReloadSeconds
+        Bot.Timer.ScheduleMissReloadSeconds = 0
+
+        try:
+            # Load the timers of the channel
+            self.assertFalse(TimerManager.has_timer_to_notify(TestTimerManager.CHANNEL_OID))
+
+            # Added by the other process
+            outcome, ex = TimerManager.insert_one_model(
+                TimerModel(
+                    ChannelOid=TestTimerManager.CHANNEL_OID, Keyword="KEYWORD", Title="FUTURE",
+                    TargetTime=now_utc_aware(for_mongo=True) + timedelta(seconds=580)
+                )
+            )
+            self.assertEqual(outcome, WriteOutcome.O_INSERTED)
+
+            self.assertTrue(TimerManager.has_timer_to_notify(TestTimerManager.CHANNEL_OID))
+
+            result = TimerManager.get_notify(TestTimerManager.CHANNEL_OID, 600)
+
+            self.assertEqual(len(result), 1)
+            self.assertEqual(result[0].title, "FUTURE")
+        finally:
+            Bot.Timer.ScheduleMissReloadSeconds = reload_secs_org
+
+    def test_has_timer_to_notify(self):
+        outcome, ex = TimerManager.insert_one_model(
+            TimerModel(
+                ChannelOid=TestTimerManager.CHANNEL_OID, Keyword="KEYWORD", Title="PAST",
+                TargetTime=now_utc_aware(for_mongo=True) - timedelta(seconds=10)
+            )
+        )
+        self.assertEqual(outcome, WriteOutcome.O_INSERTED)
+
+        self.assertTrue(TimerManager.has_timer_to_notify(TestTimerManager.CHANNEL_OID))
+
+        TimerManager.get_time_up(TestTimerManager.CHANNEL_OID)
+
+        self.assertFalse(TimerManager.has_timer_to_notify(TestTimerManager.CHANNEL_OID))
+
+    def test_has_timer_to_notify_out_of_range(self):
+        outcome, ex = TimerManager.insert_one_model(
+            TimerModel(
+                ChannelOid=TestTimerManager.CHANNEL_OID, Keyword="KEYWORD", Title="FUTURE",
+                TargetTime=now_utc_aware(for_mongo=True) + timedelta(seconds=Bot.Timer.MaxNotifyRangeSeconds * 2)
+            )
+        )
+        self.assertEqual(outcome, WriteOutcome.O_INSERTED)
+
+        self.assertFalse(TimerManager.has_timer_to_notify(TestTimerManager.CHANNEL_OID))
+        self.assertFalse(TimerManager.has_timer_to_notify(ObjectId()))
+
     def test_get_time_up(self):
         timer_time = now_utc_aware(for_mongo=True) - timedelta(seconds=10)
         timer_time_2 = now_utc_aware(for_mongo=True) + timedelta(seconds=600)
@@ -783,6 +919,23 @@ class TestTimerManager(TestModelMixin, TestTimeComparisonMixin):
             1
         )
 
+    def test_get_time_up_claimed_by_others(self):
+        outcome, ex = TimerManager.insert_one_model(
+            TimerModel(
+                ChannelOid=TestTimerManager.CHANNEL_OID, Keyword="KEYWORD", Title="PAST",
+                TargetTime=now_utc_aware(for_mongo=True) - timedelta(seconds=10)
+            )
+        )
+        self.assertEqual(outcome, WriteOutcome.O_INSERTED)
+
+        # Load the timers of the channel
+        self.assertTrue(TimerManager.has_timer_to_notify(TestTimerManager.CHANNEL_OID))
+
+        # Notified by the other process
+        TimerManager.update_many({}, {"$set": {TimerModel.NotifiedExpired.key: True}})
+
+        self.assertEqual(len(TimerManager.get_time_up(TestTimerManager.CHANNEL_OID)), 0)
+
     def test_get_time_up_channel_miss(self):
         timer_time = now_utc_aware(for_mongo=True) - timedelta(seconds=10)
 
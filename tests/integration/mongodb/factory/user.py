@@ -220,6 +220,27 @@ class TestRootUserManager(TestModelMixin):
                           Config=RootUserConfigModel.generate_default())
         )
 
+    def test_register_onplat_cached(self):
+        mdl = RootUserManager.register_onplat(Platform.LINE, "U123456").model
+
+        # Deleting without invalidation to check if the data is returned from the cache
+        RootUserManager.delete_many({})
+
+        result = RootUserManager.register_onplat(Platform.LINE, "U123456")
+
+        self.assertEqual(result.outcome, WriteOutcome.O_DATA_EXISTS)
+        self.assertTrue(result.success)
+        self.assertEqual(result.model, mdl)
+
+    def test_register_onplat_cache_invalidated(self):
+        mdl = RootUserManager.register_onplat(Platform.LINE, "U123456").model
+
+        RootUserManager.update_config(mdl.id, Name="UserName")
+
+        result = RootUserManager.register_onplat(Platform.LINE, "U123456")
+
+        self.assertEqual(result.model.config.name, "UserName")
+
     def test_register_google(self):
         result = RootUserManager.register_google(self.GOO_IDENTITY)
 
@@ -187,6 +187,85 @@ class TestControlExtensionMixin(TestModelMixin, TestDatabaseMixin):
             with self.subTest(expected_mdl):
                 self.assertModelEqual(actual_mdl, expected_mdl)
 
+    def test_find_cursor_with_count_lazy(self):
+        self.collection.insert_many([
+            {"i": 7, "b": True},
+            {"i": 8, "b": True}
+        ])
+
+        crs = self.collection.find_cursor_with_count()
+
+        self.collection.insert_one({"i": 9, "b": True})
+
+        self.assertEqual(3, len(crs))
+
+    def test_find_cursor_without_count(self):
+        self.collection.insert_many([
+            {"i": 7, "b": True},
+            {"i": 8, "b": True}
+        ])
+
+        crs = self.collection.find_cursor_with_count(with_count=False)
+
+        self.assertFalse(crs.count_available)
+        self.assertFalse(crs.empty)
+        with self.assertRaises(TypeError):
+            len(crs)
+
+        self.assertModelSequenceEqual(
+            list(crs), [ModelTest(i=7, b=True, from_db=True), ModelTest(i=8, b=True, from_db=True)])
+
+        self.assertTrue(self.collection.find_cursor_with_count({"i": 9}, with_count=False).empty)
+
+    def test_find_cursor_without_count_list(self):
+        self.collection.insert_many([
+            {"i": 7, "b": True},
+            {"i": 8, "b": True}
+        ])
+
+        count_calls = []
+        count_documents = self.collection.count_documents
+
+        def _count_documents(*args, **kwargs):
+            count_calls.append(args)
+            return count_documents(*args, **kwargs)
+
+        self.collection.count_documents = _count_documents
+
+        try:
+            # `list()` calls `len()` for the length hint
+            self.assertEqual(2, len(list(self.collection.find_cursor_with_count())))
+            self.assertEqual(1, len(count_calls))
+
+            count_calls.clear()
+
+            self.assertEqual(2, len(list(self.collection.find_cursor_with_count(with_count=False))))
+            self.assertEqual(2, len(tuple(self.collection.find_cursor_with_count(with_count=False))))
+            self.assertEqual(0, len(count_calls))
+        finally:
+            del self.collection.count_documents
+
+    def test_find_cursor_with_count_limit(self):
+        self.collection.insert_many([
+            {"i": 7, "b": True},
+            {"i": 8, "b": True},
+            {"i": 9, "b": True}
+        ])
+
+        crs = self.collection.find_cursor_with_count(count_limit=2)
+
+        self.assertEqual(2, len(crs))
+        self.assertEqual(3, len(list(crs)))
+
+    def test_find_cursor_with_count_estimated(self):
+        self.collection.insert_many([
+            {"i": 7, "b": True},
+            {"i": 8, "b": False}
+        ])
+
+        self.assertEqual(2, len(self.collection.find_cursor_with_count(estimate_count=True)))
+        self.assertEqual(1, len(self.collection.find_cursor_with_count({"b": True}, estimate_count=True)))
+
     def test_find_cursor_with_count_with_date(self):
         self.collection.insert_many([
             {"_id": ObjectId.from_datetime(datetime(2020, 8, 21)), "i": 4, "b": True},
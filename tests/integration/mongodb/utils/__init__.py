@@ -0,0 +1,2 @@
+from .accum import *  # noqa
+from .insbuf import *  # noqa
@@ -0,0 +1,104 @@
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo.errors import PyMongoError
+
+from mongodb.utils import IncrementAccumulator
+from tests.base import TestDatabaseMixin
+
+__all__ = ["TestIncrementAccumulator"]
+
+
+class TestIncrementAccumulator(TestDatabaseMixin):
+    collection = None
+
+    @classmethod
+    def setUpTestClass(cls):
+        cls.collection = cls.get_collection("testaccum")
+
+    def setUpTestCase(self) -> None:
+        self.collection.delete_many({})
+
+    def test_accumulate(self):
+        oid = ObjectId()
+        self.collection.insert_one({"_id": oid, "c": 3, "l": None})
+
+        accum = IncrementAccumulator(self.collection, "c", "l", 60, 100)
+        dt_1 = datetime(2020, 5, 1)
+        dt_2 = datetime(2020, 5, 2)
+
+        accum.add(oid, dt_2)
+        accum.add(oid, dt_1)
+        accum.add(oid, dt_1, 3)
+
+        self.assertEqual(accum.get_pending(oid), (5, dt_2))
+        self.assertIsNone(accum.get_pending(ObjectId()))
+        self.assertEqual(self.collection.find_one({"_id": oid})["c"], 3)
+
+        accum.flush()
+
+        self.assertIsNone(accum.get_pending(oid))
+        doc = self.collection.find_one({"_id": oid})
+        self.assertEqual(doc["c"], 8)
+        self.assertEqual(doc["l"], dt_2)
+
+        accum.close()
+
+    def test_flush_on_threshold(self):
+        oids = [ObjectId() for _ in range(3)]
+        self.collection.insert_many([{"_id": oid, "c": 0} for oid in oids])
+
+        accum = IncrementAccumulator(self.collection, "c", "l", 60, 3)
+        now = datetime.utcnow()
+
+        accum.add(oids[0], now)
+        accum.add(oids[1], now)
+        self.assertEqual(self.collection.count_documents({"c": 1}), 0)
+
+        accum.add(oids[2], now)
+        self.assertEqual(self.collection.count_documents({"c": 1}), 3)
+
+        accum.close()
+
+    def test_timestamp_not_rewind(self):
+        oid = ObjectId()
+        self.collection.insert_one({"_id": oid, "c": 0, "l": datetime(2020, 5, 2)})
+
+        accum = IncrementAccumulator(self.collection, "c", "l", 60, 100)
+        accum.add(oid, datetime(2020, 5, 1))
+        accum.close()
+
+        doc = self.collection.find_one({"_id": oid})
+        self.assertEqual(doc["c"], 1)
+        self.assertEqual(doc["l"], datetime(2020, 5, 2))
+
+    def test_flush_failed_kept(self):
+        oid = ObjectId()
+        self.collection.insert_one({"_id": oid, "c": 0, "l": None})
+
+        collection = self.collection
+
+        class FailOnceCollection:
+            failed = False
+
+            def bulk_write(self, *args, **kwargs):
+                if not self.failed:
+                    self.failed = True
+                    raise PyMongoError()
+
+                return collection.bulk_write(*args, **kwargs)
+
+        accum = IncrementAccumulator(FailOnceCollection(), "c", "l", 60, 100)
+        dt = datetime(2020, 5, 1)
+
+        accum.add(oid, dt, 2)
+        accum.flush()
+
+        self.assertEqual(accum.get_pending(oid), (2, dt))
+        self.assertEqual(self.collection.find_one({"_id": oid})["c"], 0)
+
+        accum.add(oid, dt)
+        accum.close()
+
+        self.assertIsNone(accum.get_pending(oid))
+        self.assertEqual(self.collection.find_one({"_id": oid})["c"], 3)
@@ -0,0 +1,159 @@
+import time
+
+from bson import ObjectId
+from pymongo.errors import AutoReconnect
+
+from mongodb.utils import InsertBuffer
+from tests.base import TestDatabaseMixin
+
+__all__ = ["TestInsertBuffer"]
+
+
+class _RecordingCollection:
+    """Collection wrapper recording the size of each batch inserted. Fails the first ``fail_count`` inserts."""
+
+    def __init__(self, collection, fail_count: int = 0):
+        self._collection = collection
+        self._fail_count = fail_count
+        self.name = collection.name
+        self.full_name = collection.full_name
+        self.batch_sizes = []
+
+    def insert_many(self, docs, **kwargs):
+        self.batch_sizes.append(len(docs))
+
+        if self._fail_count:
+            self._fail_count -= 1
+            raise AutoReconnect()
+
+        return self._collection.insert_many(docs, **kwargs)
+
+
+class TestInsertBuffer(TestDatabaseMixin):
+    collection = None
+
+    @classmethod
+    def setUpTestClass(cls):
+        cls.collection = cls.get_collection("testinsbuf")
+
+    def setUpTestCase(self) -> None:
+        self.collection.delete_many({})
+
+    def test_flush_on_call(self):
+        buffer = InsertBuffer(self.collection, 100, 60, 1000)
+
+        for i in range(5):
+            self.assertTrue(buffer.add({"i": i}))
+
+        self.assertEqual(buffer.buffered_count, 5)
+        self.assertEqual(self.collection.count_documents({}), 0)
+
+        buffer.flush()
+
+        self.assertEqual(buffer.buffered_count, 0)
+        self.assertEqual(self.collection.count_documents({}), 5)
+
+        buffer.close()
+
+    def test_flush_on_batch_size(self):
+        buffer = InsertBuffer(self.collection, 3, 60, 1000)
+
+        for i in range(3):
+            buffer.add({"i": i})
+
+        time.sleep(0.5)  # Wait for the flushing thread
+
+        self.assertEqual(self.collection.count_documents({}), 3)
+
+        buffer.close()
+
+    def test_flush_on_interval(self):
+        buffer = InsertBuffer(self.collection, 100, 0.2, 1000)
+
+        buffer.add({"i": 0})
+
+        time.sleep(0.7)  # Wait for the flushing thread
+
+        self.assertEqual(self.collection.count_documents({}), 1)
+
+        buffer.close()
+
+    def test_flush_on_close(self):
+        buffer = InsertBuffer(self.collection, 100, 60, 1000)
+
+        buffer.add({"i": 0})
+        buffer.close()
+
+        self.assertEqual(self.collection.count_documents({}), 1)
+
+    def test_full_dropped(self):
+        buffer = InsertBuffer(self.collection, 100, 60, 2)
+
+        self.assertTrue(buffer.add({"i": 0}))
+        self.assertTrue(buffer.add({"i": 1}))
+        self.assertFalse(buffer.add({"i": 2}))
+        self.assertEqual(buffer.dropped_count, 1)
+
+        buffer.close()
+
+        self.assertEqual(self.collection.count_documents({}), 2)
+
+    def test_duplicated_continue(self):
+        buffer = InsertBuffer(self.collection, 100, 60, 1000)
+
+        oid = ObjectId()
+        buffer.add({"_id": oid, "i": 0})
+        buffer.add({"_id": oid, "i": 1})
+        buffer.add({"i": 2})
+        buffer.close()
+
+        self.assertEqual(self.collection.count_documents({}), 2)
+
+    def test_flush_batched(self):
+        collection = _RecordingCollection(self.collection)
+        buffer = InsertBuffer(collection, 2, 60, 1000)
+
+        for i in range(5):
+            buffer.add({"i": i})
+
+        buffer.flush()
+
+        self.assertTrue(all(batch_size <= 2 for batch_size in collection.batch_sizes))
+        self.assertEqual(sum(collection.batch_sizes), 5)
+        self.assertEqual(self.collection.count_documents({}), 5)
+
+        buffer.close()
+
+    def test_failed_retried(self):
+        collection = _RecordingCollection(self.collection, fail_count=1)
+        buffer = InsertBuffer(collection, 100, 60, 1000)
+
+        for i in range(3):
+            buffer.add({"i": i})
+
+        buffer.flush()
+
+        self.assertEqual(buffer.buffered_count, 3)
+        self.assertEqual(self.collection.count_documents({}), 0)
+
+        buffer.add({"i": 3})
+        buffer.close()
+
+        self.assertEqual(buffer.buffered_count, 0)
+        self.assertEqual([doc["i"] for doc in self.collection.find().sort("i")], [0, 1, 2, 3])
+
+    def test_failed_retried_full(self):
+        collection = _RecordingCollection(self.collection, fail_count=1)
+        buffer = InsertBuffer(collection, 100, 60, 3)
+
+        for i in range(3):
+            buffer.add({"i": i})
+
+        buffer.flush()
+        buffer.add({"i": 3})
+
+        self.assertEqual(buffer.dropped_count, 1)
+
+        buffer.close()
+
+        self.assertEqual(self.collection.count_documents({}), 3)
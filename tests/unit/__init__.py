@@ -1,3 +1,4 @@
+from .extdiscord import *  # noqa
 from .extutils import *  # noqa
 from .game_pkchess import *  # noqa
 from .models import *  # noqa
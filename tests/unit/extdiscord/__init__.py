@@ -0,0 +1 @@
+from .dispatch import *  # noqa
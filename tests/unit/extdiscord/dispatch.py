@@ -0,0 +1,68 @@
+import asyncio
+import time
+from threading import Lock
+
+from extdiscord.dispatch import ChannelOrderedDispatcher
+from tests.base import TestCase
+
+__all__ = ["TestChannelOrderedDispatcher"]
+
+
+class TestChannelOrderedDispatcher(TestCase):
+    @staticmethod
+    def _run_messages(dispatcher: ChannelOrderedDispatcher, messages, handler):
+        async def on_message(channel_key, content):
+            async with dispatcher.channel_slot(channel_key):
+                return await dispatcher.run(handler, channel_key, content)
+
+        async def main():
+            # Handlers are scheduled in the order of the messages like the events of the Discord client
+            return await asyncio.gather(*[on_message(channel_key, content) for channel_key, content in messages],
+                                        return_exceptions=True)
+
+        return asyncio.new_event_loop().run_until_complete(main())
+
+    def test_channel_ordered(self):
+        dispatcher = ChannelOrderedDispatcher(4)
+        handled = []
+        handled_lock = Lock()
+
+        def handler(channel_key, content):
+            # Earlier messages take longer, so the order breaks if the calls of a channel run concurrently
+            time.sleep(0.05 * (5 - content))
+
+            with handled_lock:
+                handled.append((channel_key, content))
+
+        self._run_messages(dispatcher, [(channel_key, idx) for idx in range(5) for channel_key in "AB"], handler)
+        dispatcher.shutdown()
+
+        for channel_key in "AB":
+            self.assertEqual([content for key, content in handled if key == channel_key], list(range(5)))
+
+    def test_channels_concurrent(self):
+        dispatcher = ChannelOrderedDispatcher(4)
+
+        _start = time.time()
+        self._run_messages(dispatcher, [(channel_key, 0) for channel_key in "ABCD"],
+                           lambda channel_key, content: time.sleep(0.3))
+        duration = time.time() - _start
+
+        dispatcher.shutdown()
+
+        self.assertLess(duration, 0.9)
+
+    def test_handler_exception_not_blocking(self):
+        dispatcher = ChannelOrderedDispatcher(2)
+
+        def handler(channel_key, content):
+            if content == 0:
+                raise ValueError()
+
+            return content
+
+        results = self._run_messages(dispatcher, [("A", 0), ("A", 1), ("A", 2)], handler)
+        dispatcher.shutdown()
+
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual(results[1:], [1, 2])
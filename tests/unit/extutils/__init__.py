@@ -1,4 +1,5 @@
 from .arr import *  # noqa
+from .bgexec import *  # noqa
 from .boolext import *  # noqa
 from .checker import *  # noqa
 from .color import *  # noqa
@@ -0,0 +1,141 @@
+import time
+from threading import Event
+
+from extutils.bgexec import BackgroundTaskExecutor, BackgroundTaskDroppedError, ShardedTaskExecutor
+from tests.base import TestCase
+
+__all__ = ["TestBackgroundTaskExecutor", "TestShardedTaskExecutor"]
+
+
+class TestBackgroundTaskExecutor(TestCase):
+    @staticmethod
+    def get_executor(worker_count: int = 2, queue_size: int = 10, block_secs: float = 0.1):
+        return BackgroundTaskExecutor("Test", worker_count, queue_size, block_secs, sync_when_testing=False)
+
+    def test_submit(self):
+        executor = self.get_executor()
+
+        self.assertEqual(executor.submit(sum, [1, 2, 3]).result(timeout=1), 6)
+        self.assertEqual(executor.submit(int, "7", base=8).result(timeout=1), 7)
+
+        executor.shutdown()
+
+        stats = executor.stats
+        self.assertEqual(stats.submitted, 2)
+        self.assertEqual(stats.completed, 2)
+        self.assertEqual(stats.failed, 0)
+        self.assertEqual(stats.dropped, 0)
+        self.assertEqual(stats.queue_depth, 0)
+
+    def test_submit_failed(self):
+        executor = self.get_executor()
+
+        with self.assertRaises(ValueError):
+            executor.submit(int, "A").result(timeout=1)
+
+        executor.shutdown()
+
+        stats = executor.stats
+        self.assertEqual(stats.completed, 0)
+        self.assertEqual(stats.failed, 1)
+
+    def test_submit_sync_when_testing(self):
+        executor = BackgroundTaskExecutor("Test", 1, 1, 0)
+
+        future = executor.submit(sum, [1, 2, 3])
+        self.assertTrue(future.done())
+        self.assertEqual(future.result(), 6)
+
+    def test_queue_full_dropped(self):
+        executor = self.get_executor(worker_count=1, queue_size=1)
+        blocker = Event()
+
+        executor.submit(blocker.wait)
+        time.sleep(0.1)  # Wait until the worker picked the blocking task
+        executor.submit(sum, [1])
+        dropped = executor.submit(sum, [2])
+
+        with self.assertRaises(BackgroundTaskDroppedError):
+            dropped.result(timeout=1)
+
+        self.assertEqual(executor.stats.queue_depth, 1)
+        self.assertEqual(executor.stats.dropped, 1)
+
+        blocker.set()
+        executor.shutdown()
+
+    def test_shutdown_drain(self):
+        executor = self.get_executor(worker_count=1)
+
+        futures = [executor.submit(time.sleep, 0.01) for _ in range(5)]
+        executor.shutdown()
+
+        self.assertTrue(all(future.done() and not future.exception() for future in futures))
+        self.assertEqual(executor.stats.completed, 5)
+
+        with self.assertRaises(BackgroundTaskDroppedError):
+            executor.submit(sum, [1]).result(timeout=1)
+
+    def test_shutdown_timeout_queue_full(self):
+        executor = self.get_executor(worker_count=1, queue_size=1)
+        blocker = Event()
+
+        executor.submit(blocker.wait)
+        time.sleep(0.1)  # Wait until the worker picked the blocking task
+        queued = executor.submit(sum, [1])
+
+        _start = time.time()
+        executor.shutdown(timeout=0.2)
+
+        self.assertLess(time.time() - _start, 1)
+        with self.assertRaises(BackgroundTaskDroppedError):
+            queued.result(timeout=1)
+
+        blocker.set()
+
+
+class TestShardedTaskExecutor(TestCase):
+    @staticmethod
+    def get_executor(shard_count: int = 4):
+        return ShardedTaskExecutor("Test", shard_count, 100, 0.1, sync_when_testing=False)
+
+    def test_same_key_same_shard(self):
+        executor = self.get_executor()
+
+        self.assertIs(executor.get_shard("A"), executor.get_shard("A"))
+
+        executor.shutdown()
+
+    def test_same_key_ordered(self):
+        executor = self.get_executor()
+        handled = []
+
+        def handle(key, idx):
+            # Earlier tasks take longer, so the order breaks if the tasks of a key run concurrently
+            time.sleep(0.01 * (5 - idx))
+            handled.append((key, idx))
+
+        for idx in range(5):
+            for key in "ABCD":
+                executor.submit(key, handle, key, idx)
+
+        executor.shutdown()
+
+        for key in "ABCD":
+            self.assertEqual([idx for handled_key, idx in handled if handled_key == key], list(range(5)))
+
+    def test_failed_not_blocking(self):
+        executor = self.get_executor()
+
+        def handle(idx):
+            if idx == 0:
+                raise ValueError()
+
+            return idx
+
+        futures = [executor.submit("A", handle, idx) for idx in range(3)]
+
+        self.assertIsInstance(futures[0].exception(timeout=1), ValueError)
+        self.assertEqual([future.result(timeout=1) for future in futures[1:]], [1, 2])
+
+        executor.shutdown()
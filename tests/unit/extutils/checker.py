@@ -235,3 +235,51 @@ class TestArgTypeEnsure(TestCase):
 
         with self.assertRaises(TypeCastingFailedError):
             fn(l_out)
+
+    def test_keyword_only(self):
+        a1_out = "1"
+        a2_out = "2"
+
+        @arg_type_ensure
+        def fn(a1: int, *, a2: int, a3=None):
+            nonlocal a1_out, a2_out
+
+            a1_out = a1
+            a2_out = a2
+
+        fn(a1_out, a2=a2_out, a3="3")
+
+        self.assertEqual(1, a1_out)
+        self.assertEqual(2, a2_out)
+
+    def test_method(self):
+        class Sample:
+            @arg_type_ensure
+            def fn(self, num: int, *, num_kw: Optional[int] = None):
+                return self, num, num_kw
+
+        sample = Sample()
+
+        self.assertEqual((sample, 1, 2), sample.fn("1", num_kw="2"))
+        self.assertEqual((sample, 1, None), sample.fn("1"))
+
+    def test_exact_type_not_converted(self):
+        class CountingConverter(NonSafeDataTypeConverter):
+            count = 0
+
+            @classmethod
+            def _convert(cls, data, type_annt):
+                cls.count += 1
+                return super()._convert(data, type_annt)
+
+        @arg_type_ensure(converter=CountingConverter)
+        def fn(a1: int, a2: Optional[int], a3: Union[int, str], *, a4: ObjectId):
+            return a1, a2, a3, a4
+
+        oid = ObjectId()
+
+        self.assertEqual((1, None, "A", oid), fn(1, None, "A", a4=oid))
+        self.assertEqual(0, CountingConverter.count)
+
+        self.assertEqual((1, 2, 3, oid), fn("1", "2", 3.0, a4=str(oid)))
+        self.assertEqual(4, CountingConverter.count)
@@ -89,6 +89,17 @@ class TestFlagMisc(TestCase):
         self.assertFalse(CodeSingleEnum.contains(CodePrefixedDoubleEnum.A))
         self.assertFalse(CodeDoubleEnum.contains(CodePrefixedDoubleEnum.A))
 
+    def test_enum_cast_same_as_equals(self):
+        items = [1, 2, 3, -1, "1", "2", "01", "A", "B", "C", "E", "P1", "P2", "P3", ""]
+
+        for enum_cls in (CodeEnum, CodeSingleEnum, CodeDoubleEnum, CodePrefixedDoubleEnum):
+            for item in items:
+                with self.subTest(enum_cls=enum_cls, item=item):
+                    expected = next((member for member in enum_cls if member == item), None)
+
+                    self.assertIs(enum_cls.cast(item, silent_fail=True), expected)
+                    self.assertEqual(enum_cls.contains(item), expected is not None)
+
     def test_enum_duplicated_code(self):
         with self.assertRaises(DuplicatedCodeError):
             # noinspection PyPep8Naming
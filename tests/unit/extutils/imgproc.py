@@ -1,11 +1,43 @@
+import io
 import os
 from tempfile import TemporaryDirectory
 from zipfile import ZipFile, is_zipfile
 
+import numpy as np
+from PIL import Image
+
 from extutils.imgproc.apng2gif import convert, ConvertResult, ConvertOpResult
+from extutils.imgproc.apng2png import extract_frames, extract_frame_arrays
 from tests.base import TestCase
 
-__all__ = ["TestApng2Gif", "TestApng2GifConvertResult", "TestApng2GifConvertOpResult"]
+__all__ = ["TestApng2Png", "TestApng2Gif", "TestApng2GifConvertResult", "TestApng2GifConvertOpResult"]
+
+
+class TestApng2Png(TestCase):
+    def test_extract_frame_arrays(self):
+        with open("tests/res/linesticker.apng", "rb") as f:
+            frame_data = extract_frame_arrays(f.read())
+
+        self.assertGreater(len(frame_data), 0)
+
+        for frame, delay in frame_data:
+            self.assertEqual(frame.dtype, np.uint8)
+            self.assertEqual(frame.ndim, 3)
+            self.assertEqual(frame.shape[2], 4)
+            self.assertGreater(delay, 0)
+
+    def test_extract_frames_same_as_arrays(self):
+        with open("tests/res/linesticker.apng", "rb") as f:
+            apng_bin = f.read()
+
+        frame_data = extract_frames(apng_bin)
+        frame_array_data = extract_frame_arrays(apng_bin)
+
+        self.assertEqual(len(frame_data), len(frame_array_data))
+
+        for (frame_bytes, delay), (frame_array, delay_array) in zip(frame_data, frame_array_data):
+            np.testing.assert_array_equal(np.asarray(Image.open(io.BytesIO(frame_bytes))), frame_array)
+            self.assertEqual(delay, delay_array)
 
 
 class TestApng2Gif(TestCase):
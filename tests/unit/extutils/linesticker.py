@@ -1,7 +1,99 @@
-from extutils.linesticker import LineStickerUtils
+import os
+from tempfile import TemporaryDirectory
+from threading import Thread
+import time
+
+from extutils.linesticker import LineStickerUtils, LineStickerTempStorageManager
+from JellyBot.systemconfig import ExtraService
 from tests.base import TestCase
 
-__all__ = ["TestLineStickerUtils"]
+__all__ = ["TestLineStickerUtils", "TestLineStickerTempStorageManager"]
+
+
+class TestLineStickerTempStorageManager(TestCase):
+    def setUpTestCase(self) -> None:
+        self._max_bytes = ExtraService.Sticker.MaxStickerTempStorageBytes
+        ExtraService.Sticker.MaxStickerTempStorageBytes = 10
+        LineStickerTempStorageManager.clear()
+
+    def tearDownTestCase(self) -> None:
+        ExtraService.Sticker.MaxStickerTempStorageBytes = self._max_bytes
+        LineStickerTempStorageManager.clear()
+
+    @staticmethod
+    def _write(path: str, size: int):
+        with open(path, "wb") as f:
+            f.write(b"0" * size)
+
+        LineStickerTempStorageManager.create_file(path)
+
+    def test_remove_least_recently_used(self):
+        with TemporaryDirectory() as temp_dir:
+            paths = [os.path.join(temp_dir, f"{idx}.png") for idx in range(3)]
+
+            self._write(paths[0], 4)
+            self._write(paths[1], 4)
+            LineStickerTempStorageManager.touch_file(paths[0])
+            self._write(paths[2], 4)
+
+            self.assertTrue(os.path.exists(paths[0]))
+            self.assertFalse(os.path.exists(paths[1]))
+            self.assertTrue(os.path.exists(paths[2]))
+
+    def test_keep_file_exceeding_size(self):
+        with TemporaryDirectory() as temp_dir:
+            path_old = os.path.join(temp_dir, "old.png")
+            path_new = os.path.join(temp_dir, "new.png")
+
+            self._write(path_old, 4)
+            self._write(path_new, 20)
+
+            self.assertFalse(os.path.exists(path_old))
+            self.assertTrue(os.path.exists(path_new))
+
+    def test_lock_file(self):
+        running = []
+        max_running = []
+
+        def work():
+            with LineStickerTempStorageManager.lock_file("a.gif"):
+                running.append(1)
+                max_running.append(len(running))
+                time.sleep(0.05)
+                running.pop()
+
+        threads = [Thread(target=work) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(max(max_running), 1)
+        self.assertEqual(len(max_running), 5)
+
+    @staticmethod
+    def _acquire_in_thread(path: str) -> bool:
+        acquired = []
+
+        def work():
+            with LineStickerTempStorageManager.lock_file(path):
+                acquired.append(path)
+
+        thread = Thread(target=work)
+        thread.start()
+        thread.join(1)
+
+        return bool(acquired)
+
+    def test_lock_file_different_files(self):
+        with LineStickerTempStorageManager.lock_file("a.gif"):
+            self.assertTrue(self._acquire_in_thread("b.gif"))
+
+    def test_lock_file_released(self):
+        with LineStickerTempStorageManager.lock_file("a.gif"):
+            self.assertFalse(self._acquire_in_thread("a.gif"))
+
+        self.assertTrue(self._acquire_in_thread("a.gif"))
 
 
 class TestLineStickerUtils(TestCase):
@@ -681,6 +681,44 @@ class TestMap(TestCase):
         with self.assertRaises(PathEndOutOfMapError):
             game_map.get_shortest_path(MapCoordinate(0, 0), MapCoordinate(3, 3), 99)
 
+    def test_get_shortest_path_open_map(self):
+        game_map = MapTemplate(
+            30, 30, [[MapPointStatus.EMPTY] * 30 for _ in range(30)], {}, bypass_map_chack=True).to_map()
+
+        path = game_map.get_shortest_path(MapCoordinate(0, 0), MapCoordinate(29, 29), 99)
+
+        self.assertEqual(len(path), 59)
+        self.assertEqual(path[:3], [MapCoordinate(0, 0), MapCoordinate(1, 0), MapCoordinate(2, 0)])
+        self.assertEqual(path[-2:], [MapCoordinate(29, 28), MapCoordinate(29, 29)])
+
+    def test_get_reachable_coords(self):
+        game_map = self.TEMPLATE_MOVE_2.to_map()
+
+        self.assertEqual(
+            game_map.get_reachable_coords(MapCoordinate(1, 1), 2),
+            {MapCoordinate(1, 2), MapCoordinate(0, 2)}
+        )
+
+    def test_get_reachable_coords_limited(self):
+        game_map = self.TEMPLATE_MOVE_2.to_map()
+
+        self.assertEqual(game_map.get_reachable_coords(MapCoordinate(1, 1), 1), {MapCoordinate(1, 2)})
+
+    def test_get_reachable_coords_open_map(self):
+        game_map = MapTemplate(
+            9, 9, [[MapPointStatus.EMPTY] * 9 for _ in range(9)], {}, bypass_map_chack=True).to_map()
+
+        self.assertEqual(
+            game_map.get_reachable_coords(MapCoordinate(0, 0), 2),
+            {MapCoordinate(1, 0), MapCoordinate(2, 0), MapCoordinate(0, 1), MapCoordinate(0, 2), MapCoordinate(1, 1)}
+        )
+
+    def test_get_reachable_coords_origin_out_of_map(self):
+        game_map = self.TEMPLATE_MOVE_2.to_map()
+
+        with self.assertRaises(PathEndOutOfMapError):
+            game_map.get_reachable_coords(MapCoordinate(3, 3), 99)
+
     def test_point_flattened(self):
         game_map = self.TEMPLATE.to_map()
 
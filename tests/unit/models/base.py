@@ -5,7 +5,7 @@ from models import Model, ModelDefaultValueExt
 from models.field import IntegerField, BooleanField
 from models.exceptions import (
     JsonKeyDuplicatedError, DeleteNotAllowedError, FieldKeyNotExistError, IdUnsupportedError,
-    RequiredKeyNotFilledError
+    RequiredKeyNotFilledError, JsonKeyNotExistedError
 )
 from tests.base import TestCase
 
@@ -185,6 +185,28 @@ class TestBaseModelImplementations(TestCase):
 
     # endregion
 
+    # region Construction from the database
+    def test_from_db(self):
+        oid = ObjectId()
+        mdl = TestBaseModelImplementations.TestModel(_id=oid, f2=2, f3=3, from_db=True)
+
+        self.assertEqual(mdl, TestBaseModelImplementations.TestModel(Id=oid, Field2=2, Field3=3))
+        self.assertEqual(mdl.to_json(), {"_id": oid, "f1": 0, "f2": 2, "f3": 3, "f4": 5})
+
+    def test_from_db_required_not_filled(self):
+        with self.assertRaises(RequiredKeyNotFilledError):
+            TestBaseModelImplementations.TestModel(f1=1, from_db=True)
+
+    def test_from_db_json_key_not_exists(self):
+        with self.assertRaises(JsonKeyNotExistedError):
+            TestBaseModelImplementations.TestModel(f2=2, f9=9, from_db=True)
+
+    def test_from_db_id_unsupported(self):
+        with self.assertRaises(IdUnsupportedError):
+            TestBaseModelImplementations.ModelNoOid(_id=ObjectId(), from_db=True)
+
+    # endregion
+
     # region Operations on json key / field key
     def test_model_fields(self):
         fs = {
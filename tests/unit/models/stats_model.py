@@ -4,11 +4,12 @@ from bson import ObjectId
 
 from extutils.dt import now_utc_aware
 from flags import APICommand, MessageType, BotFeature
-from models import Model, APIStatisticModel, MessageRecordModel, BotFeatureUsageModel
+from models import Model, APIStatisticModel, MessageRecordModel, MessageRecordHourlyModel, BotFeatureUsageModel
 
 from tests.base import TestModel
 
-__all__ = ["TestAPIStatisticModel", "TestMessageRecordModel", "TestBotFeatureUsageModel"]
+__all__ = ["TestAPIStatisticModel", "TestMessageRecordModel", "TestMessageRecordHourlyModel",
+           "TestBotFeatureUsageModel"]
 
 
 class TestAPIStatisticModel(TestModel.TestClass):
@@ -68,6 +69,31 @@ class TestMessageRecordModel(TestModel.TestClass):
         }
 
 
+class TestMessageRecordHourlyModel(TestModel.TestClass):
+    CHANNEL_OID = ObjectId()
+    USER_OID = ObjectId()
+    HOUR = now_utc_aware().replace(minute=0, second=0, microsecond=0)
+
+    @classmethod
+    def get_model_class(cls) -> Type[Model]:
+        return MessageRecordHourlyModel
+
+    @classmethod
+    def get_required(cls) -> Dict[Tuple[str, str], Any]:
+        return {
+            ("ch", "ChannelOid"): TestMessageRecordHourlyModel.CHANNEL_OID,
+            ("u", "UserRootOid"): TestMessageRecordHourlyModel.USER_OID,
+            ("t", "MessageType"): MessageType.TEXT,
+            ("h", "Hour"): TestMessageRecordHourlyModel.HOUR
+        }
+
+    @classmethod
+    def get_default(cls) -> Dict[Tuple[str, str], Tuple[Any, Any]]:
+        return {
+            ("c", "Count"): (0, 7)
+        }
+
+
 class TestBotFeatureUsageModel(TestModel.TestClass):
     CHANNEL_OID = ObjectId()
     SENDER_OID = ObjectId()
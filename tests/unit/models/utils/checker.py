@@ -9,12 +9,14 @@ from extutils.emailutils import EmailServer
 from extutils.color import Color
 from flags import AutoReplyContentType
 from mongodb.factory import BaseCollection
-from models import Model, ModelDefaultValueExt
+from models import Model, ModelDefaultValueExt, OID_KEY
 from models.field import (
     ModelField, IntegerField, ModelArrayField, DictionaryField, FloatField, BooleanField, UrlField, TextField,
     ObjectIDField, GeneralField, DateTimeField, ColorField, ArrayField, AutoReplyContentTypeField
 )
 from models.utils import ModelFieldChecker
+from models.utils.checker import STAMP_COL_NAME, KEY_PENDING_VERSION, KEY_WATERMARK, KEY_VERSION
+from JellyBot.systemconfig import Database
 from tests.base import TestDatabaseMixin, TestCase
 
 __all__ = ["TestDataChecker"]
@@ -181,3 +183,64 @@ class TestDataChecker(TestDatabaseMixin, TestCase):
 
     def test_repair_ac(self):
         self.missing_has_default("ac", {"ac": AutoReplyContentType.default()})
+
+    def test_stamp_unchanged_skipped(self):
+        ModelFieldChecker.check(ColInst)
+
+        stamp = ColInst.database.get_collection(STAMP_COL_NAME).find_one({OID_KEY: ColInst.name})
+        self.assertIsNotNone(stamp)
+        self.assertIn(KEY_VERSION, stamp)
+        self.assertNotIn(KEY_PENDING_VERSION, stamp)
+        self.assertNotIn(KEY_WATERMARK, stamp)
+
+        del self.default_dict["f"]
+        ColInst.insert_one(self.default_dict)
+
+        ModelFieldChecker.check(ColInst)
+
+        self.assertNotIn("f", ColInst.find_one())
+
+        ModelFieldChecker.reset_stamp(ColInst)
+        ModelFieldChecker.check(ColInst)
+
+        self.assertEqual(ModelTest.FFloat.default_value, ColInst.find_one()["f"])
+
+    def test_repair_batched_set_only(self):
+        batch_size = Database.ModelCheckBatchSize
+        Database.ModelCheckBatchSize = 2
+
+        try:
+            del self.default_dict["f"]
+            del self.default_dict["m"]["i2"]
+            self.default_dict["x"] = 5
+            ColInst.insert_many([dict(self.default_dict) for _ in range(5)])
+
+            ModelFieldChecker.check(ColInst)
+        finally:
+            Database.ModelCheckBatchSize = batch_size
+
+        data_list = list(ColInst.find())
+
+        self.assertEqual(5, len(data_list))
+        for data in data_list:
+            with self.subTest(data=data):
+                self.assertEqual(ModelTest.FFloat.default_value, data["f"])
+                self.assertEqual(SubModel.FInt.default_value, data["m"]["i2"])
+                self.assertEqual(5, data["x"])
+
+    def test_repair_resume(self):
+        del self.default_dict["f"]
+        oids = ColInst.insert_many([dict(self.default_dict) for _ in range(3)]).inserted_ids
+
+        # Simulate the check interrupted after checking the first 2 data
+        checker = ModelFieldChecker.CheckDefaultValue(ColInst)
+        # noinspection PyProtectedMember
+        version = checker._get_schema_version(checker._get_checked_keys())  # pylint: disable=protected-access
+        ColInst.database.get_collection(STAMP_COL_NAME).update_one(
+            {OID_KEY: ColInst.name}, {"$set": {KEY_PENDING_VERSION: version, KEY_WATERMARK: oids[1]}}, upsert=True)
+
+        ModelFieldChecker.check(ColInst)
+
+        self.assertNotIn("f", ColInst.find_one({OID_KEY: oids[0]}))
+        self.assertNotIn("f", ColInst.find_one({OID_KEY: oids[1]}))
+        self.assertIn("f", ColInst.find_one({OID_KEY: oids[2]}))
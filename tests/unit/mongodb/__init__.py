@@ -1 +1,2 @@
 from .outcome import *  # noqa
+from .mdlcache import *  # noqa
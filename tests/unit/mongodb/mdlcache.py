@@ -0,0 +1,62 @@
+from mongodb.utils import ModelCache
+from tests.base import TestCase
+
+__all__ = ("TestModelCache",)
+
+
+class TestModelCache(TestCase):
+    def test_set_get(self):
+        cache = ModelCache(10, 60)
+
+        model, generation = cache.get("A")
+        self.assertIsNone(model)
+
+        cache.set("A", 7, generation)
+
+        self.assertEqual(cache.get("A")[0], 7)
+
+    def test_set_stale_generation(self):
+        cache = ModelCache(10, 60)
+
+        generation = cache.generation()
+        cache.invalidate("B")
+        cache.set("A", 7, generation)
+
+        self.assertIsNone(cache.get("A")[0])
+
+    def test_set_many(self):
+        cache = ModelCache(10, 60)
+
+        cache.set_many([("A", 7), ("B", 8)], cache.generation())
+
+        self.assertEqual(cache.get("A")[0], 7)
+        self.assertEqual(cache.get("B")[0], 8)
+
+    def test_set_many_stale_generation(self):
+        cache = ModelCache(10, 60)
+
+        generation = cache.generation()
+        cache.invalidate("C")
+        cache.set_many([("A", 7), ("B", 8)], generation)
+
+        self.assertIsNone(cache.get("A")[0])
+        self.assertIsNone(cache.get("B")[0])
+
+    def test_invalidate_keys(self):
+        cache = ModelCache(10, 60)
+
+        cache.set_many([(("X", 1), 7), (("X", 2), 8), (("Y", 1), 9)], cache.generation())
+        cache.invalidate_keys(lambda key: key[0] == "X")
+
+        self.assertIsNone(cache.get(("X", 1))[0])
+        self.assertIsNone(cache.get(("X", 2))[0])
+        self.assertEqual(cache.get(("Y", 1))[0], 9)
+
+    def test_invalidate_models(self):
+        cache = ModelCache(10, 60)
+
+        cache.set_many([("A", 7), ("B", 8)], cache.generation())
+        cache.invalidate_models(lambda model: model > 7)
+
+        self.assertEqual(cache.get("A")[0], 7)
+        self.assertIsNone(cache.get("B")[0])